@@ -0,0 +1,260 @@
+"""Seed the analytics database from offline Reddit submission dumps
+
+    python -m backfill RS_2023-*.zst PhotoshopRequest_submissions.zst --subreddits PhotoshopRequest --start 2021-01-01
+
+Dumps are NDJSON submission records, zstd-compressed (.zst, needs the zstandard
+package) or plain. They are streamed with constant memory, filtered by subreddit
+and date range, and turned into the same records log_post_analytics stores
+(detection type BACKFILL). Parsing runs in --workers processes while this
+process decompresses and writes. Progress is checkpointed in the analytics
+database together with each batch, so an interrupted backfill resumes where it
+stopped; finished dumps are skipped unless --restart is given.
+"""
+import argparse
+import io
+import json
+import os
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from types import SimpleNamespace
+
+import main
+
+CHUNK_BYTES = 8 * 1024 * 1024  # Decompressed bytes handed to a worker at a time
+INSERT_BATCH_SIZE = 20000  # Records per database transaction (and checkpoint)
+ZSTD_MAX_WINDOW = 2 ** 31  # Archive dumps are compressed with long-distance windows
+# Fields PRAW always has but old dump records may lack
+RECORD_DEFAULTS = {
+    'url': '',
+    'author': '[deleted]',
+    'link_flair_text': None,
+    'selftext': '',
+    'score': 0,
+    'num_comments': None
+}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Import Reddit submission dumps into the analytics database')
+    parser.add_argument('paths', nargs='+', help='.zst or plain NDJSON submission dumps')
+    parser.add_argument('--subreddits', default=os.getenv('MONITOR_SUBREDDITS', 'PhotoshopRequest'),
+                        help="subreddits to import, as 'a+b' or 'a, b'")
+    parser.add_argument('--start', help='first post date to import (YYYY-MM-DD)')
+    parser.add_argument('--end', help='last post date to import, inclusive (YYYY-MM-DD)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='parsing processes, 1 to parse inline')
+    parser.add_argument('--restart', action='store_true', help='ignore checkpoints and import every dump from the start')
+    return parser.parse_args(argv)
+
+
+def build_filter(args):
+    """Subreddit names (lowercase) and created_utc bounds from the command line"""
+    subreddits = [name.strip().lower() for name in args.subreddits.replace(',', '+').split('+') if name.strip()]
+    start = datetime.strptime(args.start, '%Y-%m-%d').timestamp() if args.start else None
+    # End date is inclusive - compare against the start of the following day, like the analytics filter
+    end = datetime.strptime(args.end, '%Y-%m-%d').timestamp() + 86400 if args.end else None
+    return subreddits, start, end
+
+
+def parse_chunk(data, subreddits, start, end):
+    """Turn a block of NDJSON lines into analytics records (runs in a worker)
+
+    Returns (records, lines scanned, lines skipped as unreadable).
+    """
+    # Cheap byte-level check first, so only lines of the wanted subreddits are parsed
+    prefilter = re.compile(
+        rb'"subreddit": ?"(?:' + b'|'.join(re.escape(name.encode('utf-8')) for name in subreddits) + rb')"',
+        re.IGNORECASE
+    )
+    records = []
+    scanned = 0
+    skipped = 0
+    for line in data.splitlines():
+        scanned += 1
+        if not prefilter.search(line):
+            continue
+        try:
+            record = json.loads(line)
+            subreddit = record.get('subreddit') or ''
+            if subreddit.lower() not in subreddits or 'title' not in record:
+                continue
+            created = float(record['created_utc'])
+            if (start is not None and created < start) or (end is not None and created >= end):
+                continue
+            records.append(main.build_analytics_entry(record_post_data(record, created), subreddit, 'BACKFILL'))
+        except Exception:
+            skipped += 1
+    return records, scanned, skipped
+
+
+def record_post_data(record, created):
+    """Map a dump record to the post dict extract_post_data builds from a PRAW submission"""
+    fields = dict(RECORD_DEFAULTS)
+    fields.update((key, value) for key, value in record.items() if value is not None)
+    fields['created_utc'] = created
+    return main.extract_post_data(SimpleNamespace(**fields))
+
+
+def open_dump(path):
+    """Open a dump as a binary line stream, decompressing .zst files on the fly"""
+    raw = open(path, 'rb')
+    if not path.endswith('.zst'):
+        return raw
+    try:
+        import zstandard
+    except ImportError:
+        raw.close()
+        raise SystemExit('Reading .zst dumps needs the zstandard package (pip install zstandard)')
+    reader = zstandard.ZstdDecompressor(max_window_size=ZSTD_MAX_WINDOW).stream_reader(raw)
+    return io.BufferedReader(reader, buffer_size=1024 * 1024)
+
+
+def skip_to(stream, offset):
+    """Advance a dump stream to a decompressed byte offset"""
+    if stream.seekable():
+        stream.seek(offset)
+        return
+    remaining = offset
+    while remaining:
+        block = stream.read(min(remaining, CHUNK_BYTES))
+        if not block:
+            raise ValueError('dump is shorter than its checkpoint')
+        remaining -= len(block)
+
+
+def read_chunks(stream, offset):
+    """Yield (block of whole lines, decompressed offset after the block)"""
+    lines = []
+    size = 0
+    for line in stream:
+        lines.append(line)
+        size += len(line)
+        if size >= CHUNK_BYTES:
+            offset += size
+            yield b''.join(lines), offset
+            lines = []
+            size = 0
+    if lines:
+        yield b''.join(lines), offset + size
+
+
+def get_checkpoint(path, restart=False):
+    """Return the checkpoint row of a dump, resetting it if the file changed since or on restart"""
+    stat = os.stat(path)
+    with main.db_lock:
+        conn = main.get_posts_db()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS backfill_progress (
+                path TEXT PRIMARY KEY,
+                size INTEGER,
+                mtime REAL,
+                offset INTEGER,
+                imported INTEGER,
+                done INTEGER
+            )
+        """)
+        row = conn.execute(
+            'SELECT size, mtime, offset, imported, done FROM backfill_progress WHERE path = ?', (path,)
+        ).fetchone()
+        if restart or row is None or row[0] != stat.st_size or row[1] != stat.st_mtime:
+            conn.execute(
+                'INSERT OR REPLACE INTO backfill_progress (path, size, mtime, offset, imported, done) VALUES (?, ?, ?, 0, 0, 0)',
+                (path, stat.st_size, stat.st_mtime)
+            )
+            row = (stat.st_size, stat.st_mtime, 0, 0, 0)
+        conn.commit()
+    return {'offset': row[2], 'imported': row[3], 'done': bool(row[4])}
+
+
+def store_batch(path, records, offset, done=False):
+    """Insert records and move the checkpoint in the same transaction"""
+    with main.db_lock:
+        conn = main.get_posts_db()
+        conn.execute(
+            'UPDATE backfill_progress SET offset = ?, imported = imported + ?, done = ? WHERE path = ?',
+            (offset, len(records), int(done), path)
+        )
+        main.store_analytics_entries(records)
+        conn.commit()
+
+
+def backfill_file(path, post_filter, executor, workers, restart):
+    """Import one dump, resuming from its checkpoint; returns records imported by this run"""
+    path = os.path.abspath(path)
+    checkpoint = get_checkpoint(path, restart)
+    if checkpoint['done']:
+        print(f"{path}: already imported ({checkpoint['imported']} posts), skipping", flush=True)
+        return 0
+    if checkpoint['offset']:
+        print(f"{path}: resuming at {checkpoint['offset'] / 1048576:.0f} MB ({checkpoint['imported']} posts so far)", flush=True)
+
+    started = time.time()
+    imported = 0
+    scanned = 0
+    skipped = 0
+    batch = []
+    pending = deque()  # (future or result, offset), oldest first
+
+    def collect(result, offset):
+        nonlocal imported, scanned, skipped, batch
+        records, chunk_scanned, chunk_skipped = result
+        scanned += chunk_scanned
+        skipped += chunk_skipped
+        batch.extend(records)
+        if len(batch) >= INSERT_BATCH_SIZE:
+            store_batch(path, batch, offset)
+            imported += len(batch)
+            batch = []
+            rate = scanned / max(time.time() - started, 1e-6)
+            print(f"{path}: {offset / 1048576:.0f} MB, {imported} posts imported, {rate:.0f} lines/s", flush=True)
+
+    with open_dump(path) as stream:
+        skip_to(stream, checkpoint['offset'])
+        offset = checkpoint['offset']
+        for chunk, offset in read_chunks(stream, checkpoint['offset']):
+            if executor is None:
+                collect(parse_chunk(chunk, *post_filter), offset)
+                continue
+            # Keep a bounded number of chunks in flight so memory stays constant
+            pending.append((executor.submit(parse_chunk, chunk, *post_filter), offset))
+            while len(pending) > workers * 2:
+                future, chunk_offset = pending.popleft()
+                collect(future.result(), chunk_offset)
+        while pending:
+            future, chunk_offset = pending.popleft()
+            collect(future.result(), chunk_offset)
+
+    store_batch(path, batch, offset, done=True)
+    imported += len(batch)
+    print(f"{path}: done, {imported} posts imported from {scanned} lines"
+          + (f" ({skipped} unreadable lines skipped)" if skipped else '')
+          + f" in {time.time() - started:.1f}s", flush=True)
+    return imported
+
+
+def run(args):
+    post_filter = build_filter(args)
+    missing = [path for path in args.paths if not os.path.exists(path)]
+    if missing:
+        raise SystemExit(f"Dump not found: {', '.join(missing)}")
+    executor = ProcessPoolExecutor(args.workers) if args.workers > 1 else None
+    total = 0
+    try:
+        for path in args.paths:
+            total += backfill_file(path, post_filter, executor, args.workers, args.restart)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    print(f"Backfill complete: {total} posts imported into {main.POSTS_DB_FILE}", flush=True)
+    return total
+
+
+if __name__ == '__main__':
+    try:
+        run(parse_args())
+    except KeyboardInterrupt:
+        print('Interrupted - run the same command again to resume', file=sys.stderr)
+        sys.exit(130)
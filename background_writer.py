@@ -0,0 +1,113 @@
+import atexit
+import os
+import queue
+import threading
+import time
+
+import metrics
+
+# Writer settings
+FLUSH_SIZE = 500  # Records buffered before a batch is written
+FLUSH_INTERVAL = 1.0  # Seconds a record may wait before its batch is written
+FSYNC_POLICY = os.getenv('WRITER_FSYNC', 'state')  # 'always', 'state' (state files only) or 'never'
+
+_queue = queue.Queue()
+_thread = None
+_start_lock = threading.Lock()
+
+
+def submit(sink, record):
+    """Queue a record; sink is called from the writer thread with a list of records"""
+    _ensure_started()
+    _queue.put(('record', sink, record))
+
+
+def write_file(path, content):
+    """Queue an atomic rewrite of a state file; only the newest content per path is written"""
+    _ensure_started()
+    _queue.put(('file', path, content))
+
+
+def flush(timeout=10):
+    """Block until everything queued so far has been written"""
+    if _thread is None:
+        return
+    done = threading.Event()
+    _queue.put(('flush', done, None))
+    done.wait(timeout)
+
+
+def _ensure_started():
+    global _thread
+    with _start_lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_run, name='background-writer')
+            _thread.daemon = True
+            _thread.start()
+            atexit.register(flush)
+
+
+def _run():
+    records = {}  # sink -> pending records
+    files = {}  # path -> newest pending content
+    waiters = []
+    pending = 0
+    oldest = None
+
+    while True:
+        timeout = None if oldest is None else max(0.0, oldest + FLUSH_INTERVAL - time.time())
+        try:
+            kind, target, payload = _queue.get(timeout=timeout)
+            if kind == 'record':
+                records.setdefault(target, []).append(payload)
+                pending += 1
+            elif kind == 'file':
+                files[target] = payload
+                pending += 1
+            else:
+                waiters.append(target)
+            if oldest is None:
+                oldest = time.time()
+        except queue.Empty:
+            pass
+
+        if pending >= FLUSH_SIZE or waiters or (oldest is not None and time.time() - oldest >= FLUSH_INTERVAL):
+            _write_batch(records, files)
+            records, files, pending, oldest = {}, {}, 0, None
+            for waiter in waiters:
+                waiter.set()
+            waiters = []
+
+
+def _write_batch(records, files):
+    started = time.perf_counter()
+    for sink, batch in records.items():
+        try:
+            sink(batch)
+        except Exception as e:
+            metrics.increment('writer_errors_total')
+            print(f"Background writer failed to store {len(batch)} records: {str(e)}")
+
+    for path, content in files.items():
+        try:
+            write_atomic(path, content, fsync=FSYNC_POLICY in ('always', 'state'))
+        except Exception as e:
+            metrics.increment('writer_errors_total')
+            print(f"Background writer failed to write {path}: {str(e)}")
+
+    if records or files:
+        metrics.observe('writer_batch_records', sum(len(batch) for batch in records.values()) + len(files))
+        metrics.observe('writer_batch_seconds', time.perf_counter() - started)
+
+
+def write_atomic(path, content, fsync=True):
+    """Write a file through a temp file and rename, so readers never see a partial file"""
+    temp_path = path + '.tmp'
+    mode = 'wb' if isinstance(content, bytes) else 'w'
+    encoding = None if isinstance(content, bytes) else 'utf-8'
+    with open(temp_path, mode, encoding=encoding) as f:
+        f.write(content)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(temp_path, path)
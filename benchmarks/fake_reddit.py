@@ -0,0 +1,131 @@
+"""In-memory stand-in for the parts of PRAW the app uses"""
+import itertools
+import threading
+from collections import Counter
+import time
+
+FLAIRS = ['Paid', 'Free', 'Paid', 'Free', 'Paid', None]
+FIRST_POST_ID = int('1a0000', 36)
+PAGE_SIZE = 100  # Posts per listing request, as on Reddit
+
+
+class FakeSubmission:
+    def __init__(self, number, subreddit, created_utc, image_urls):
+        self.id = base36(FIRST_POST_ID + number)
+        self.name = self.fullname = f"t3_{self.id}"
+        self.subreddit = subreddit
+        self.created_utc = created_utc
+        self.title = f"Please edit photo {number}"
+        self.author = f"user{number % 997}"
+        self.link_flair_text = FLAIRS[number % len(FLAIRS)]
+        self.selftext = "Remove the person in the background. " * (number % 12)
+        self.score = number % 50
+        self.num_comments = number % 7
+        self.removed_by_category = None
+        self.locked = False
+        self.permalink = f"/r/{subreddit.display_name}/comments/{self.id}/post_{number}/"
+        if len(image_urls) == 1:
+            self.url = image_urls[0]
+        else:
+            self.url = f"https://www.reddit.com/gallery/{self.id}"
+            self.gallery_data = {'items': [{'media_id': f"m{index}"} for index in range(len(image_urls))]}
+            self.media_metadata = {
+                f"m{index}": {'s': {'u': image_url}} for index, image_url in enumerate(image_urls)
+            }
+
+
+class FakeSubreddit:
+    def __init__(self, reddit, names):
+        self.reddit = reddit
+        self.names = [name.lower() for name in names]
+        self.display_name = '+'.join(names)
+
+    def new(self, limit=100, params=None):
+        """Newest first, honouring 'before' and 'after' fullname cursors like Reddit's listing API
+
+        Like PRAW's ListingGenerator, posts are fetched PAGE_SIZE per request as the
+        caller iterates, so each page costs one round trip. Removed posts take up their
+        slot in a page but are left out, so pages can come back short.
+        """
+        with self.reddit.lock:
+            posts = [post for post in reversed(self.reddit.posts)
+                     if post.subreddit.display_name.lower() in self.names]
+        params = params or {}
+        cursor = params.get('before') or params.get('after')
+        if cursor:
+            index = next((i for i, post in enumerate(posts) if post.fullname == cursor), None)
+            if index is None:
+                posts = []
+            elif params.get('before'):
+                posts = posts[max(0, index - limit):index]
+            else:
+                posts = posts[index + 1:index + 1 + limit]
+        else:
+            posts = posts[:limit]
+        if not posts:
+            self.reddit.simulate_latency('new')
+        for start in range(0, len(posts), PAGE_SIZE):
+            self.reddit.simulate_latency('new')
+            for post in posts[start:start + PAGE_SIZE]:
+                if post.id not in self.reddit.removed:
+                    yield post
+
+
+class FakeReddit:
+    """Shared post store; api_latency seconds are slept per listing or submission call"""
+
+    def __init__(self, api_latency=0.0, image_base_url='http://127.0.0.1:8000'):
+        self.api_latency = api_latency
+        self.image_base_url = image_base_url
+        self.posts = []
+        self.by_id = {}
+        self.counter = itertools.count()
+        self.calls = Counter()  # API calls per endpoint
+        self.removed = set()  # ids of posts left out of listings
+        self.lock = threading.Lock()
+
+    def simulate_latency(self, endpoint):
+        self.calls[endpoint] += 1
+        if self.api_latency:
+            time.sleep(self.api_latency)
+
+    def subreddit(self, name):
+        return FakeSubreddit(self, name.split('+'))
+
+    def submission(self, id=None, url=None):
+        self.simulate_latency('submission')
+        if url is not None:
+            id = url.rstrip('/').split('/comments/')[1].split('/')[0]
+        return self.by_id[id]
+
+    def info(self, fullnames):
+        self.simulate_latency('info')
+        with self.lock:
+            return [self.by_id[fullname[3:]] for fullname in fullnames if fullname[3:] in self.by_id]
+
+    def add_posts(self, subreddit_name, count, gallery_size=1, image_size=None, created_utc=None):
+        """Append count new posts, newest last; returns them"""
+        subreddit = self.subreddit(subreddit_name)
+        added = []
+        with self.lock:
+            for _ in range(count):
+                number = next(self.counter)
+                image_urls = [self.image_url(number, index, image_size) for index in range(gallery_size)]
+                post = FakeSubmission(number, subreddit, created_utc or time.time(), image_urls)
+                self.posts.append(post)
+                self.by_id[post.id] = post
+                added.append(post)
+        return added
+
+    def image_url(self, number, index, image_size=None):
+        query = f"?size={image_size}" if image_size else ''
+        return f"{self.image_base_url}/{number}_{index}.jpg{query}"
+
+
+def base36(number):
+    digits = '0123456789abcdefghijklmnopqrstuvwxyz'
+    text = ''
+    while number:
+        number, remainder = divmod(number, 36)
+        text = digits[remainder] + text
+    return text or '0'
@@ -0,0 +1,65 @@
+"""Write a synthetic posts_analytics.log in the app's JSONL format
+
+    python -m benchmarks.generate_analytics_log 100000 posts_analytics.log
+"""
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+import main
+
+SUBREDDITS = ['PhotoshopRequest', 'PhotoshopRequest', 'PhotoshopRequest', 'picrequests']
+FLAIRS = ['Paid', 'Free', 'Paid', 'Free', 'Paid', 'Free', 'Meta', None]
+AUTHOR_POOL = 20000
+DAYS = 90  # Posts are spread over this many days before now
+WRITE_BATCH = 10000
+
+
+def generate_entries(count, seed=1):
+    """Yield count analytics entries built by main.build_analytics_entry"""
+    rng = random.Random(seed)
+    newest = time.time()
+    oldest = newest - DAYS * 86400
+    step = (newest - oldest) / max(count, 1)
+    for number in range(count):
+        created = oldest + number * step
+        title = f"Request {number}: " + 'edit ' * rng.randint(1, 30)
+        post_data = {
+            'id': f"b{number:07x}",
+            'title': title,
+            'author': f"user{int(rng.paretovariate(1.2)) % AUTHOR_POOL}",
+            'created': created,
+            'flair': rng.choice(FLAIRS),
+            'description': 'x' * rng.randint(0, 600),
+            'upvotes': int(rng.expovariate(0.2))
+        }
+        detected_at = datetime.fromtimestamp(created) + timedelta(seconds=rng.randint(5, 120))
+        yield main.build_analytics_entry(post_data, rng.choice(SUBREDDITS), 'MONITORING', detected_at)
+
+
+def write_log(path, count, seed=1):
+    """Write count synthetic entries to path and return the number written"""
+    written = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        batch = []
+        for entry in generate_entries(count, seed):
+            batch.append(json.dumps(entry, ensure_ascii=False) + '\n')
+            if len(batch) >= WRITE_BATCH:
+                f.write(''.join(batch))
+                written += len(batch)
+                batch = []
+        f.write(''.join(batch))
+        written += len(batch)
+    return written
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print("Usage: python -m benchmarks.generate_analytics_log <lines> [path]")
+        sys.exit(1)
+    path = sys.argv[2] if len(sys.argv) > 2 else main.POSTS_ANALYTICS_FILE
+    started = time.perf_counter()
+    lines = write_log(path, int(sys.argv[1]))
+    print(f"Wrote {lines} entries to {path} in {time.perf_counter() - started:.1f}s")
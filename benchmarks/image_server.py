@@ -0,0 +1,79 @@
+"""Local HTTP server returning deterministic JPEG-typed payloads for download benchmarks and tests
+
+Like a CDN it sends an ETag, answers If-None-Match with 304 and serves byte ranges
+(Range, If-Range). Bumping server.versions[path] changes the file behind a URL.
+"""
+import re
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_IMAGE_SIZE = 256 * 1024
+RANGE_PATTERN = re.compile(r'bytes=(\d+)-$')
+
+
+def image_body(path, size, version=0):
+    """Content served for a URL path, size and version"""
+    seed = path.encode('utf-8') + (f"#v{version}".encode('utf-8') if version else b'')
+    return (seed * (size // max(len(seed), 1) + 1))[:size]
+
+
+class ImageHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like the Reddit CDN
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        size = int(parse_qs(parsed.query).get('size', [DEFAULT_IMAGE_SIZE])[0])
+        version = self.server.versions.get(parsed.path, 0)
+        body = image_body(parsed.path, size, version)
+        etag = f'"{zlib.crc32(image_body(parsed.path, 64, version)):x}-{size}"'
+
+        status = 200
+        content_range = None
+        requested = RANGE_PATTERN.match(self.headers.get('Range', ''))
+        if self.headers.get('If-None-Match') == etag:
+            status = 304
+            body = b''
+        elif requested and self.headers.get('If-Range', etag) == etag:
+            start = int(requested.group(1))
+            if start >= size:
+                status = 416
+                content_range = f"bytes */{size}"
+                body = b''
+            else:
+                status = 206
+                content_range = f"bytes {start}-{size - 1}/{size}"
+                body = body[start:]
+        self.server.requests.append({'path': parsed.path, 'range': self.headers.get('Range'), 'status': status})
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'image/jpeg')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        if content_range:
+            self.send_header('Content-Range', content_range)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ImageServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients that stop reading (aborted or 304'd downloads) are expected
+        pass
+
+
+def start(port=0):
+    """Serve on 127.0.0.1 from a daemon thread; returns (server, base_url)"""
+    server = ImageServer(('127.0.0.1', port), ImageHandler)
+    server.versions = {}  # URL path -> version, bump to change the file
+    server.requests = []  # {'path', 'range', 'status'} per request
+    thread = threading.Thread(target=server.serve_forever, name='image-server')
+    thread.daemon = True
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
@@ -0,0 +1,408 @@
+"""Offline benchmarks for the app's hot paths, printed as JSON
+
+    python -m benchmarks.run --sizes 10000,100000 --output results.json
+
+Reddit is replaced by benchmarks.fake_reddit and images are served from a local
+HTTP server, so no credentials or network access are needed. Each benchmark runs
+in its own temporary working directory. Compare the JSON of two commits to spot
+regressions.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+import background_writer
+import downloads
+import image_index
+import main
+import post_rules
+from benchmarks import generate_analytics_log, image_server
+from benchmarks.fake_reddit import FakeReddit
+
+BENCHMARKS = ('recent_posts', 'analytics', 'monitor', 'downloads', 'rules', 'image_index')
+SUBREDDIT = 'PhotoshopRequest'
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Run the offline benchmarks')
+    parser.add_argument('--only', default=','.join(BENCHMARKS), help='comma separated benchmarks to run')
+    parser.add_argument('--sizes', default='10000,100000', help='analytics log sizes in lines, e.g. 10000,100000,1000000')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per timed call')
+    parser.add_argument('--api-latency', type=float, default=0.0, help='simulated seconds per Reddit API call')
+    parser.add_argument('--monitor-rounds', type=int, default=10, help='post bursts injected in the monitor benchmark')
+    parser.add_argument('--burst', type=int, default=5, help='posts per injected burst')
+    parser.add_argument('--gallery-size', type=int, default=20, help='images per post in the download benchmark')
+    parser.add_argument('--image-size', type=int, default=image_server.DEFAULT_IMAGE_SIZE, help='bytes per image')
+    parser.add_argument('--rules', type=int, default=500, help='synthetic tagging rules in the rules benchmark')
+    parser.add_argument('--index-size', type=int, default=300000, help='stored hashes in the image index benchmark')
+    parser.add_argument('--output', help='write the JSON results to this file instead of stdout')
+    return parser.parse_args(argv)
+
+
+def reset_state():
+    """Write out pending files and drop main's cached state so it is reloaded from the working directory"""
+    background_writer.flush()
+    if main.posts_db is not None:
+        main.posts_db.close()
+        main.posts_db = None
+    if downloads._cache_db is not None:
+        downloads._cache_db.close()
+        downloads._cache_db = None
+    main.seen_generations = None
+    main.completed_posts = None
+    main.post_descriptions.clear()
+    main.post_media.clear()
+    if image_index._db is not None:
+        image_index._db.close()
+        image_index._db = None
+    image_index._tables = None
+    del image_index._hashes[:], image_index._rowids[:]
+
+
+def fresh_workdir():
+    """Switch to an empty temp directory with fresh app state"""
+    reset_state()
+    workdir = tempfile.mkdtemp(prefix='bench-')
+    os.chdir(workdir)
+    return workdir
+
+
+def timed(function, *args, **kwargs):
+    """Return (result, seconds) of one call"""
+    started = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+def summarize(samples):
+    """min/median/p95/max of a list of seconds, rounded to microseconds"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return {
+        'count': len(ordered),
+        'min': round(ordered[0], 6),
+        'median': round(statistics.median(ordered), 6),
+        'p95': round(p95, 6),
+        'max': round(ordered[-1], 6)
+    }
+
+
+def peak_memory(function, *args, **kwargs):
+    """Peak Python heap allocation in bytes during one call (SQLite's own allocations are not traced)"""
+    tracemalloc.start()
+    try:
+        function(*args, **kwargs)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_recent_posts(reddit, args):
+    """get_recent_posts first launch over 1000 posts, then an incremental load of 50 new posts"""
+    reddit.add_posts(SUBREDDIT, 1000)
+    first_page = {}
+    main.headless_handlers['recentPostsPage'] = lambda page: first_page.setdefault('at', time.perf_counter())
+
+    started = time.perf_counter()
+    first = main.get_recent_posts(SUBREDDIT)
+    first_seconds = time.perf_counter() - started
+    first_page_seconds = first_page.get('at', started) - started
+    _, first_flush = timed(background_writer.flush)
+
+    reddit.add_posts(SUBREDDIT, 50)
+    first_page.clear()
+    started = time.perf_counter()
+    incremental = main.get_recent_posts(SUBREDDIT)
+    incremental_seconds = time.perf_counter() - started
+    incremental_page_seconds = first_page.get('at', started) - started
+    _, incremental_flush = timed(background_writer.flush)
+
+    main.headless_handlers.pop('recentPostsPage', None)
+    return {
+        'first_launch': {
+            'posts': first.get('new_posts'),
+            'seconds': round(first_seconds, 6),
+            'first_page_seconds': round(first_page_seconds, 6),
+            'writer_flush_seconds': round(first_flush, 6)
+        },
+        'incremental': {
+            'posts': incremental.get('new_posts'),
+            'seconds': round(incremental_seconds, 6),
+            'first_page_seconds': round(incremental_page_seconds, 6),
+            'writer_flush_seconds': round(incremental_flush, 6)
+        }
+    }
+
+
+def bench_analytics(sizes, args):
+    """Import, query and in-memory fold of synthetic analytics logs of each size"""
+    results = {}
+    for size in sizes:
+        reset_state()
+        for name in os.listdir('.'):
+            os.remove(name)
+        _, generate_seconds = timed(generate_analytics_log.write_log, main.POSTS_ANALYTICS_FILE, size)
+        _, import_seconds = timed(main.get_posts_db)
+
+        query_times = [timed(main.get_posts_analytics)[1] for _ in range(args.repeat)]
+        today = datetime.now().strftime('%Y-%m-%d')
+        filtered_times = [
+            timed(main.get_posts_analytics, None, today, {'post_type': 'PAID'})[1] for _ in range(args.repeat)
+        ]
+
+        def fold_log():
+            with open(main.POSTS_ANALYTICS_FILE, 'r', encoding='utf-8') as f:
+                return main.calculate_detailed_analytics(json.loads(line) for line in f)
+
+        fold_times = [timed(fold_log)[1] for _ in range(args.repeat)]
+        results[str(size)] = {
+            'log_bytes': os.path.getsize(main.POSTS_ANALYTICS_FILE),
+            'generate_seconds': round(generate_seconds, 6),
+            'import_seconds': round(import_seconds, 6),
+            'get_posts_analytics': summarize(query_times),
+            'get_posts_analytics_filtered': summarize(filtered_times),
+            'get_posts_analytics_peak_bytes': peak_memory(main.get_posts_analytics),
+            'calculate_detailed_analytics': summarize(fold_times),
+            'calculate_detailed_analytics_peak_bytes': peak_memory(fold_log)
+        }
+    return results
+
+
+def bench_monitor(reddit, args):
+    """Seconds from a post appearing to newPostsDetected, with a 1 second polling interval"""
+    reddit.add_posts(SUBREDDIT, 10)
+    detected = {}
+    arrived = threading.Condition()
+    poll_times = []
+
+    def on_new_posts(posts):
+        now = time.time()
+        with arrived:
+            for post in posts:
+                detected[post['id']] = now
+            arrived.notify_all()
+
+    original_poll = main.poll_subreddit_group
+
+    def timed_poll(group):
+        _, seconds = timed(original_poll, group)
+        poll_times.append(seconds)
+
+    main.headless_handlers['newPostsDetected'] = on_new_posts
+    main.poll_subreddit_group = timed_poll
+    latencies = []
+    missed = 0
+    try:
+        main.add_subreddit(SUBREDDIT, 1)
+        with arrived:
+            arrived.wait_for(lambda: detected, timeout=10)  # First poll only sets the cursor
+
+        rng = random.Random(1)
+        for _ in range(args.monitor_rounds):
+            time.sleep(rng.uniform(0, 1))
+            injected_at = time.time()
+            posts = reddit.add_posts(SUBREDDIT, args.burst, created_utc=injected_at)
+            ids = [post.id for post in posts]
+            with arrived:
+                arrived.wait_for(lambda: all(post_id in detected for post_id in ids), timeout=10)
+                for post_id in ids:
+                    if post_id in detected:
+                        latencies.append(detected[post_id] - injected_at)
+                    else:
+                        missed += 1
+    finally:
+        main.stop_monitoring()
+        while main.monitor_thread is not None:
+            time.sleep(0.05)
+        main.poll_subreddit_group = original_poll
+        main.headless_handlers.pop('newPostsDetected', None)
+
+    return {
+        'interval_seconds': 1,
+        'posts': args.monitor_rounds * args.burst,
+        'missed': missed,
+        'detection_latency': summarize(latencies),
+        'poll_duration': summarize(poll_times)
+    }
+
+
+def bench_downloads(reddit, args):
+    """download_from_url of one gallery from the local image server: unseen, already cached, and seen by the monitor"""
+    post = reddit.add_posts(SUBREDDIT, 1, gallery_size=args.gallery_size, image_size=args.image_size)[0]
+    post_url = f"https://www.reddit.com{post.permalink}"
+    save_directory = os.path.abspath('downloads')
+    os.makedirs(save_directory)
+
+    calls_before = reddit.calls['submission']
+    cold, cold_seconds = timed(main.download_from_url, post_url, save_directory)
+    cold_calls = reddit.calls['submission'] - calls_before
+    total_bytes = sum(result['bytes'] for result in cold.get('results', []))
+    warm, warm_seconds = timed(main.download_from_url, post_url, save_directory)
+
+    # A post the monitor detected has its image URLs cached, so no submission call is made
+    seen = reddit.add_posts(SUBREDDIT, 1, gallery_size=args.gallery_size, image_size=args.image_size)[0]
+    main.emit_new_posts([seen], SUBREDDIT)
+    calls_before = reddit.calls['submission']
+    detected, detected_seconds = timed(main.download_from_url, f"https://www.reddit.com{seen.permalink}", save_directory)
+    detected_calls = reddit.calls['submission'] - calls_before
+    return {
+        'images': args.gallery_size,
+        'image_bytes': args.image_size,
+        'cold': {
+            'status': cold['status'],
+            'files': cold.get('count'),
+            'seconds': round(cold_seconds, 6),
+            'bytes_per_second': round(total_bytes / cold_seconds) if cold_seconds else None,
+            'submission_calls': cold_calls
+        },
+        'cached': {
+            'status': warm['status'],
+            'files': warm.get('count'),
+            'seconds': round(warm_seconds, 6)
+        },
+        'detected': {
+            'status': detected['status'],
+            'files': detected.get('count'),
+            'seconds': round(detected_seconds, 6),
+            'submission_calls': detected_calls
+        }
+    }
+
+
+def bench_rules(reddit, args):
+    """post_rules.match_post per post with the default rules plus many synthetic keyword and regex rules"""
+    rng = random.Random(1)
+    words = [''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(3, 9))) for _ in range(5000)]
+    rules = list(post_rules.DEFAULT_RULES)
+    for index in range(args.rules):
+        if index % 5:
+            rules.append({'name': f"keyword {index}", 'keywords': [' '.join(rng.sample(words, rng.randint(1, 2))) for _ in range(3)]})
+        else:
+            rules.append({'name': f"pattern {index}", 'patterns': [rng.choice(words) + r'\s+\d+', r'\b(?:re)?' + rng.choice(words) + r'(?:ing|ed)\b']})
+    _, compile_seconds = timed(post_rules.set_rules, rules)
+
+    posts = []
+    for _ in range(1000):
+        title = ' '.join(rng.choice(words) for _ in range(rng.randint(4, 15)))
+        description = ' '.join(rng.choice(words) for _ in range(rng.randint(0, 150)))
+        posts.append((title, description))
+    try:
+        match_times = [timed(post_rules.match_post, title, description)[1] for title, description in posts]
+    finally:
+        main.load_post_rules()
+    return {
+        'rules': len(rules),
+        'compile_seconds': round(compile_seconds, 6),
+        'match_post': summarize(match_times)
+    }
+
+
+def bench_image_index(args):
+    """Loading and searching an image index of random hashes; queries are stored hashes with a few bits flipped"""
+    rng = random.Random(1)
+    hashes = [rng.getrandbits(64) for _ in range(args.index_size)]
+    conn = image_index._get_db()
+    conn.executemany(
+        'INSERT INTO image_hashes (post_id, path, url, hash, added) VALUES (?, ?, NULL, ?, 0)',
+        ((f"post{index}", f"{index}.jpg", image_index._to_signed(value)) for index, value in enumerate(hashes))
+    )
+    conn.commit()
+    reset_state()
+    _, load_seconds = timed(image_index.count)
+
+    queries = []
+    for _ in range(1000):
+        query = rng.choice(hashes)
+        for bit in rng.sample(range(64), rng.randint(0, image_index.MATCH_DISTANCE + 2)):
+            query ^= 1 << bit
+        queries.append(query)
+    search_times = [timed(image_index.search, query)[1] for query in queries]
+    _, linear_seconds = timed(lambda: [value for value in hashes if image_index.hamming(queries[0], value) <= image_index.MATCH_DISTANCE])
+    return {
+        'hashes': args.index_size,
+        'load_seconds': round(load_seconds, 6),
+        'search': summarize(search_times),
+        'linear_scan_seconds': round(linear_seconds, 6)
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=REPO_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def run_benchmarks(args):
+    """Run the selected benchmarks and return the JSON-ready report"""
+    selected = [name.strip() for name in args.only.split(',') if name.strip()]
+    unknown = set(selected) - set(BENCHMARKS)
+    if unknown:
+        raise SystemExit(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+
+    server, base_url = image_server.start()
+    reddit = FakeReddit(api_latency=args.api_latency, image_base_url=base_url)
+    main.reddit = reddit
+    # Served payloads are not real images, so downloads and new posts are not hashed
+    downloads.configure(None)
+    image_index.check_post = lambda post_id, image_urls: None
+    original_cwd = os.getcwd()
+    results = {}
+    try:
+        for name in selected:
+            print(f"Running {name}...", file=sys.stderr)
+            workdir = fresh_workdir()
+            if name == 'recent_posts':
+                results[name] = bench_recent_posts(reddit, args)
+            elif name == 'analytics':
+                results[name] = bench_analytics(sizes, args)
+            elif name == 'monitor':
+                results[name] = bench_monitor(reddit, args)
+            elif name == 'downloads':
+                results[name] = bench_downloads(reddit, args)
+            elif name == 'rules':
+                results[name] = bench_rules(reddit, args)
+            elif name == 'image_index':
+                results[name] = bench_image_index(args)
+            reset_state()
+            os.chdir(original_cwd)
+            shutil.rmtree(workdir, ignore_errors=True)
+    finally:
+        os.chdir(original_cwd)
+        server.shutdown()
+
+    return {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'started': datetime.now().isoformat(timespec='seconds'),
+        'config': vars(args),
+        'results': results
+    }
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    report = run_benchmarks(args)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
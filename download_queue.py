@@ -0,0 +1,288 @@
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+
+import downloads
+
+# Job queue settings
+JOBS_FILE = 'download_jobs.db'
+MAX_ACTIVE_POSTS = 3  # Posts downloaded at the same time across all jobs
+PROGRESS_INTERVAL = 0.5  # Minimum seconds between progress events of one job
+
+_resolve_post = None  # post reference (id or URL) -> (post_id, image_urls)
+_on_progress = None  # called with a job progress dict
+_jobs = {}  # job_id -> in-memory progress of unfinished and recent jobs
+_work = queue.Queue()
+_workers = []
+_db = None
+_lock = threading.RLock()
+
+
+class JobCancelled(Exception):
+    """Raised from the progress callback to abort a download of a cancelled job"""
+
+
+def configure(resolve_post, on_progress=None):
+    """Set how post references are resolved to image URLs and where progress goes"""
+    global _resolve_post, _on_progress
+    _resolve_post = resolve_post
+    _on_progress = on_progress
+
+
+def get_db():
+    """Open the job database on first use"""
+    global _db
+    if _db is None:
+        conn = sqlite3.connect(JOBS_FILE, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                description TEXT,
+                save_directory TEXT,
+                status TEXT,
+                created REAL
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS job_items (
+                job_id TEXT,
+                post_ref TEXT,
+                status TEXT,
+                files INTEGER DEFAULT 0,
+                bytes INTEGER DEFAULT 0,
+                error TEXT,
+                PRIMARY KEY (job_id, post_ref)
+            )
+        """)
+        conn.commit()
+        _db = conn
+    return _db
+
+
+def submit(post_refs, save_directory, description=''):
+    """Queue a download job for many posts and return its id"""
+    post_refs = list(dict.fromkeys(post_refs))  # Drop duplicates, keep order
+    job_id = uuid.uuid4().hex[:12]
+    with _lock:
+        conn = get_db()
+        conn.execute(
+            'INSERT INTO jobs (job_id, description, save_directory, status, created) VALUES (?, ?, ?, ?, ?)',
+            (job_id, description, save_directory, 'queued', time.time())
+        )
+        conn.executemany(
+            "INSERT INTO job_items (job_id, post_ref, status) VALUES (?, ?, 'pending')",
+            [(job_id, post_ref) for post_ref in post_refs]
+        )
+        conn.commit()
+        job = _new_job(job_id, description, save_directory, len(post_refs))
+    _enqueue(job, post_refs)
+    return job_id
+
+
+def resume_jobs():
+    """Re-queue the unfinished items of jobs interrupted by an app restart"""
+    with _lock:
+        conn = get_db()
+        rows = conn.execute(
+            "SELECT job_id, description, save_directory FROM jobs WHERE status IN ('queued', 'running')"
+        ).fetchall()
+        resumed = []
+        for job_id, description, save_directory in rows:
+            items = conn.execute(
+                'SELECT post_ref, status, files, bytes FROM job_items WHERE job_id = ?', (job_id,)
+            ).fetchall()
+            job = _new_job(job_id, description, save_directory, len(items))
+            pending = []
+            for post_ref, status, files, size in items:
+                if status == 'pending':
+                    pending.append(post_ref)
+                else:
+                    job['posts_done'] += 1
+                    job['posts_resolved'] += 1
+                    job['files_total'] += files
+                    job['files_done'] += files
+                    job['bytes'] += size
+                    job['errors'] += 1 if status == 'error' else 0
+            resumed.append((job, pending))
+    for job, pending in resumed:
+        _enqueue(job, pending)
+    return [job['job_id'] for job, _ in resumed]
+
+
+def cancel(job_id):
+    """Cancel a job; downloads in flight stop at their next chunk"""
+    with _lock:
+        job = _jobs.get(job_id)
+        if job is None or job['status'] in ('done', 'cancelled'):
+            return False
+        job['status'] = 'cancelled'
+        conn = get_db()
+        conn.execute("UPDATE jobs SET status = 'cancelled' WHERE job_id = ?", (job_id,))
+        conn.execute("UPDATE job_items SET status = 'cancelled' WHERE job_id = ? AND status = 'pending'", (job_id,))
+        conn.commit()
+    _report(job, force=True)
+    return True
+
+
+def list_jobs():
+    """Return the progress of every job known to this process"""
+    with _lock:
+        return [_snapshot(job) for job in _jobs.values()]
+
+
+def wait(poll_interval=0.5):
+    """Block until every queued job has finished"""
+    while True:
+        with _lock:
+            if all(job['status'] in ('done', 'cancelled') for job in _jobs.values()):
+                return
+        time.sleep(poll_interval)
+
+
+def _new_job(job_id, description, save_directory, posts_total):
+    job = {
+        'job_id': job_id,
+        'description': description,
+        'save_directory': save_directory,
+        'status': 'queued',
+        'posts_total': posts_total,
+        'posts_done': 0,
+        'posts_resolved': 0,
+        'files_total': 0,
+        'files_done': 0,
+        'bytes': 0,
+        'errors': 0,
+        'started': None,
+        'last_report': 0
+    }
+    _jobs[job_id] = job
+    return job
+
+
+def _enqueue(job, post_refs):
+    if not post_refs:
+        _finish_if_complete(job)
+        return
+    for post_ref in post_refs:
+        _work.put((job, post_ref))
+    with _lock:
+        while len(_workers) < MAX_ACTIVE_POSTS:
+            worker = threading.Thread(target=_worker)
+            worker.daemon = True
+            worker.start()
+            _workers.append(worker)
+
+
+def _worker():
+    while True:
+        job, post_ref = _work.get()
+        try:
+            if job['status'] != 'cancelled':
+                _run_item(job, post_ref)
+        finally:
+            _work.task_done()
+
+
+def _run_item(job, post_ref):
+    with _lock:
+        if job['status'] == 'queued':
+            job['status'] = 'running'
+            job['started'] = time.time()
+            get_db().execute("UPDATE jobs SET status = 'running' WHERE job_id = ?", (job['job_id'],))
+            get_db().commit()
+
+    def on_chunk(size):
+        if job['status'] == 'cancelled':
+            raise JobCancelled()
+        with _lock:
+            job['bytes'] += size
+        _report(job)
+
+    files = 0
+    size = 0
+    error = None
+    try:
+        post_id, image_urls = _resolve_post(post_ref)
+        with _lock:
+            job['posts_resolved'] += 1
+            job['files_total'] += len(image_urls)
+        results = downloads.download_files(image_urls, job['save_directory'], post_id=post_id, progress=on_chunk)
+        for result in results:
+            size += result['bytes']
+            if result['status'] == 'error':
+                error = result['error']
+            else:
+                files += 1
+        if not image_urls:
+            error = 'No downloadable images'
+    except Exception as e:
+        error = str(e)
+
+    if job['status'] == 'cancelled':
+        status = 'cancelled'
+    else:
+        status = 'error' if error else 'done'
+    with _lock:
+        job['posts_done'] += 1
+        job['files_done'] += files
+        job['errors'] += 1 if status == 'error' else 0
+        conn = get_db()
+        conn.execute(
+            'UPDATE job_items SET status = ?, files = ?, bytes = ?, error = ? WHERE job_id = ? AND post_ref = ?',
+            (status, files, size, error, job['job_id'], post_ref)
+        )
+        conn.commit()
+    if not _finish_if_complete(job):
+        _report(job, force=True)
+
+
+def _finish_if_complete(job):
+    with _lock:
+        if job['status'] in ('done', 'cancelled') or job['posts_done'] < job['posts_total']:
+            return False
+        job['status'] = 'done'
+        get_db().execute("UPDATE jobs SET status = 'done' WHERE job_id = ?", (job['job_id'],))
+        get_db().commit()
+    _report(job, force=True)
+    return True
+
+
+def _snapshot(job):
+    """Build the progress event sent to the UI, including a rough ETA"""
+    elapsed = time.time() - job['started'] if job['started'] else 0
+    eta = None
+    if job['files_done'] > 0 and elapsed > 0 and job['status'] == 'running':
+        files_per_post = job['files_total'] / max(job['posts_resolved'], 1)
+        remaining_files = (job['files_total'] - job['files_done']
+                           + (job['posts_total'] - job['posts_resolved']) * files_per_post)
+        eta = round(remaining_files / (job['files_done'] / elapsed), 1)
+    return {
+        'job_id': job['job_id'],
+        'description': job['description'],
+        'status': job['status'],
+        'posts_total': job['posts_total'],
+        'posts_done': job['posts_done'],
+        'files_total': job['files_total'],
+        'files_done': job['files_done'],
+        'bytes': job['bytes'],
+        'bytes_per_second': round(job['bytes'] / elapsed) if elapsed > 0 else 0,
+        'errors': job['errors'],
+        'eta_seconds': eta
+    }
+
+
+def _report(job, force=False):
+    now = time.time()
+    with _lock:
+        if not force and now - job['last_report'] < PROGRESS_INTERVAL:
+            return
+        job['last_report'] = now
+        progress = _snapshot(job)
+    if _on_progress:
+        try:
+            _on_progress(progress)
+        except Exception as e:
+            print(f"Failed to report download progress: {str(e)}")
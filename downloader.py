@@ -1,51 +1,97 @@
 import os
+import sys
 from dotenv import load_dotenv
-import praw
-import requests
+
+import download_queue
+import downloads
 
 
 load_dotenv()
 
-client_id = os.getenv('CLIENT_ID')
-client_secret = os.getenv('CLIENT_SECRET')
-user_agent = os.getenv('USER_AGENT')
+reddit = None
+save_directory = 'C:/Users/matus/Desktop/photos-reque/downloads/'
+
 
-reddit = praw.Reddit(client_id=client_id, client_secret=client_secret, user_agent=user_agent)
+def get_reddit():
+    global reddit
+    if reddit is None:
+        import praw
+        reddit = praw.Reddit(client_id=os.getenv('CLIENT_ID'), client_secret=os.getenv('CLIENT_SECRET'),
+                             user_agent=os.getenv('USER_AGENT'))
+    return reddit
 
-save_directory = 'C:/Users/matus/Desktop/photos-reque/downloads/'
-if not os.path.exists(save_directory):
-    os.makedirs(save_directory)
 
 def download_image(image_url, save_directory):
-    response = requests.get(image_url)
-    if response.status_code == 200:
+    report(downloads.download_files([image_url], save_directory))
+
+
+def report(results):
+    for result in results:
+        if result['status'] == 'success':
+            print(f"Downloaded {os.path.basename(result['path'])}")
+        elif result['status'] == 'cached':
+            print(f"Already downloaded {os.path.basename(result['path'])}")
+        else:
+            print(f"Failed {result['url']}: {result['error']}")
+
+
+def gallery_urls(submission):
+    image_urls = []
+    for item in submission.gallery_data['items']:
+        image_id = item['media_id']
+        image_urls.append(submission.media_metadata[image_id]['s']['u'].replace('&amp;', '&'))
+    return image_urls
+
+
+def resolve_post(link):
+    submission = get_reddit().submission(url=link)
+    if submission.url.endswith(('jpg', 'jpeg', 'png')):
+        return submission.id, [submission.url]
+    if hasattr(submission, 'gallery_data'):
+        return submission.id, gallery_urls(submission)
+    return submission.id, []
+
+
+def print_progress(progress):
+    eta = f", ETA {progress['eta_seconds']:.0f}s" if progress['eta_seconds'] is not None else ''
+    print(f"[{progress['status']}] posts {progress['posts_done']}/{progress['posts_total']}, "
+          f"files {progress['files_done']}/{progress['files_total']}, "
+          f"{progress['bytes'] / 1048576:.1f} MB, errors {progress['errors']}{eta}")
+
 
-        file_name = image_url.split('/')[-1].split('?')[0]
-        file_path = os.path.join(save_directory, file_name)
-        with open(file_path, 'wb') as file:
-            file.write(response.content)
-        print(f"Downloaded {file_name}")
+def queue_links_file(links_path, save_directory):
+    with open(links_path, 'r', encoding='utf-8') as f:
+        links = [line.strip() for line in f if line.strip()]
+    download_queue.configure(resolve_post, print_progress)
+    download_queue.resume_jobs()
+    download_queue.submit(links, save_directory, os.path.basename(links_path))
+    download_queue.wait()
 
 
 def check(link, save_directory):
     try:
-        submission = reddit.submission(url=link)
+        submission = get_reddit().submission(url=link)
         
         if submission.url.endswith(('jpg', 'jpeg', 'png')):
-            download_image(submission.url, save_directory)
+            report(downloads.download_files([submission.url], save_directory, post_id=submission.id))
             print(f"\nIMAGE DOWNLOADED\n")
         elif hasattr(submission, 'gallery_data'):
-            lenght = len(submission.gallery_data) + 1
-            for item in submission.gallery_data['items']:
-                image_id = item['media_id']
-                image_url = submission.media_metadata[image_id]['s']['u']
-                download_image(image_url, save_directory)
+            results = downloads.download_files(gallery_urls(submission), save_directory, post_id=submission.id)
+            report(results)
+            lenght = sum(1 for result in results if result['status'] != 'error')
             print(f"\nIMAGES -> {lenght} <- DOWNLOADED\n")
 
     except Exception as e:
         print(f"An error occurred: {e}")
         
         
-print("LINK -> ", end="")
-link = input()
-check(link, save_directory)
\ No newline at end of file
+if __name__ == '__main__':
+    # Headless mode: python downloader.py links.txt [save_directory]
+    if len(sys.argv) > 1:
+        queue_links_file(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else save_directory)
+    else:
+        if not os.path.exists(save_directory):
+            os.makedirs(save_directory)
+        print("LINK -> ", end="")
+        link = input()
+        check(link, save_directory)
\ No newline at end of file
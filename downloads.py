@@ -0,0 +1,342 @@
+import hashlib
+import mimetypes
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import metrics
+
+# Download settings
+MAX_DOWNLOAD_WORKERS = 6  # Parallel image downloads per gallery
+HOST_CONNECTION_LIMIT = 4  # Concurrent downloads from the same host
+CHUNK_SIZE = 64 * 1024  # Bytes written per chunk while streaming
+REQUEST_TIMEOUT = (10, 60)  # Connect / read timeout in seconds
+USER_AGENT = 'RedditMonitor/1.0'
+DOWNLOAD_CACHE_FILE = 'download_cache.db'
+CONTENT_TYPE_EXTENSIONS = {
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/gif': '.gif',
+    'image/webp': '.webp'
+}
+
+_session = None
+_session_lock = threading.Lock()
+_cache_db = None
+_cache_lock = threading.Lock()
+_host_slots = {}
+_on_saved = None  # called with (result, post_id) for every newly downloaded file
+
+
+def configure(on_saved):
+    """Set what is done with each newly downloaded file (e.g. indexing it)"""
+    global _on_saved
+    _on_saved = on_saved
+
+
+def get_session():
+    """Return the shared HTTP session, creating it on first use"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            session.headers['User-Agent'] = USER_AGENT
+            # Keep enough pooled keep-alive connections for every worker
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=MAX_DOWNLOAD_WORKERS)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+        return _session
+
+
+def host_slot(image_url):
+    """Return the semaphore limiting concurrent downloads from the URL's host"""
+    host = urlparse(image_url).netloc.lower()
+    with _session_lock:
+        if host not in _host_slots:
+            _host_slots[host] = threading.BoundedSemaphore(HOST_CONNECTION_LIMIT)
+        return _host_slots[host]
+
+
+def get_cache_db():
+    """Open the download cache index on first use"""
+    global _cache_db
+    if _cache_db is None:
+        conn = sqlite3.connect(DOWNLOAD_CACHE_FILE, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS downloads (
+                url TEXT,
+                directory TEXT,
+                path TEXT,
+                sha256 TEXT,
+                size INTEGER,
+                etag TEXT,
+                last_modified TEXT,
+                content_type TEXT,
+                complete INTEGER,
+                updated REAL,
+                PRIMARY KEY (url, directory)
+            )
+        """)
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_downloads_hash ON downloads (sha256, directory)')
+        conn.commit()
+        _cache_db = conn
+    return _cache_db
+
+
+def cache_lookup(image_url, directory):
+    """Return the cache entry for a URL in a directory, if any"""
+    with _cache_lock:
+        row = get_cache_db().execute(
+            'SELECT * FROM downloads WHERE url = ? AND directory = ?', (image_url, directory)
+        ).fetchone()
+    return dict(row) if row else None
+
+
+def cache_find_hash(sha256, directory):
+    """Return the path of a completed file with the given content hash in a directory"""
+    with _cache_lock:
+        row = get_cache_db().execute(
+            'SELECT path FROM downloads WHERE sha256 = ? AND directory = ? AND complete = 1',
+            (sha256, directory)
+        ).fetchone()
+    return row['path'] if row else None
+
+
+def cache_store(entry):
+    """Insert or replace a cache entry"""
+    entry = dict(entry, updated=time.time())
+    columns = ', '.join(entry)
+    placeholders = ', '.join('?' for _ in entry)
+    with _cache_lock:
+        conn = get_cache_db()
+        conn.execute(f'INSERT OR REPLACE INTO downloads ({columns}) VALUES ({placeholders})', tuple(entry.values()))
+        conn.commit()
+
+
+def file_stem_for_url(image_url):
+    """Derive a file name stem from the last URL path segment"""
+    file_name = image_url.split('/')[-1].split('?')[0]
+    return os.path.splitext(file_name)[0] or 'image'
+
+
+def extension_for(content_type, image_url):
+    """Pick a file extension from the response content type, falling back to the URL"""
+    extension = CONTENT_TYPE_EXTENSIONS.get(content_type) or mimetypes.guess_extension(content_type or '')
+    if extension:
+        return extension
+    return os.path.splitext(image_url.split('?')[0])[1].lower()
+
+
+def unique_path(directory, stem, extension):
+    """Return a path for stem + extension that does not overwrite an existing file"""
+    file_path = os.path.join(directory, stem + extension)
+    counter = 1
+    while os.path.exists(file_path):
+        file_path = os.path.join(directory, f"{stem}-{counter}{extension}")
+        counter += 1
+    return file_path
+
+
+def hash_file(file_path, sha):
+    """Feed an existing file into a running hash"""
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b''):
+            sha.update(chunk)
+
+
+def expected_size(response):
+    """Full size of the file a 200 or 206 response is part of, or None if unknown"""
+    content_range = response.headers.get('Content-Range', '')
+    if '/' in content_range:
+        total = content_range.rsplit('/', 1)[1].strip()
+        return int(total) if total.isdigit() else None
+    if response.status_code == 200 and not response.headers.get('Content-Encoding'):
+        length = response.headers.get('Content-Length', '')
+        return int(length) if length.isdigit() else None
+    return None
+
+
+def download_file(image_url, save_directory, file_stem=None, revalidate=False, progress=None):
+    """Stream one image to disk through a resumable temp file and return its result
+    
+    Completed downloads are looked up in the cache and skipped, or revalidated with
+    ETag/If-Modified-Since when revalidate is set. A .part file left by an interrupted
+    download is resumed with a Range request. progress is called with the size of
+    every chunk written; an exception raised from it aborts the download.
+    """
+    directory = os.path.abspath(save_directory)
+    stem = file_stem or file_stem_for_url(image_url)
+    part_path = os.path.join(directory, stem + '.part')
+    result = {'url': image_url, 'path': None, 'status': 'error', 'bytes': 0, 'error': None}
+    
+    entry = cache_lookup(image_url, directory)
+    headers = {}
+    resume_from = 0
+    part_complete = False
+    if entry and entry['complete'] and os.path.exists(entry['path']) and os.path.getsize(entry['path']) == entry['size']:
+        result.update(path=entry['path'], status='cached')
+        if not revalidate:
+            return result
+        if entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+    elif entry and not entry['complete'] and os.path.exists(part_path) and (entry['etag'] or entry['last_modified']):
+        resume_from = os.path.getsize(part_path)
+        if entry['size'] and resume_from == entry['size']:
+            # Interrupted after the whole body was written but before the rename
+            part_complete = True
+        elif entry['size'] and resume_from > entry['size']:
+            os.remove(part_path)
+            resume_from = 0
+        else:
+            headers['Range'] = f"bytes={resume_from}-"
+            # If the file changed on the server, If-Range makes it send the whole new file
+            headers['If-Range'] = entry['etag'] or entry['last_modified']
+    
+    refetch = False
+    try:
+        if part_complete:
+            return finish_part(result, entry, directory, stem, part_path)
+        sha = hashlib.sha256()
+        with host_slot(image_url), \
+                get_session().get(image_url, headers=headers, stream=True, timeout=REQUEST_TIMEOUT) as response:
+            if response.status_code == 304:
+                return result
+            if response.status_code == 416 and resume_from:
+                # The .part file already covers the whole file, or no longer matches it
+                if expected_size(response) == resume_from:
+                    return finish_part(result, entry, directory, stem, part_path)
+                os.remove(part_path)
+                refetch = True
+            elif response.status_code == 206 and resume_from:
+                hash_file(part_path, sha)
+                mode = 'ab'
+            elif response.status_code == 200:
+                mode = 'wb'
+            else:
+                result.update(status='error', error=f"HTTP {response.status_code}")
+                return result
+            
+            if not refetch:
+                content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+                validators = {
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                    'content_type': content_type
+                }
+                # Record validators and the full size before streaming so an interrupted download can be resumed
+                cache_store(dict(url=image_url, directory=directory, complete=0,
+                                 size=expected_size(response), **validators))
+                
+                with open(part_path, mode) as file:
+                    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                        file.write(chunk)
+                        sha.update(chunk)
+                        result['bytes'] += len(chunk)
+                        if progress:
+                            progress(len(chunk))
+        
+        if refetch:
+            # Outside the host slot, so the retry does not wait on a slot this thread holds
+            return download_file(image_url, save_directory, file_stem, revalidate, progress)
+        finish_part(result, dict(validators, path=entry and entry['path']), directory, stem, part_path, sha)
+    except Exception as e:
+        # The .part file is kept so the next attempt can resume it
+        result.update(status='error', error=str(e))
+    return result
+
+
+def finish_part(result, entry, directory, stem, part_path, sha=None):
+    """Move a completely written .part file to its final name and record it in the cache
+    
+    entry holds the validators and content type of the download, and the path of an
+    earlier version of the file to replace. sha is the running hash of the .part file;
+    without it the file is hashed from disk.
+    """
+    if sha is None:
+        sha = hashlib.sha256()
+        hash_file(part_path, sha)
+    digest = sha.hexdigest()
+    size = os.path.getsize(part_path)
+    duplicate = cache_find_hash(digest, directory)
+    if duplicate and os.path.exists(duplicate):
+        # Same content is already on disk under another name
+        os.remove(part_path)
+        file_path = duplicate
+    else:
+        if entry['path'] and os.path.exists(entry['path']):
+            file_path = entry['path']
+        else:
+            file_path = unique_path(directory, stem, extension_for(entry['content_type'], result['url']))
+        # Only a complete file ever appears under the final name
+        os.replace(part_path, file_path)
+    
+    cache_store(dict(url=result['url'], directory=directory, path=file_path, sha256=digest, size=size, complete=1,
+                     etag=entry['etag'], last_modified=entry['last_modified'], content_type=entry['content_type']))
+    result.update(status='success', path=file_path, error=None)
+    return result
+
+
+def fetch_bytes(url, max_bytes):
+    """GET a small file (previews, thumbnails) into memory; returns (content type, data) or raises"""
+    with host_slot(url), get_session().get(url, stream=True, timeout=REQUEST_TIMEOUT) as response:
+        response.raise_for_status()
+        data = response.raw.read(max_bytes + 1, decode_content=True)
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+    if len(data) > max_bytes:
+        raise ValueError(f"larger than {max_bytes} bytes")
+    return content_type, data
+
+
+def record_download_metrics(result, seconds):
+    """Count bytes, throughput and failures of one download per host"""
+    labels = {'host': urlparse(result['url']).netloc.lower()}
+    if result['status'] == 'error':
+        metrics.increment('download_failures_total', labels=labels)
+    elif result['status'] == 'cached' and not result['bytes']:
+        metrics.increment('download_cached_total', labels=labels)
+    if result['bytes']:
+        metrics.increment('download_bytes_total', result['bytes'], labels)
+    if result['status'] == 'success' and seconds > 0:
+        metrics.observe('download_seconds', seconds, labels)
+        metrics.set_gauge('download_bytes_per_second', round(result['bytes'] / seconds), labels)
+
+
+def download_files(image_urls, save_directory, post_id=None, revalidate=False, progress=None,
+                   max_workers=MAX_DOWNLOAD_WORKERS):
+    """Download several images in parallel, returning results in input order
+    
+    With a post_id, files are named <post_id> or <post_id>_<gallery index>.
+    """
+    os.makedirs(save_directory, exist_ok=True)
+    if post_id and len(image_urls) > 1:
+        stems = [f"{post_id}_{index}" for index in range(1, len(image_urls) + 1)]
+    else:
+        stems = [post_id] * len(image_urls)
+
+    def fetch(args):
+        started = time.perf_counter()
+        result = download_file(args[0], save_directory, args[1], revalidate, progress)
+        record_download_metrics(result, time.perf_counter() - started)
+        if result['status'] == 'success' and _on_saved:
+            try:
+                _on_saved(result, post_id)
+            except Exception as e:
+                print(f"Failed to process downloaded file {result['path']}: {str(e)}")
+        return result
+
+    if len(image_urls) <= 1:
+        return [fetch(args) for args in zip(image_urls, stems)]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(image_urls))) as pool:
+        return list(pool.map(fetch, zip(image_urls, stems)))
@@ -0,0 +1,222 @@
+import bisect
+import threading
+
+# Feed store settings
+FEED_MAX_POSTS = 20000  # Oldest posts are dropped from the feed beyond this
+FEED_PAGE_SIZE = 50
+FEED_MAX_PAGE_SIZE = 500
+POST_TYPES = ('paid', 'free', 'other')
+SPARSE_FILTER_RATIO = 8  # Walk only the matching posts when they are fewer than 1/8 of the index
+
+# One sorted index per sort order, holding key tuples that end with the post id.
+# Ties fall back to newest first, like the old client-side sort.
+INDEX_KEYS = {
+    'created': lambda post: (post['created'], post['id']),
+    'most_upvoted': lambda post: (-post['upvotes'], -post['created'], post['id']),
+    'least_upvoted': lambda post: (post['upvotes'], -post['created'], post['id']),
+    'paid_first': lambda post: (int(post['post_type'] != 'paid'), -post['created'], post['id']),
+    'free_first': lambda post: (int(post['post_type'] != 'free'), -post['created'], post['id'])
+}
+SORTS = {  # sort -> (index, walk descending)
+    'newest': ('created', True),
+    'oldest': ('created', False),
+    'most_upvoted': ('most_upvoted', False),
+    'least_upvoted': ('least_upvoted', False),
+    'paid_first': ('paid_first', False),
+    'free_first': ('free_first', False)
+}
+
+_posts = {}  # post id -> post dict as sent to the UI, plus post_type and subreddit
+_indexes = {name: [] for name in INDEX_KEYS}
+_by_type = {post_type: set() for post_type in POST_TYPES}
+_completed_ids = set()  # ids of feed posts marked completed
+_is_completed = None  # post id -> bool, read once per post as it is added
+_lock = threading.RLock()
+
+
+def configure(is_completed):
+    """Set how the completion state of a newly added post is looked up"""
+    global _is_completed
+    _is_completed = is_completed
+
+
+def post_type_for_flair(flair):
+    """Classify a flair as 'paid', 'free' or 'other'"""
+    flair = (flair or '').lower()
+    if 'paid' in flair:
+        return 'paid'
+    if 'free' in flair:
+        return 'free'
+    return 'other'
+
+
+def add(post, subreddit=None):
+    """Add a post to the feed; returns False if it is already there"""
+    with _lock:
+        if post['id'] in _posts:
+            return False
+        stored = dict(post, post_type=post_type_for_flair(post.get('flair')), subreddit=subreddit)
+        stored['upvotes'] = stored.get('upvotes') or 0
+        _posts[post['id']] = stored
+        _by_type[stored['post_type']].add(post['id'])
+        if _is_completed and _is_completed(post['id']):
+            _completed_ids.add(post['id'])
+        for name, key in INDEX_KEYS.items():
+            bisect.insort(_indexes[name], key(stored))
+        while len(_posts) > FEED_MAX_POSTS:
+            _remove(_indexes['created'][0][-1])
+        return True
+
+
+def update(post_id, **changes):
+    """Change fields of a stored post, re-indexing it; returns False if it is not in the feed"""
+    with _lock:
+        post = _posts.get(post_id)
+        if post is None:
+            return False
+        _unindex(post)
+        post.update(changes)
+        post['post_type'] = post_type_for_flair(post.get('flair'))
+        _by_type[post['post_type']].add(post_id)
+        for name, key in INDEX_KEYS.items():
+            bisect.insort(_indexes[name], key(post))
+        return True
+
+
+def set_completed(post_id, completed):
+    """Record a completion change; posts not in the feed are ignored"""
+    with _lock:
+        if completed and post_id in _posts:
+            _completed_ids.add(post_id)
+        else:
+            _completed_ids.discard(post_id)
+
+
+def reload_completed():
+    """Look up the completion state of every feed post again, after the completed set was replaced"""
+    with _lock:
+        _completed_ids.clear()
+        if _is_completed:
+            _completed_ids.update(post_id for post_id in _posts if _is_completed(post_id))
+
+
+def get(post_id):
+    """Return a copy of a stored post, or None"""
+    with _lock:
+        post = _posts.get(post_id)
+        return dict(post) if post else None
+
+
+def count():
+    with _lock:
+        return len(_posts)
+
+
+def clear():
+    with _lock:
+        _posts.clear()
+        for index in _indexes.values():
+            index.clear()
+        for ids in _by_type.values():
+            ids.clear()
+        _completed_ids.clear()
+
+
+def query(filters=None, sort='newest', cursor=None, limit=FEED_PAGE_SIZE):
+    """Return one page of posts matching filters in sort order
+
+    filters may contain post_type ('paid', 'free', 'other'), completed (bool),
+    subreddit and tag (a post_rules rule name). cursor is the next_cursor of the previous page; it is a position in
+    the index, so posts added between pages neither repeat nor shift the page.
+    """
+    filters = filters or {}
+    if sort not in SORTS:
+        raise ValueError(f"Unknown sort '{sort}'")
+    post_type = filters.get('post_type')
+    if post_type is not None and post_type not in POST_TYPES:
+        raise ValueError(f"Unknown post type '{post_type}'")
+    limit = max(1, min(int(limit), FEED_MAX_PAGE_SIZE))
+    index_name, descending = SORTS[sort]
+
+    with _lock:
+        index = _indexes[index_name]
+        candidates = _candidates(filters)
+        if len(candidates) * SPARSE_FILTER_RATIO < len(index):
+            # Few posts can match (e.g. completed ones) - sort just those instead of skipping the rest
+            key = INDEX_KEYS[index_name]
+            index = sorted(key(_posts[post_id]) for post_id in candidates)
+        if descending:
+            start = len(index) - 1 if cursor is None else bisect.bisect_left(index, tuple(cursor)) - 1
+            positions = range(start, -1, -1)
+        else:
+            start = 0 if cursor is None else bisect.bisect_right(index, tuple(cursor))
+            positions = range(start, len(index))
+
+        page = []
+        last_key = None
+        has_more = False
+        for position in positions:
+            key = index[position]
+            post = _posts[key[-1]]
+            if not _matches(post, filters):
+                continue
+            if len(page) == limit:
+                has_more = True
+                break
+            page.append(_public(post))
+            last_key = key
+
+        return {
+            'posts': page,
+            'next_cursor': list(last_key) if has_more else None,
+            'total': _count_matching(filters, candidates)
+        }
+
+
+def _matches(post, filters):
+    if filters.get('post_type') and post['post_type'] != filters['post_type']:
+        return False
+    if filters.get('subreddit') and (post['subreddit'] or '').lower() != filters['subreddit'].lower():
+        return False
+    if filters.get('completed') is not None and (post['id'] in _completed_ids) != bool(filters['completed']):
+        return False
+    if filters.get('tag') and filters['tag'] not in (post.get('tags') or ()):
+        return False
+    return True
+
+
+def _candidates(filters):
+    """Ids passing the post_type and completed filters, from the set indexes"""
+    post_type = filters.get('post_type')
+    candidates = _by_type[post_type] if post_type else _posts.keys()
+    completed = filters.get('completed')
+    if completed is None:
+        return candidates
+    if completed:
+        return _completed_ids & candidates if post_type else set(_completed_ids)
+    return candidates - _completed_ids
+
+
+def _count_matching(filters, candidates):
+    if not filters.get('subreddit') and not filters.get('tag'):
+        return len(candidates)
+    return sum(1 for post_id in candidates if _matches(_posts[post_id], filters))
+
+
+def _public(post):
+    return dict(post, completed=post['id'] in _completed_ids)
+
+
+def _unindex(post):
+    _by_type[post['post_type']].discard(post['id'])
+    for name, key in INDEX_KEYS.items():
+        index = _indexes[name]
+        position = bisect.bisect_left(index, key(post))
+        if position < len(index) and index[position] == key(post):
+            del index[position]
+
+
+def _remove(post_id):
+    post = _posts.pop(post_id)
+    _unindex(post)
+    _completed_ids.discard(post_id)
@@ -0,0 +1,90 @@
+"""Run the monitor, background writer and download queue without the UI
+
+    python -m headless --subreddits PhotoshopRequest+picrequests --interval 30 --download-dir downloads
+
+Every option falls back to an environment variable (MONITOR_SUBREDDITS,
+MONITOR_INTERVAL, DOWNLOAD_DIR) and then to its default. Activity is printed to
+stdout and appended to the activity log the UI shows.
+"""
+import argparse
+import os
+import signal
+import threading
+from datetime import datetime
+
+import background_writer
+import download_queue
+import main
+import metrics
+
+
+def log(message, log_type='info'):
+    """Print a timestamped line and keep it in the activity log"""
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    print(f"[{timestamp}] {log_type.upper():7} {message}", flush=True)
+    main.append_log_entries([{'time': timestamp, 'type': log_type, 'message': message}])
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Monitor subreddits without the UI')
+    parser.add_argument('--subreddits', default=os.getenv('MONITOR_SUBREDDITS', 'PhotoshopRequest'),
+                        help="subreddits to watch, as 'a+b' or 'a, b'")
+    parser.add_argument('--interval', type=int, default=int(os.getenv('MONITOR_INTERVAL', '30')),
+                        help='polling interval in seconds')
+    parser.add_argument('--download-dir', default=os.getenv('DOWNLOAD_DIR'),
+                        help='queue the images of every new post for download into this directory')
+    return parser.parse_args(argv)
+
+
+def run(args):
+    """Start the service and block until SIGINT/SIGTERM"""
+    stopped = threading.Event()
+
+    def on_new_posts(posts):
+        for post in posts:
+            log(f"New post: \"{post['title']}\" by u/{post['author']} [{post['flair'] or 'No flair'}]", 'success')
+        if args.download_dir:
+            download_queue.submit([post['id'] for post in posts], args.download_dir, f"{len(posts)} new posts")
+
+    def on_progress(progress):
+        if progress['status'] in ('done', 'cancelled'):
+            log(f"Download job {progress['job_id']} {progress['status']}: {progress['files_done']} files, "
+                f"{progress['errors']} errors", 'error' if progress['errors'] else 'success')
+
+    def on_monitoring_status(active):
+        if not active:
+            stopped.set()
+
+    main.headless_handlers.update({
+        'logMessage': log,
+        'newPostsDetected': on_new_posts,
+        'downloadProgress': on_progress,
+        'updateMonitoringStatus': on_monitoring_status
+    })
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopped.set())
+
+    metrics.start_exporters()
+    resumed = download_queue.resume_jobs()
+    if resumed:
+        log(f"Resumed {len(resumed)} interrupted download jobs")
+
+    result = main.start_monitoring(args.subreddits, args.interval)
+    log(result['message'], result['status'])
+    if result['status'] != 'success':
+        return 1
+
+    try:
+        while not stopped.wait(1):
+            pass
+    except KeyboardInterrupt:
+        pass
+
+    main.stop_monitoring()
+    background_writer.flush()
+    print("Monitoring stopped", flush=True)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(run(parse_args()))
@@ -0,0 +1,244 @@
+import array
+import io
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from importlib.util import find_spec
+
+import downloads
+import metrics
+
+# Perceptual hash index - a 64-bit dHash per downloaded image, searched by Hamming
+# distance with multi-index hashing: the hash is split into 4 chunks of 16 bits, and two
+# hashes within MATCH_DISTANCE bits must have some chunk within MATCH_DISTANCE // 4 bits,
+# so only the buckets near each chunk are compared instead of every stored hash.
+IMAGE_INDEX_FILE = 'image_hashes.db'
+HASH_SIZE = 8  # dHash of a (HASH_SIZE + 1) x HASH_SIZE grayscale thumbnail
+MATCH_DISTANCE = 6  # Max differing bits for two images to count as the same photo
+CHUNKS = 4
+CHUNK_BITS = 16
+HASH_WORKERS = 2  # Processes decoding and hashing images
+FETCH_WORKERS = 2  # Threads fetching preview images of new posts
+CHECK_MAX_IMAGES = 5  # Gallery images checked per new post
+PREVIEW_MAX_BYTES = 5 * 1024 * 1024
+
+_on_match = None  # called with (post id, [{'post_id', 'path', 'url', 'distance'}])
+_db = None
+_hashes = array.array('Q')  # position -> hash
+_rowids = array.array('q')  # position -> image_hashes rowid
+_tables = None  # per chunk: chunk value -> [positions], built on first use
+_lock = threading.RLock()
+_hash_pool = None
+_index_pool = None  # One thread searching, storing and reporting finished hashes
+_fetch_pool = None
+_unavailable_reported = False
+_masks = {}  # radius -> flip masks
+
+
+def configure(on_match):
+    """Set where matches of new images against earlier posts are reported"""
+    global _on_match
+    _on_match = on_match
+
+
+def dhash(source):
+    """64-bit difference hash of an image file path or file object (needs Pillow)"""
+    from PIL import Image
+    with Image.open(source) as image:
+        # JPEGs are decoded at a reduced scale, which is much faster for large photos
+        image.draft('L', ((HASH_SIZE + 1) * 8, HASH_SIZE * 8))
+        small = image.convert('L').resize((HASH_SIZE + 1, HASH_SIZE), Image.LANCZOS)
+        pixels = list(small.getdata())
+    value = 0
+    for row in range(HASH_SIZE):
+        for column in range(HASH_SIZE):
+            offset = row * (HASH_SIZE + 1) + column
+            value = (value << 1) | (pixels[offset] > pixels[offset + 1])
+    return value
+
+
+def dhash_bytes(data):
+    return dhash(io.BytesIO(data))
+
+
+def hamming(first, second):
+    return bin(first ^ second).count('1')
+
+
+def search(image_hash, max_distance=MATCH_DISTANCE, exclude_post=None):
+    """Indexed images within max_distance bits of image_hash, closest first"""
+    with metrics.timer('image_search_seconds'):
+        with _lock:
+            _load()
+            radius = max_distance // CHUNKS
+            masks = _flip_masks(radius)
+            candidates = set()
+            for chunk, table in enumerate(_tables):
+                value = (image_hash >> (chunk * CHUNK_BITS)) & 0xFFFF
+                for mask in masks:
+                    positions = table.get(value ^ mask)
+                    if positions:
+                        candidates.update(positions)
+            close = []
+            for position in candidates:
+                distance = hamming(image_hash, _hashes[position])
+                if distance <= max_distance:
+                    close.append((distance, _rowids[position]))
+            if not close:
+                return []
+            close.sort()
+            rows = {row[0]: row for row in _get_db().execute(
+                f"SELECT rowid, post_id, path, url FROM image_hashes WHERE rowid IN ({', '.join('?' for _ in close)})",
+                [rowid for _, rowid in close])}
+        return [
+            {'post_id': rows[rowid][1], 'path': rows[rowid][2], 'url': rows[rowid][3], 'distance': distance}
+            for distance, rowid in close if rowid in rows and rows[rowid][1] != exclude_post
+        ]
+
+
+def add(image_hash, post_id, path, url=None):
+    """Store a hash in the index; returns False if this file of this post is already indexed"""
+    with _lock:
+        _load()
+        conn = _get_db()
+        cursor = conn.execute(
+            'INSERT OR IGNORE INTO image_hashes (post_id, path, url, hash, added) VALUES (?, ?, ?, ?, ?)',
+            (post_id, path, url, _to_signed(image_hash), time.time())
+        )
+        conn.commit()
+        if not cursor.rowcount:
+            return False
+        _insert(image_hash, cursor.lastrowid)
+        return True
+
+
+def count():
+    with _lock:
+        _load()
+        return len(_hashes)
+
+
+def index_file(post_id, path, url=None):
+    """Hash a downloaded image in the background, report earlier posts with the same photo and index it"""
+    pool = _get_hash_pool()
+    if pool is None:
+        return
+    future = pool.submit(dhash, path)
+    future.add_done_callback(lambda done: _hand_off(done, post_id, path, url, True))
+
+
+def check_post(post_id, image_urls):
+    """Fetch and hash the preview images of a new post in the background and report matches"""
+    if _get_hash_pool() is None or not image_urls:
+        return
+    for image_url in image_urls[:CHECK_MAX_IMAGES]:
+        _get_fetch_pool().submit(_fetch_and_check, post_id, image_url)
+
+
+def _fetch_and_check(post_id, image_url):
+    try:
+        _, data = downloads.fetch_bytes(image_url, PREVIEW_MAX_BYTES)
+        future = _get_hash_pool().submit(dhash_bytes, data)
+        future.add_done_callback(lambda done: _hand_off(done, post_id, None, image_url, False))
+    except Exception as e:
+        print(f"Failed to fetch preview {image_url}: {str(e)}")
+
+
+def _hand_off(future, post_id, path, url, store):
+    """Pass a finished hash to the index thread
+    
+    Done callbacks run on the process pool's result-handler thread, which collects
+    every worker's results; searching, storing or reporting there would hold up all
+    other hashes, so nothing else happens on it.
+    """
+    _index_pool.submit(_on_hashed, future, post_id, path, url, store)
+
+
+def _on_hashed(future, post_id, path, url, store):
+    """Search and optionally index a finished hash (runs on the index thread)"""
+    try:
+        image_hash = future.result()
+        matches = search(image_hash, exclude_post=post_id)
+        if store:
+            add(image_hash, post_id, path, url)
+        if matches and _on_match:
+            _on_match(post_id, matches)
+    except Exception as e:
+        print(f"Failed to hash image {path or url}: {str(e)}")
+
+
+def _get_hash_pool():
+    global _hash_pool, _index_pool, _unavailable_reported
+    with _lock:
+        if _hash_pool is None:
+            if find_spec('PIL') is None:
+                if not _unavailable_reported:
+                    print('Repost detection is off - install Pillow to hash downloaded images')
+                    _unavailable_reported = True
+                return None
+            # Created first: done callbacks hand results to it as soon as hashes finish
+            _index_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='image-index')
+            _hash_pool = ProcessPoolExecutor(max_workers=HASH_WORKERS)
+        return _hash_pool
+
+
+def _get_fetch_pool():
+    global _fetch_pool
+    with _lock:
+        if _fetch_pool is None:
+            _fetch_pool = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix='preview-fetch')
+        return _fetch_pool
+
+
+def _get_db():
+    global _db
+    if _db is None:
+        conn = sqlite3.connect(IMAGE_INDEX_FILE, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS image_hashes (
+                post_id TEXT,
+                path TEXT,
+                url TEXT,
+                hash INTEGER,
+                added REAL,
+                UNIQUE (post_id, path)
+            )
+        """)
+        conn.commit()
+        _db = conn
+    return _db
+
+
+def _load():
+    """Build the in-memory chunk tables from the database on first use"""
+    global _tables
+    if _tables is not None:
+        return
+    _tables = [{} for _ in range(CHUNKS)]
+    for rowid, stored_hash in _get_db().execute('SELECT rowid, hash FROM image_hashes'):
+        _insert(stored_hash & 0xFFFFFFFFFFFFFFFF, rowid)
+
+
+def _insert(image_hash, rowid):
+    position = len(_hashes)
+    _hashes.append(image_hash)
+    _rowids.append(rowid)
+    for chunk, table in enumerate(_tables):
+        table.setdefault((image_hash >> (chunk * CHUNK_BITS)) & 0xFFFF, []).append(position)
+
+
+def _flip_masks(radius):
+    """Every CHUNK_BITS-bit mask with at most radius bits set"""
+    if radius not in _masks:
+        masks = {0}
+        for _ in range(radius):
+            masks |= {mask | (1 << bit) for mask in masks for bit in range(CHUNK_BITS)}
+        _masks[radius] = sorted(masks)
+    return _masks[radius]
+
+
+def _to_signed(image_hash):
+    """SQLite integers are signed 64-bit"""
+    return image_hash - (1 << 64) if image_hash >= (1 << 63) else image_hash
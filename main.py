@@ -1,153 +1,882 @@
-import eel
 import os
-import praw
-import requests
+import random
 import threading
 import time
 import json
+import re
+import heapq
+import array
+import struct
+import sqlite3
+from collections import OrderedDict
 from datetime import datetime
 from dotenv import load_dotenv
-from tkinter import filedialog
-import tkinter as tk
 
-load_dotenv()
+import background_writer
+import download_queue
+import downloads
+import feed_store
+import image_index
+import metrics
+import post_rules
+import score_refresher
+import thumbnails
 
-# Initialize Eel
-eel.init('web')
+load_dotenv()
 
-# Reddit setup
-reddit = praw.Reddit(
-    client_id=os.getenv('CLIENT_ID'),
-    client_secret=os.getenv('CLIENT_SECRET'),
-    user_agent=os.getenv('USER_AGENT')
-)
+# Reddit client, eel and tkinter are imported on first use so the module loads
+# quickly and works headless (see headless.py)
+reddit = None
+reddit_lock = threading.Lock()
 
-# Global variables
-monitoring = False
-monitoring_thread = None
-last_post_id = None
-seen_posts = set()  # Track posts we've already seen
+# Frontend bridge - functions are registered with eel when the UI starts
+ui = None  # The eel module once start_ui() has run
+exposed_functions = []
+headless_handlers = {}  # Frontend callback name -> handler used when no UI is running
 
 # File paths for data persistence
 LOGS_FILE = 'activity_logs.log'
-POSTS_ANALYTICS_FILE = 'posts_analytics.log'
-COMPLETED_POSTS_FILE = 'completed_posts.json'
+LOGS_MAX_BYTES = 2 * 1024 * 1024  # Rotate the activity log at this size
+LOGS_BACKUPS = 3  # Rotated activity logs kept (activity_logs.log.1 ...)
+LOGS_PAGE_SIZE = 200  # Entries returned per load_logs_from_file page
+logs_lock = threading.Lock()
+logs_generation = 0  # Rotations and clears so far; the file at index i holds generation logs_generation - i
+POSTS_ANALYTICS_FILE = 'posts_analytics.log'  # Legacy JSONL log, imported into POSTS_DB_FILE
+POSTS_DB_FILE = 'posts_analytics.db'
+COMPLETED_POSTS_FILE = 'completed_posts.json'  # Snapshot, see COMPLETED_JOURNAL_FILE
+COMPLETED_JOURNAL_FILE = 'completed_posts.journal'  # '+id' / '-id' changes since the snapshot
+COMPLETED_COMPACT_EVERY = 1000  # Journal lines before it is folded into the snapshot
 LAST_POST_FILE = 'last_post.json'
+SEEN_POSTS_FILE = 'seen_posts.bin'
+POST_RULES_FILE = 'post_rules.json'  # Keyword and regex rules posts are tagged with
+
+# Completed posts - snapshot plus journal on disk, one set in memory
+completed_posts = None  # Loaded on first use
+completed_journal_length = 0
+completed_lock = threading.RLock()
+
+# Seen-post index - post ids (base36 decoded to integers) in two rotating generations.
+# Each generation covers SEEN_WINDOW, so an id is kept for one to two windows and memory
+# stays bounded on long runs.
+SEEN_WINDOW = 7 * 86400
+seen_generations = None  # [current, previous], loaded from SEEN_POSTS_FILE on first use
+seen_rotated_at = 0
+seen_lock = threading.Lock()
+
+# Monitoring settings
+POLL_PAGE_SIZE = 100  # Max listing page size allowed by Reddit
+CURSOR_CHECK_POLLS = 10  # Empty polls before re-checking that the cursor post still exists
+MERGE_WINDOW = 0.25  # Poll a subreddit early if it is due within this fraction of its interval
+MAX_MERGED_SUBREDDITS = 25  # Subreddits per r/a+b+c listing
+
+# Adaptive polling - each subreddit's interval moves between interval / POLL_SPEEDUP
+# (busy) and interval * POLL_SLOWDOWN (quiet), stretched to fit the API rate limit
+MIN_POLL_INTERVAL = 2  # Never poll one listing more often than this many seconds
+POLL_SPEEDUP = 4
+POLL_SLOWDOWN = 2
+TARGET_POSTS_PER_POLL = 1  # Busy subreddits are polled about once per expected new post
+POST_RATE_SMOOTHING = 0.3  # Weight of the latest poll in the moving post rate
+RATE_LIMIT_RESERVE = 10  # Requests kept back for user actions (loads, downloads, descriptions)
+BACKOFF_BASE = 5  # Seconds before the first retry of a failed poll, doubled per failure
+BACKOFF_MAX = 15 * 60
+
+# Descriptions are sent to the UI as previews; full text is fetched on demand
+DESCRIPTION_PREVIEW_LENGTH = 300
+DESCRIPTION_CACHE_SIZE = 5000
+post_descriptions = OrderedDict()  # post id -> full description, least recently added first
+description_lock = threading.Lock()
+
+# Image URLs are resolved from the listing data when a post is detected and kept in
+# memory and the analytics database, so downloads of seen posts need no API call
+MEDIA_PREVIEW_WIDTH = 640  # Widest preview resolution kept alongside the source images
+MEDIA_CACHE_SIZE = 5000
+post_media = OrderedDict()  # post id -> {'image_urls': [...], 'preview_urls': [...]}, least recent first
+media_lock = threading.Lock()
+POST_ID_PATTERN = re.compile(r'(?:/comments/|/gallery/|redd\.it/)([a-z0-9]+)', re.IGNORECASE)
+
+# Monitoring scheduler state - one thread and one Reddit client for every watched subreddit
+watched_subreddits = {}  # lowercase name -> interval, cursor and polling state
+monitor_thread = None
+monitor_lock = threading.RLock()
+monitor_wakeup = threading.Event()
+
+# Analytics database (opened lazily, shared between the monitor thread and eel calls)
+posts_db = None
+db_lock = threading.RLock()
+POSTS_DB_COLUMNS = (
+    'post_id', 'timestamp', 'detection_type', 'subreddit', 'author', 'created_utc',
+    'post_created', 'post_date', 'post_time', 'post_hour', 'post_weekday', 'post_type',
+    'flair_raw', 'title_length', 'description_length', 'upvotes', 'title', 'num_comments',
+    'image_urls', 'preview_urls', 'price'
+)
+# Columns filled in after detection, added to existing databases on open
+POSTS_DB_LATE_COLUMNS = {
+    'num_comments': 'INTEGER',
+    'removed': 'TEXT',  # removed_by_category, e.g. 'moderator' or 'deleted'
+    'locked': 'INTEGER',
+    'score_updated': 'REAL',
+    'image_urls': 'TEXT',  # JSON list of source image URLs in gallery order
+    'preview_urls': 'TEXT',  # JSON list of preview image URLs, one per source image
+    'price': 'REAL'  # First amount of money in the title or description
+}
+
+def get_reddit():
+    """Create the shared Reddit client on first use"""
+    global reddit
+    with reddit_lock:
+        if reddit is None:
+            import praw
+            reddit = praw.Reddit(
+                client_id=os.getenv('CLIENT_ID'),
+                client_secret=os.getenv('CLIENT_SECRET'),
+                user_agent=os.getenv('USER_AGENT')
+            )
+    return reddit
+
+def expose(function):
+    """Mark a function as callable from the frontend"""
+    exposed_functions.append(function)
+    return function
+
+def push_to_ui(callback, *args):
+    """Call a frontend callback, or its headless handler when no UI is running"""
+    try:
+        with metrics.timer('ui_push_seconds', {'callback': callback}):
+            if ui is not None:
+                getattr(ui, callback)(*args)
+            elif callback in headless_handlers:
+                headless_handlers[callback](*args)
+    except Exception:
+        metrics.increment('ui_push_errors_total', labels={'callback': callback})
+        raise
 
-@eel.expose
+def reddit_rate_limits():
+    """Rate limit PRAW read from the last response headers (empty before the first request)"""
+    return getattr(getattr(get_reddit(), 'auth', None), 'limits', None) or {}
+
+def record_rate_limits():
+    """Copy the current rate limit into the metrics"""
+    limits = reddit_rate_limits()
+    for key in ('remaining', 'used', 'reset_timestamp'):
+        if limits.get(key) is not None:
+            metrics.set_gauge(f'reddit_ratelimit_{key}', limits[key])
+
+def start_ui():
+    """Initialise eel, register the exposed functions and open the app window"""
+    global ui
+    import eel
+    eel.init('web')
+    for function in exposed_functions:
+        eel.expose(function)
+    ui = eel
+    eel.start('index.html', size=(1200, 800), port=8080)
+
+@expose
 def start_monitoring(subreddit_name, interval):
-    """Start monitoring Reddit posts"""
-    global monitoring, monitoring_thread, last_post_id
+    """Start monitoring Reddit posts (several subreddits may be given as 'a+b' or 'a, b')"""
+    names = [name.strip() for name in subreddit_name.replace(',', '+').split('+') if name.strip()]
+    if not names:
+        return {"status": "error", "message": "No subreddit given"}
     
-    if monitoring:
-        return {"status": "error", "message": "Already monitoring"}
+    added = []
+    for name in names:
+        result = add_subreddit(name, interval)
+        if result['status'] == 'success':
+            added.append(name)
     
-    monitoring = True
-    last_post_id = None
+    if not added:
+        return {"status": "error", "message": f"Already monitoring r/{'+'.join(names)}"}
+    return {"status": "success", "message": f"Started monitoring r/{'+'.join(added)}"}
+
+@expose
+def add_subreddit(subreddit_name, interval):
+    """Add a subreddit to the shared monitoring scheduler"""
+    global monitor_thread
+    key = subreddit_name.lower()
+    with monitor_lock:
+        if key in watched_subreddits:
+            return {"status": "error", "message": f"Already monitoring r/{subreddit_name}"}
+        
+        watched_subreddits[key] = {
+            'name': subreddit_name,
+            'interval': max(1, int(interval)),
+            'poll_interval': max(1, int(interval)),  # Current adaptive interval
+            'post_rate': None,  # Moving average of new posts per second
+            'last_poll_posts': 0,
+            'cursor': None,
+            'empty_polls': 0,
+            'next_poll': time.time(),
+            'last_poll': None,
+            'last_post_id': None,
+            'health': 'ok',  # 'ok', 'backoff' or 'rate_limited'
+            'failures': 0,
+            'last_error': None,
+            'solo': False  # Poll on its own after a merged listing failed
+        }
+        
+        if monitor_thread is None:
+            monitor_thread = threading.Thread(target=monitor_loop)
+            monitor_thread.daemon = True
+            monitor_thread.start()
     
-    def monitor_loop():
-        global last_post_id
-        while monitoring:
+    monitor_wakeup.set()
+    return {"status": "success", "message": f"Started monitoring r/{subreddit_name}"}
+
+@expose
+def remove_subreddit(subreddit_name):
+    """Remove a subreddit from the monitoring scheduler"""
+    with monitor_lock:
+        watch = watched_subreddits.pop(subreddit_name.lower(), None)
+        if watch is None:
+            return {"status": "error", "message": f"Not monitoring r/{subreddit_name}"}
+    
+    monitor_wakeup.set()
+    return {"status": "success", "message": f"Stopped monitoring r/{watch['name']}"}
+
+@expose
+def list_subreddits():
+    """List the monitored subreddits with their interval and polling state"""
+    with monitor_lock:
+        subreddits = [watch_state(watch) for watch in watched_subreddits.values()]
+    return {"status": "success", "subreddits": subreddits}
+
+def watch_state(watch):
+    """Public polling and health state of a watched subreddit"""
+    return {
+        'name': watch['name'],
+        'interval': watch['interval'],
+        'poll_interval': round(watch['poll_interval'], 1),
+        'last_poll': watch['last_poll'],
+        'next_poll': watch['next_poll'],
+        'last_post_id': watch['last_post_id'],
+        'health': watch['health'],
+        'failures': watch['failures'],
+        'last_error': watch['last_error']
+    }
+
+def monitor_loop():
+    """Scheduler thread polling every watched subreddit on its own interval"""
+    global monitor_thread
+    while True:
+        now = time.time()
+        with monitor_lock:
+            if not watched_subreddits:
+                monitor_thread = None
+                break
+            due = collect_due_subreddits(now)
+            next_poll = min((watch['next_poll'] for watch in watched_subreddits.values()), default=now + 1)
+        
+        if not due:
+            monitor_wakeup.wait(max(0.0, next_poll - now))
+            monitor_wakeup.clear()
+            continue
+        
+        health_changed = False
+        for group in group_subreddits(due, now):
+            names = '+'.join(watch['name'] for watch in group)
+            error = None
             try:
-                subreddit = reddit.subreddit(subreddit_name)
-                # Get the newest post (limit=1 gets the most recent)
-                for post in subreddit.new(limit=1):
-                    if last_post_id != post.id and post.id not in seen_posts:
-                        # Send new post to frontend with full details
-                        seen_posts.add(post.id)
-                        post_data = {
-                            'title': post.title,
-                            'url': post.url,
-                            'author': str(post.author),
-                            'id': post.id,
-                            'created': post.created_utc,
-                            'flair': post.link_flair_text,
-                            'description': post.selftext,
-                            'upvotes': post.score
-                        }
-                        
-                        # Log post data for analytics
-                        log_post_analytics(post_data, subreddit_name)
-                        
-                        eel.newPostDetected(post_data)
-                        last_post_id = post.id
-                    break
-                
-                time.sleep(interval)
+                with metrics.timer('poll_seconds', {'subreddits': names}):
+                    poll_subreddit_group(group)
             except Exception as e:
-                eel.logMessage(f"Error monitoring: {str(e)}", "error")
+                error = e
+            record_rate_limits()
+            
+            if error is None:
+                health_changed |= schedule_next_polls(group, time.time())
+            else:
+                health_changed |= handle_poll_error(group, error, time.time())
+        
+        if health_changed:
+            push_to_ui('monitorHealth', list_subreddits()['subreddits'])
+    
+    push_to_ui('updateMonitoringStatus', False)
+
+def schedule_next_polls(group, finished):
+    """Adapt the interval of each polled subreddit to its post rate and the rate limit budget"""
+    stretch, wait = rate_limit_plan()
+    changed = False
+    for watch in group:
+        if watch['last_poll'] is not None:
+            update_post_rate(watch, watch['last_poll_posts'], finished - watch['last_poll'])
+        watch['last_poll'] = finished
+        watch['failures'] = 0
+        watch['last_error'] = None
+        watch['solo'] = False
+        watch['poll_interval'] = adaptive_interval(watch) * stretch
+        if wait:
+            watch['next_poll'] = finished + wait + random.uniform(0, watch['poll_interval'])
+            changed |= set_health(watch, 'rate_limited')
+        else:
+            watch['next_poll'] = finished + watch['poll_interval']
+            changed |= set_health(watch, 'ok')
+        metrics.set_gauge('poll_interval_seconds', watch['poll_interval'], {'subreddit': watch['name']})
+    return changed
+
+def handle_poll_error(group, error, failed_at):
+    """Retry a failed poll with jittered exponential backoff; drop subreddits that cannot be polled"""
+    names = '+'.join(watch['name'] for watch in group)
+    for watch in group:
+        metrics.increment('poll_errors_total', labels={'subreddit': watch['name']})
+    
+    kind = classify_poll_error(error)
+    if kind == 'permanent':
+        if len(group) > 1:
+            # Probably one bad subreddit in the merged listing - poll them separately to find it
+            for watch in group:
+                watch['solo'] = True
+                watch['next_poll'] = failed_at
+            return False
+        push_to_ui('logMessage', f"Stopped monitoring r/{names}: {str(error)}", "error")
+        remove_subreddit(group[0]['name'])
+        return True
+    
+    _, wait = rate_limit_plan()
+    changed = False
+    for watch in group:
+        watch['failures'] += 1
+        watch['last_error'] = str(error)
+        delay = backoff_delay(watch['failures'])
+        if kind == 'rate_limited':
+            delay = max(delay, wait)
+        watch['next_poll'] = failed_at + delay
+        changed |= set_health(watch, 'rate_limited' if kind == 'rate_limited' else 'backoff')
+    
+    retry_in = min(watch['next_poll'] for watch in group) - failed_at
+    push_to_ui('logMessage', f"Error monitoring r/{names}: {str(error)} - retrying in {retry_in:.0f}s", "error")
+    return changed
+
+def classify_poll_error(error):
+    """Return 'permanent' (banned, private or missing subreddit), 'rate_limited' or 'transient'"""
+    try:
+        from prawcore.exceptions import Forbidden, NotFound, Redirect, TooManyRequests
+    except ImportError:
+        return 'transient'
+    if isinstance(error, (Forbidden, NotFound, Redirect)):
+        return 'permanent'
+    if isinstance(error, TooManyRequests):
+        return 'rate_limited'
+    return 'transient'
+
+def backoff_delay(failures):
+    """Exponential backoff with jitter, so retries of many subreddits do not line up"""
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (failures - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+def set_health(watch, health):
+    """Update a subreddit's health, logging recoveries; returns True if it changed"""
+    if watch['health'] == health:
+        return False
+    if health == 'ok':
+        push_to_ui('logMessage', f"Monitoring of r/{watch['name']} recovered", "success")
+    watch['health'] = health
+    return True
+
+def update_post_rate(watch, new_posts, elapsed):
+    """Fold the posts found by the last poll into the moving post rate"""
+    if elapsed <= 0:
+        return
+    sample = new_posts / elapsed
+    if watch['post_rate'] is None:
+        watch['post_rate'] = sample
+    else:
+        watch['post_rate'] += POST_RATE_SMOOTHING * (sample - watch['post_rate'])
+
+def adaptive_interval(watch):
+    """Polling interval for the recent post rate: shorter when busy, longer when quiet"""
+    if watch['post_rate'] is None:
+        return watch['interval']
+    shortest = max(MIN_POLL_INTERVAL, watch['interval'] / POLL_SPEEDUP)
+    longest = watch['interval'] * POLL_SLOWDOWN
+    if watch['post_rate'] <= 0:
+        return longest
+    return min(longest, max(shortest, TARGET_POSTS_PER_POLL / watch['post_rate']))
+
+def rate_limit_plan():
+    """Return (stretch, wait): how much to stretch intervals so the planned polls fit the
+    remaining rate limit, and seconds to wait for the window reset once it is used up
+    
+    Every subreddit is counted as one request per poll, which over-estimates merged
+    listings and keeps headroom for extra listing pages.
+    """
+    limits = reddit_rate_limits()
+    if limits.get('remaining') is None or limits.get('reset_timestamp') is None:
+        return 1.0, 0
+    reset_in = max(0.0, limits['reset_timestamp'] - time.time())
+    spare = limits['remaining'] - RATE_LIMIT_RESERVE
+    if spare <= 0:
+        return 1.0, reset_in
+    if reset_in == 0:
+        return 1.0, 0
+    with monitor_lock:
+        planned = sum(reset_in / adaptive_interval(watch) for watch in watched_subreddits.values())
+    return max(1.0, planned / spare), 0
+
+def collect_due_subreddits(now):
+    """Return watched subreddits that are due, pulling in ones that are nearly due so they can share a listing"""
+    if not any(watch['next_poll'] <= now for watch in watched_subreddits.values()):
+        return []
+    return [
+        watch for watch in watched_subreddits.values()
+        if watch['next_poll'] <= now + watch['poll_interval'] * MERGE_WINDOW
+    ]
+
+def group_subreddits(due, now):
+    """Split due subreddits into multi-subreddit listings of at most MAX_MERGED_SUBREDDITS
+    
+    A merged listing is walked back to the oldest cursor in it, so subreddits are only
+    merged while the posts expected since that cursor fit in about one listing page.
+    A quiet subreddit whose last post is hours old would otherwise make every poll page
+    through the busy ones; it is grouped with other old cursors or polled on its own.
+    """
+    # Unseeded subreddits need their own newest post, so they are polled individually
+    groups = [[watch] for watch in due if watch['cursor'] is None or watch['solo']]
+    seeded = sorted(
+        (watch for watch in due if watch['cursor'] is not None and not watch['solo']),
+        key=lambda watch: watch['cursor']['created'], reverse=True
+    )
+    group = []
+    rate = 0.0
+    for watch in seeded:
+        # Newest cursors first, so the watch being added has the group's oldest cursor
+        watch_rate = expected_post_rate(watch)
+        expected_posts = (rate + watch_rate) * (now - watch['cursor']['created'])
+        if group and (len(group) == MAX_MERGED_SUBREDDITS or expected_posts > POLL_PAGE_SIZE):
+            groups.append(group)
+            group = []
+            rate = 0.0
+        group.append(watch)
+        rate += watch_rate
+    if group:
+        groups.append(group)
+    return groups
+
+def expected_post_rate(watch):
+    """New posts per second of a subreddit, guessed from its interval until polls have measured it"""
+    if watch['post_rate'] is not None:
+        return watch['post_rate']
+    return TARGET_POSTS_PER_POLL / watch['poll_interval']
+
+def poll_subreddit_group(group):
+    """Fetch and emit new posts for one single or merged subreddit listing"""
+    if len(group) == 1:
+        watch = group[0]
+        subreddit = get_reddit().subreddit(watch['name'])
+        if watch['cursor'] is None:
+            # Seed the cursor with the newest post
+            with metrics.timer('reddit_request_seconds', {'endpoint': 'new'}):
+                new_posts = list(subreddit.new(limit=1))
+        else:
+            new_posts = fetch_posts_since(subreddit, watch['cursor']['fullname'])
+            if new_posts:
+                watch['empty_polls'] = 0
+            else:
+                watch['empty_polls'] += 1
+                if watch['empty_polls'] % CURSOR_CHECK_POLLS == 0:
+                    new_posts = recover_stale_cursor(subreddit, watch['cursor'])
+        posts_by_watch = {id(watch): new_posts}
+    else:
+        posts_by_watch = fetch_merged_posts_since(group)
+    metrics.observe('poll_posts', sum(len(posts) for posts in posts_by_watch.values() if posts))
+    
+    for watch in group:
+        new_posts = posts_by_watch.get(id(watch))
+        watch['last_poll_posts'] = len(new_posts or [])
+        if new_posts:
+            newest = new_posts[-1]
+            watch['cursor'] = {'fullname': newest.fullname, 'created': newest.created_utc}
+            watch['last_post_id'] = newest.id
+            emit_new_posts(new_posts, watch['name'])
+
+def fetch_merged_posts_since(group):
+    """Walk one r/a+b+c listing back to the oldest cursor, splitting posts per subreddit oldest first
+    
+    'before' cursors cannot be combined across subreddits, so the merged listing is
+    walked newest first and compared against each subreddit's cursor time instead.
+    """
+    by_name = {watch['name'].lower(): watch for watch in group}
+    oldest_cursor = min(watch['cursor']['created'] for watch in group)
+    posts_by_watch = {}
+    
+    multireddit = get_reddit().subreddit('+'.join(watch['name'] for watch in group))
+    with metrics.timer('reddit_request_seconds', {'endpoint': 'new_merged'}):
+        for post in multireddit.new(limit=1000):
+            if post.created_utc < oldest_cursor:
                 break
+            watch = by_name.get(post.subreddit.display_name.lower())
+            if watch is None:
+                continue
+            cursor = watch['cursor']
+            if post.created_utc < cursor['created'] or post.fullname == cursor['fullname']:
+                continue
+            posts_by_watch.setdefault(id(watch), []).append(post)
     
-    monitoring_thread = threading.Thread(target=monitor_loop)
-    monitoring_thread.daemon = True
-    monitoring_thread.start()
+    for posts in posts_by_watch.values():
+        posts.reverse()
+    return posts_by_watch
+
+def fetch_posts_since(subreddit, before_fullname):
+    """Page through subreddit.new() with a 'before' cursor, returning every newer post oldest first"""
+    posts = []
+    while True:
+        # A 'before' page holds the posts directly newer than the cursor, newest first
+        with metrics.timer('reddit_request_seconds', {'endpoint': 'new_before'}):
+            page = list(subreddit.new(limit=POLL_PAGE_SIZE, params={'before': before_fullname}))
+        if not page:
+            break
+        posts.extend(reversed(page))
+        before_fullname = page[0].fullname
+        if len(page) < POLL_PAGE_SIZE:
+            break
+    return posts
+
+def recover_stale_cursor(subreddit, cursor):
+    """Return posts newer than the cursor if the cursor post was removed from the listing
     
-    return {"status": "success", "message": f"Started monitoring r/{subreddit_name}"}
+    Reddit returns an empty 'before' page forever once the cursor post is deleted,
+    so quiet periods are periodically double-checked against the plain listing.
+    """
+    with metrics.timer('reddit_request_seconds', {'endpoint': 'new'}):
+        newest = next(iter(subreddit.new(limit=1)), None)
+    if newest is None or newest.fullname == cursor['fullname'] or newest.created_utc <= cursor['created']:
+        return []
+    
+    posts = []
+    with metrics.timer('reddit_request_seconds', {'endpoint': 'new_recover'}):
+        for post in subreddit.new(limit=1000):
+            if post.created_utc <= cursor['created']:
+                break
+            posts.append(post)
+    posts.reverse()
+    return posts
+
+def emit_new_posts(new_posts, subreddit_name):
+    """Log and push a chronological batch of newly detected posts to the frontend"""
+    batch = []
+    now = time.time()
+    for post in new_posts:
+        if not mark_post_seen(post.id):
+            continue
+        metrics.observe('detection_lag_seconds', now - post.created_utc, {'subreddit': subreddit_name})
+        post_data = extract_post_data(post)
+        
+        # Log post data for analytics
+        log_post_analytics(post_data, subreddit_name)
+        preview = preview_post_data(post_data)
+        feed_store.add(preview, subreddit_name)
+        score_refresher.track(post.id, post.created_utc, **post_state(post))
+        image_index.check_post(post.id, post_data['preview_urls'])
+        batch.append(preview)
+    
+    if batch:
+        save_seen_posts()
+        push_to_ui('newPostsDetected', batch)
+
+def extract_post_data(post):
+    """Convert a PRAW submission into the post dict sent to the frontend"""
+    media = submission_media(post)
+    remember_media(post.id, media)
+    matched = post_rules.match_post(post.title, post.selftext)
+    return {
+        'title': post.title,
+        'url': post.url,
+        'author': str(post.author),
+        'id': post.id,
+        'created': post.created_utc,
+        'flair': post.link_flair_text,
+        'description': post.selftext,
+        'upvotes': post.score,
+        'num_comments': post.num_comments,
+        'image_urls': media['image_urls'],
+        'preview_urls': media['preview_urls'],
+        'tags': matched['tags'],
+        'price': matched['price']
+    }
 
-@eel.expose
+def post_state(post):
+    """Score and moderation state of a submission, as tracked by the score refresher"""
+    return {
+        'upvotes': post.score,
+        'num_comments': post.num_comments,
+        'removed': post.removed_by_category,
+        'locked': bool(post.locked)
+    }
+
+def fetch_post_states(fullnames):
+    """Look up the state of up to 100 posts with one reddit.info() call"""
+    _, wait = rate_limit_plan()
+    if wait:
+        return None  # Leave what is left of the rate limit window to polling
+    with metrics.timer('reddit_request_seconds', {'endpoint': 'info'}):
+        submissions = list(get_reddit().info(fullnames=fullnames))
+    record_rate_limits()
+    return {submission.id: post_state(submission) for submission in submissions}
+
+def apply_post_state_changes(changes):
+    """Put refreshed scores into the feed and analytics and push them to the UI"""
+    for change in changes:
+        feed_store.update(change['id'], **{field: value for field, value in change.items() if field != 'id'})
+        background_writer.submit(store_post_state_changes, change)
+    push_to_ui('postScoresUpdated', changes)
+
+def store_post_state_changes(changes):
+    """Write refreshed scores and moderation state to the analytics database (writer thread)"""
+    updated_at = time.time()
+    with db_lock:
+        conn = get_posts_db()
+        for change in changes:
+            columns = [field for field in score_refresher.TRACKED_FIELDS if field in change]
+            conn.execute(
+                f"UPDATE posts SET {', '.join(column + ' = ?' for column in columns)}, score_updated = ? WHERE post_id = ?",
+                [change[column] for column in columns] + [updated_at, change['id']]
+            )
+        conn.commit()
+
+@expose
 def stop_monitoring():
-    """Stop monitoring Reddit posts"""
-    global monitoring
-    monitoring = False
+    """Stop monitoring all subreddits"""
+    with monitor_lock:
+        watched_subreddits.clear()
+    monitor_wakeup.set()
     return {"status": "success", "message": "Monitoring stopped"}
 
-@eel.expose
+@expose
 def download_from_url(post_url, save_directory):
     """Download images from Reddit post URL"""
     try:
-        if not os.path.exists(save_directory):
-            os.makedirs(save_directory)
+        post_id, image_urls = resolve_post_images(post_url)
         
-        submission = reddit.submission(url=post_url)
-        downloaded_count = 0
+        results = downloads.download_files(image_urls, save_directory, post_id=post_id)
+        for result in results:
+            if result['status'] == 'error':
+                push_to_ui('logMessage', f"Failed to download {result['url']}: {result['error']}", "error")
+        downloaded_count = sum(1 for result in results if result['status'] == 'success')
+        cached_count = sum(1 for result in results if result['status'] == 'cached')
         
-        # Single image
-        if submission.url.endswith(('jpg', 'jpeg', 'png', 'gif')):
-            if download_image(submission.url, save_directory):
-                downloaded_count = 1
-        
-        # Gallery
-        elif hasattr(submission, 'gallery_data') and submission.gallery_data:
-            for item in submission.gallery_data['items']:
-                image_id = item['media_id']
-                if image_id in submission.media_metadata:
-                    image_url = submission.media_metadata[image_id]['s']['u']
-                    image_url = image_url.replace('&amp;', '&')  # Fix URL encoding
-                    if download_image(image_url, save_directory):
-                        downloaded_count += 1
+        message = f"Downloaded {downloaded_count} images"
+        if cached_count:
+            message += f" ({cached_count} already downloaded)"
         
         return {
             "status": "success", 
-            "message": f"Downloaded {downloaded_count} images",
-            "count": downloaded_count
+            "message": message,
+            "count": downloaded_count + cached_count,
+            "results": results
         }
         
     except Exception as e:
         return {"status": "error", "message": f"Download failed: {str(e)}"}
 
+def submission_media(submission):
+    """Resolve the source and preview image URLs of a submission in gallery order
+    
+    Only fields already loaded are read (vars() rather than hasattr), so listing
+    submissions are never lazily re-fetched one by one.
+    """
+    url = submission.url  # Loads submissions created by reddit.submission()
+    data = vars(submission)
+    image_urls = []
+    preview_urls = []
+    
+    # Single image
+    if url.endswith(('jpg', 'jpeg', 'png', 'gif')):
+        image_urls.append(url)
+        images = (data.get('preview') or {}).get('images') or [{}]
+        resolutions = [
+            (resolution['width'], resolution['url']) for resolution in images[0].get('resolutions', [])
+        ]
+        preview_urls.append(pick_preview(resolutions) or url)
+    
+    # Gallery
+    elif data.get('gallery_data'):
+        media_metadata = data.get('media_metadata') or {}
+        for item in data['gallery_data'].get('items', []):
+            media = media_metadata.get(item['media_id']) or {}
+            source = media.get('s') or {}
+            image_url = source.get('u') or source.get('gif')
+            if not image_url:
+                continue  # Failed or still processing upload
+            image_url = image_url.replace('&amp;', '&')  # Fix URL encoding
+            resolutions = [(resolution.get('x', 0), resolution['u']) for resolution in media.get('p', [])]
+            image_urls.append(image_url)
+            preview_urls.append(pick_preview(resolutions) or image_url)
+    
+    return {'image_urls': image_urls, 'preview_urls': preview_urls}
+
+def pick_preview(resolutions):
+    """Return the URL of the widest (width, url) resolution up to MEDIA_PREVIEW_WIDTH"""
+    if not resolutions:
+        return None
+    fitting = [resolution for resolution in resolutions if resolution[0] <= MEDIA_PREVIEW_WIDTH]
+    width, url = max(fitting) if fitting else min(resolutions)
+    return url.replace('&amp;', '&')
+
+def remember_media(post_id, media):
+    """Keep the image URLs of recently detected posts for downloads"""
+    with media_lock:
+        post_media[post_id] = media
+        post_media.move_to_end(post_id)
+        while len(post_media) > MEDIA_CACHE_SIZE:
+            post_media.popitem(last=False)
+
+def cached_media(post_id):
+    """Image URLs of a post seen before, from memory or the analytics database, or None"""
+    with media_lock:
+        media = post_media.get(post_id)
+    if media is not None:
+        return media
+    try:
+        with db_lock:
+            row = get_posts_db().execute(
+                'SELECT image_urls, preview_urls FROM posts WHERE post_id = ?', (post_id,)
+            ).fetchone()
+    except Exception as e:
+        print(f"Error reading cached media: {str(e)}")
+        return None
+    if row is None or row[0] is None:
+        return None  # Not seen, or stored before image URLs were recorded
+    media = {'image_urls': json.loads(row[0]), 'preview_urls': json.loads(row[1] or '[]')}
+    remember_media(post_id, media)
+    return media
+
 def download_image(image_url, save_directory):
     """Download a single image"""
+    result = downloads.download_files([image_url], save_directory)[0]
+    if result['status'] == 'error':
+        push_to_ui('logMessage', f"Failed to download {image_url}: {result['error']}", "error")
+    return result['status'] != 'error'
+
+@expose
+def queue_downloads(post_refs, save_directory):
+    """Queue a background download job for many post ids or URLs"""
     try:
-        response = requests.get(image_url, headers={'User-Agent': 'RedditMonitor/1.0'})
-        if response.status_code == 200:
-            file_name = image_url.split('/')[-1].split('?')[0]
-            if not file_name.endswith(('.jpg', '.jpeg', '.png', '.gif')):
-                file_name += '.jpg'
-            
-            file_path = os.path.join(save_directory, file_name)
-            with open(file_path, 'wb') as file:
-                file.write(response.content)
-            return True
+        job_id = download_queue.submit(post_refs, save_directory, f"{len(post_refs)} posts")
+        return {"status": "success", "job_id": job_id, "message": f"Queued {len(post_refs)} posts for download"}
+    except Exception as e:
+        return {"status": "error", "message": f"Failed to queue downloads: {str(e)}"}
+
+@expose
+def queue_matching_downloads(save_directory, start_date=None, end_date=None, filters=None, only_incomplete=False):
+    """Queue a download job for every stored post matching a date range and filters
+    
+    e.g. all PAID posts from today, or every post not yet marked completed.
+    """
+    try:
+        background_writer.flush()
+        where, params = build_analytics_filter(start_date, end_date, filters)
+        with db_lock:
+            post_ids = [row[0] for row in get_posts_db().execute(
+                f'SELECT post_id FROM posts {where} ORDER BY created_utc', params)]
+        if only_incomplete:
+            post_ids = [post_id for post_id in post_ids if not is_post_completed(post_id)]
+        if not post_ids:
+            return {"status": "error", "message": "No posts match the download selection"}
+        return queue_downloads(post_ids, save_directory)
+    except Exception as e:
+        return {"status": "error", "message": f"Failed to queue downloads: {str(e)}"}
+
+@expose
+def cancel_download_job(job_id):
+    """Cancel a queued or running download job"""
+    if download_queue.cancel(job_id):
+        return {"status": "success", "message": "Download job cancelled"}
+    return {"status": "error", "message": "Download job is not running"}
+
+@expose
+def list_download_jobs():
+    """List download jobs with their progress"""
+    return {"status": "success", "jobs": download_queue.list_jobs()}
+
+def resolve_post_images(post_ref):
+    """Resolve a post id or URL to its id and image URLs, from the media cache when the post was seen"""
+    if post_ref.startswith('http'):
+        match = POST_ID_PATTERN.search(post_ref)
+        post_id = match.group(1).lower() if match else None
+    else:
+        post_id = post_ref
+    
+    media = cached_media(post_id) if post_id else None
+    if media is not None:
+        metrics.increment('media_cache_total', labels={'result': 'hit'})
+        return post_id, media['image_urls']
+    
+    metrics.increment('media_cache_total', labels={'result': 'miss'})
+    with metrics.timer('reddit_request_seconds', {'endpoint': 'submission'}):
+        if post_ref.startswith('http'):
+            submission = get_reddit().submission(url=post_ref)
+        else:
+            submission = get_reddit().submission(id=post_ref)
+        media = submission_media(submission)
+    remember_media(submission.id, media)
+    return submission.id, media['image_urls']
+
+def index_downloaded_image(result, post_id):
+    """Queue a newly downloaded image for perceptual hashing (repost detection)"""
+    image_index.index_file(post_id, result['path'], result['url'])
+
+def report_repost(post_id, matches):
+    """Flag a post whose image was seen before in an earlier post"""
+    seen = matches[0]
+    metrics.increment('reposts_detected_total')
+    repost_of = {'post_id': seen['post_id'], 'distance': seen['distance']}
+    feed_store.update(post_id, repost_of=repost_of)
+    push_to_ui('repostDetected', [{'id': post_id, 'repost_of': repost_of}])
+    push_to_ui('logMessage', f"Post {post_id} looks like a repost of {seen['post_id'] or 'an earlier download'}", "info")
+
+def thumbnail_source(post_id):
+    """Image a post's feed thumbnail is made from - the small preview when Reddit has one"""
+    media = cached_media(post_id)
+    if not media:
+        return None
+    urls = media['preview_urls'] or media['image_urls']
+    return urls[0] if urls else None
+
+def push_thumbnail(thumbnail):
+    """Tell the frontend a thumbnail it asked for is ready"""
+    push_to_ui('thumbnailReady', thumbnail)
+
+@expose
+def request_thumbnails(post_ids):
+    """Get cached thumbnail URLs of feed cards and queue the missing ones, newest request first"""
+    try:
+        return {"status": "success", "thumbnails": thumbnails.request(post_ids)}
     except Exception as e:
-        eel.logMessage(f"Failed to download {image_url}: {str(e)}", "error")
-    return False
+        return {"status": "error", "message": f"Failed to get thumbnails: {str(e)}"}
+
+def push_download_progress(progress):
+    """Forward download job progress to the frontend"""
+    push_to_ui('downloadProgress', progress)
+
+def listing_pages(subreddit, limit):
+    """Walk subreddit.new() newest first, yielding each page of up to POLL_PAGE_SIZE posts
+    
+    Every page is one request with an 'after' cursor. Reddit leaves removed posts out,
+    so pages can be short; the walk ends at an empty page or after limit posts.
+    """
+    after = None
+    remaining = limit
+    while remaining > 0:
+        with metrics.timer('reddit_request_seconds', {'endpoint': 'new'}):
+            page = list(subreddit.new(limit=min(POLL_PAGE_SIZE, remaining),
+                                      params={'after': after} if after else None))
+        if not page:
+            return
+        yield page
+        remaining -= len(page)
+        after = page[-1].fullname
 
-@eel.expose
+@expose
 def get_recent_posts(subreddit_name, limit=5):
-    """Get recent posts from subreddit - smart loading based on last seen post"""
+    """Get recent posts from subreddit - smart loading based on last seen post
+    
+    Posts are pushed to the frontend through recentPostsPage as each listing page
+    arrives, with descriptions cut to previews (see get_post_description).
+    """
+    started = time.perf_counter()
     try:
-        subreddit = reddit.subreddit(subreddit_name)
-        posts = []
+        subreddit = get_reddit().subreddit(subreddit_name)
+        page = []
+        page_number = 0
         
         # Get the last seen post info
         last_post_info = load_last_post_info()
@@ -157,7 +886,7 @@ def get_recent_posts(subreddit_name, limit=5):
             # First time launch - get last 1000 posts for comprehensive analysis
             actual_limit = 1000
             load_type = "FIRST_LAUNCH"
-            eel.logMessage(f"First launch detected - loading last {actual_limit} posts for analysis", "info")
+            push_to_ui('logMessage', f"First launch detected - loading last {actual_limit} posts for analysis", "info")
         else:
             # Subsequent launch - get posts since last seen
             last_post_id = last_post_info.get('post_id')
@@ -169,35 +898,32 @@ def get_recent_posts(subreddit_name, limit=5):
             
             current_time = time.time()
             hours_since_last = (current_time - last_timestamp) / 3600
-            eel.logMessage(f"Loading posts since last launch ({hours_since_last:.1f} hours ago)", "info")
+            push_to_ui('logMessage', f"Loading posts since last launch ({hours_since_last:.1f} hours ago)", "info")
         
         new_posts_count = 0
         last_seen_post = None
         
-        # Get posts using .new() which returns newest first
-        for post in subreddit.new(limit=actual_limit):
-            # For incremental updates, stop when we reach the last seen post
-            if load_type == "INCREMENTAL_UPDATE" and last_post_info and post.id == last_post_info.get('post_id'):
-                eel.logMessage(f"Reached last seen post '{post.id}' - stopping incremental load", "info")
-                break
-            
-            if post.id not in seen_posts:
-                seen_posts.add(post.id)
-                post_data = {
-                    'title': post.title,
-                    'url': post.url,
-                    'author': str(post.author),
-                    'id': post.id,
-                    'created': post.created_utc,
-                    'flair': post.link_flair_text,
-                    'description': post.selftext,
-                    'upvotes': post.score
-                }
+        reached_last_seen = False
+        # Newest first, one listing request per page
+        for listing_page in listing_pages(subreddit, actual_limit):
+            for post in listing_page:
+                # For incremental updates, stop when we reach the last seen post
+                if load_type == "INCREMENTAL_UPDATE" and last_post_info and post.id == last_post_info.get('post_id'):
+                    push_to_ui('logMessage', f"Reached last seen post '{post.id}' - stopping incremental load", "info")
+                    reached_last_seen = True
+                    break
+                
+                if not mark_post_seen(post.id):
+                    continue
+                post_data = extract_post_data(post)
                 
                 # Log post data for analytics
                 log_post_analytics(post_data, subreddit_name, is_initial_load=True, load_type=load_type)
                 
-                posts.append(post_data)
+                preview = preview_post_data(post_data)
+                feed_store.add(preview, subreddit_name)
+                score_refresher.track(post.id, post.created_utc, **post_state(post))
+                page.append(preview)
                 new_posts_count += 1
                 
                 # Track the most recent post (first in the list)
@@ -208,33 +934,113 @@ def get_recent_posts(subreddit_name, limit=5):
                         'post_created': post.created_utc,
                         'subreddit': subreddit_name
                     }
+            
+            # Push the page as soon as its request returned, newest first as Reddit lists them
+            if page:
+                page_number += 1
+                push_to_ui('recentPostsPage', {'posts': page, 'page': page_number, 'load_type': load_type})
+                page = []
+            if reached_last_seen:
+                break
         
         # Save the most recent post info for next launch
         if last_seen_post:
             save_last_post_info(last_seen_post)
-        
-        # IMPORTANT: Posts are already in newest-first order from Reddit API
-        # No need to reverse or sort - Reddit's .new() returns newest first
+        save_seen_posts()
         
         # Log the results
         if load_type == "FIRST_LAUNCH":
-            eel.logMessage(f"First launch complete: loaded {new_posts_count} posts for analysis", "success")
+            push_to_ui('logMessage', f"First launch complete: loaded {new_posts_count} posts for analysis", "success")
         else:
             if new_posts_count > 0:
-                eel.logMessage(f"Found {new_posts_count} new posts since last launch", "success")
+                push_to_ui('logMessage', f"Found {new_posts_count} new posts since last launch", "success")
             else:
-                eel.logMessage("No new posts since last launch", "info")
+                push_to_ui('logMessage', "No new posts since last launch", "info")
         
+        metrics.observe('recent_posts_seconds', time.perf_counter() - started, {'load_type': load_type})
+        record_rate_limits()
         return {
             "status": "success", 
-            "posts": posts,  # Already in newest-first order
             "load_type": load_type, 
-            "new_posts": new_posts_count
+            "new_posts": new_posts_count,
+            "pages": page_number
         }
         
     except Exception as e:
         return {"status": "error", "message": f"Failed to get recent posts: {str(e)}"}
 
+@expose
+def query_posts(filters=None, sort='newest', cursor=None, limit=feed_store.FEED_PAGE_SIZE):
+    """Get one page of the loaded feed, filtered and sorted through the backend indexes
+    
+    filters may contain post_type ('paid', 'free', 'other'), completed, subreddit and tag;
+    pass the returned next_cursor to get the following page.
+    """
+    try:
+        page = feed_store.query(filters, sort, cursor, limit)
+        return {"status": "success", **page}
+    except Exception as e:
+        return {"status": "error", "message": f"Failed to query posts: {str(e)}"}
+
+@expose
+def get_post_rules():
+    """Get the keyword and regex rules posts are tagged with"""
+    return {"status": "success", "rules": post_rules.get_rules()}
+
+@expose
+def save_post_rules(rules):
+    """Replace the tagging rules ([{name, keywords, patterns}]); applies to posts detected from now on"""
+    try:
+        post_rules.set_rules(rules)
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
+    background_writer.write_file(POST_RULES_FILE, json.dumps({'rules': rules}, indent=2))
+    return {"status": "success", "message": f"Saved {len(rules)} rules"}
+
+def load_post_rules():
+    """Load the tagging rules, falling back to the defaults"""
+    try:
+        if os.path.exists(POST_RULES_FILE):
+            with open(POST_RULES_FILE, 'r', encoding='utf-8') as f:
+                post_rules.set_rules(json.load(f).get('rules', []))
+            return
+    except Exception as e:
+        print(f"Failed to load post rules: {str(e)}")
+    post_rules.set_rules(post_rules.DEFAULT_RULES)
+
+def preview_post_data(post_data):
+    """Return the post dict sent to the UI, with long descriptions cut to a preview"""
+    description = post_data.get('description') or ''
+    remember_description(post_data['id'], description)
+    if len(description) <= DESCRIPTION_PREVIEW_LENGTH:
+        return post_data
+    
+    preview = dict(post_data)
+    preview['description'] = description[:DESCRIPTION_PREVIEW_LENGTH].rstrip() + '...'
+    preview['description_truncated'] = True
+    return preview
+
+def remember_description(post_id, description):
+    """Keep recent full descriptions so expanding a preview needs no API call"""
+    with description_lock:
+        post_descriptions[post_id] = description
+        post_descriptions.move_to_end(post_id)
+        while len(post_descriptions) > DESCRIPTION_CACHE_SIZE:
+            post_descriptions.popitem(last=False)
+
+@expose
+def get_post_description(post_id):
+    """Get the full description of a post whose preview was truncated"""
+    try:
+        with description_lock:
+            description = post_descriptions.get(post_id)
+        if description is None:
+            description = get_reddit().submission(id=post_id).selftext
+            remember_description(post_id, description)
+        return {"status": "success", "description": description}
+    except Exception as e:
+        return {"status": "error", "message": f"Failed to load description: {str(e)}"}
+
 def load_last_post_info():
     """Load information about the last seen post"""
     try:
@@ -248,21 +1054,67 @@ def load_last_post_info():
 
 def save_last_post_info(post_info):
     """Save information about the most recent post seen"""
+    background_writer.write_file(LAST_POST_FILE, json.dumps(post_info, indent=2))
+
+def mark_post_seen(post_id):
+    """Record a post as seen; returns False if it was already seen within SEEN_WINDOW"""
+    global seen_rotated_at
+    key = int(post_id, 36)
+    with seen_lock:
+        load_seen_posts()
+        now = time.time()
+        if now - seen_rotated_at >= SEEN_WINDOW:
+            # Drop the oldest generation; after a long pause both are stale
+            previous = seen_generations[0] if now - seen_rotated_at < 2 * SEEN_WINDOW else set()
+            seen_generations[:] = [set(), previous]
+            seen_rotated_at = now
+        
+        if key in seen_generations[0] or key in seen_generations[1]:
+            return False
+        seen_generations[0].add(key)
+        return True
+
+def load_seen_posts():
+    """Load the seen-post snapshot from disk the first time it is needed"""
+    global seen_generations, seen_rotated_at
+    if seen_generations is not None:
+        return
+    seen_generations = [set(), set()]
+    seen_rotated_at = time.time()
     try:
-        with open(LAST_POST_FILE, 'w', encoding='utf-8') as f:
-            json.dump(post_info, f, indent=2)
+        if os.path.exists(SEEN_POSTS_FILE):
+            with open(SEEN_POSTS_FILE, 'rb') as f:
+                rotated_at, current_count, previous_count = struct.unpack('<dII', f.read(16))
+                ids = array.array('Q')
+                ids.frombytes(f.read())
+            seen_generations = [set(ids[:current_count]), set(ids[current_count:current_count + previous_count])]
+            seen_rotated_at = rotated_at
     except Exception as e:
-        print(f"Error saving last post info: {str(e)}")
+        print(f"Error loading seen posts: {str(e)}")
+
+def save_seen_posts():
+    """Snapshot the seen-post index to disk as packed 64-bit ids"""
+    with seen_lock:
+        if seen_generations is None:
+            return
+        current, previous = seen_generations
+        header = struct.pack('<dII', seen_rotated_at, len(current), len(previous))
+        ids = array.array('Q', current)
+        ids.extend(previous)
+    background_writer.write_file(SEEN_POSTS_FILE, header + ids.tobytes())
 
 def should_do_full_load():
     """Check if we should load full history (100 posts) or just recent (5 posts) - DEPRECATED"""
     # This function is now deprecated as we use load_last_post_info() for smarter loading
     return load_last_post_info() is None
 
-@eel.expose
+@expose
 def select_download_folder():
     """Open folder selection dialog"""
     try:
+        import tkinter as tk
+        from tkinter import filedialog
+        
         # Create a root window and hide it
         root = tk.Tk()
         root.withdraw()
@@ -285,78 +1137,268 @@ def select_download_folder():
         return {"status": "error", "message": f"Failed to select folder: {str(e)}"}
 
 def log_post_analytics(post_data, subreddit_name, is_initial_load=False, load_type="UNKNOWN"):
-    """Log post data for analytics and future analysis"""
-    try:
-        # Convert timestamp to readable format
-        post_datetime = datetime.fromtimestamp(post_data['created'])
-        
-        # Determine post type based on flair
-        flair = post_data.get('flair', '').lower() if post_data.get('flair') else 'unknown'
-        if 'paid' in flair:
-            post_type = 'PAID'
-        elif 'free' in flair:
-            post_type = 'FREE'
-        else:
-            post_type = 'OTHER'
-        
-        # Calculate post length metrics
-        title_length = len(post_data['title'])
-        description_length = len(post_data.get('description', ''))
-        
-        # Create analytics log entry
-        log_entry = {
-            'timestamp': datetime.now().isoformat(),
-            'detection_type': load_type,
-            'post_id': post_data['id'],
-            'subreddit': subreddit_name,
-            'author': post_data['author'],
-            'post_created': post_datetime.isoformat(),
-            'post_date': post_datetime.strftime('%Y-%m-%d'),
-            'post_time': post_datetime.strftime('%H:%M:%S'),
-            'post_hour': post_datetime.hour,
-            'post_weekday': post_datetime.strftime('%A'),
-            'post_type': post_type,
-            'flair_raw': post_data.get('flair', ''),
-            'title_length': title_length,
-            'description_length': description_length,
-            'upvotes': post_data.get('upvotes', 0),
-            'title': post_data['title'][:100] + '...' if title_length > 100 else post_data['title']  # Truncate long titles
-        }
+    """Queue post data for analytics; the record is built and stored on the writer thread"""
+    background_writer.submit(store_post_analytics, (post_data, subreddit_name, load_type, datetime.now()))
+
+def store_post_analytics(records):
+    """Build and store a batch of queued analytics records (runs on the writer thread)"""
+    entries = []
+    for post_data, subreddit_name, load_type, detected_at in records:
+        try:
+            entries.append(build_analytics_entry(post_data, subreddit_name, load_type, detected_at))
+        except Exception as e:
+            print(f"Failed to log post analytics: {str(e)}")
+    store_analytics_entries(entries)
+
+def build_analytics_entry(post_data, subreddit_name, load_type="UNKNOWN", detected_at=None):
+    """Build the analytics record stored for a single post"""
+    # Convert timestamp to readable format
+    post_datetime = datetime.fromtimestamp(post_data['created'])
+    
+    # Determine post type based on flair
+    flair = post_data.get('flair', '').lower() if post_data.get('flair') else 'unknown'
+    if 'paid' in flair:
+        post_type = 'PAID'
+    elif 'free' in flair:
+        post_type = 'FREE'
+    else:
+        post_type = 'OTHER'
+    
+    # Calculate post length metrics
+    title_length = len(post_data['title'])
+    description_length = len(post_data.get('description', ''))
+    
+    return {
+        'timestamp': (detected_at or datetime.now()).isoformat(),
+        'detection_type': load_type,
+        'post_id': post_data['id'],
+        'subreddit': subreddit_name,
+        'author': post_data['author'],
+        'created_utc': post_data['created'],
+        'post_created': post_datetime.isoformat(),
+        'post_date': post_datetime.strftime('%Y-%m-%d'),
+        'post_time': post_datetime.strftime('%H:%M:%S'),
+        'post_hour': post_datetime.hour,
+        'post_weekday': post_datetime.strftime('%A'),
+        'post_type': post_type,
+        'flair_raw': post_data.get('flair', ''),
+        'title_length': title_length,
+        'description_length': description_length,
+        'upvotes': post_data.get('upvotes', 0),
+        'num_comments': post_data.get('num_comments'),
+        'image_urls': json.dumps(post_data['image_urls']) if 'image_urls' in post_data else None,
+        'preview_urls': json.dumps(post_data['preview_urls']) if 'preview_urls' in post_data else None,
+        'tags': post_data.get('tags', []),
+        'price': post_data.get('price'),
+        'title': post_data['title'][:100] + '...' if title_length > 100 else post_data['title']  # Truncate long titles
+    }
+
+def get_posts_db():
+    """Open the analytics database on first use and make sure the schema exists"""
+    global posts_db
+    if posts_db is None:
+        is_new = not os.path.exists(POSTS_DB_FILE)
+        conn = sqlite3.connect(POSTS_DB_FILE, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=FULL' if background_writer.FSYNC_POLICY == 'always' else 'PRAGMA synchronous=NORMAL')
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS posts (
+                post_id TEXT PRIMARY KEY,
+                timestamp TEXT,
+                detection_type TEXT,
+                subreddit TEXT,
+                author TEXT,
+                created_utc REAL,
+                post_created TEXT,
+                post_date TEXT,
+                post_time TEXT,
+                post_hour INTEGER,
+                post_weekday TEXT,
+                post_type TEXT,
+                flair_raw TEXT,
+                title_length INTEGER,
+                description_length INTEGER,
+                upvotes INTEGER,
+                title TEXT
+            )
+        """)
+        existing = {row[1] for row in conn.execute('PRAGMA table_info(posts)')}
+        for column, column_type in POSTS_DB_LATE_COLUMNS.items():
+            if column not in existing:
+                conn.execute(f'ALTER TABLE posts ADD COLUMN {column} {column_type}')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_posts_created ON posts (created_utc)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_posts_type ON posts (post_type, created_utc)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_posts_author ON posts (author, created_utc)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_posts_subreddit ON posts (subreddit, created_utc)')
+        # Rule tags, one row per matched rule (see post_rules)
+        conn.execute('CREATE TABLE IF NOT EXISTS post_tags (post_id TEXT, tag TEXT, PRIMARY KEY (tag, post_id))')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_post_tags_post ON post_tags (post_id)')
+        conn.commit()
+        posts_db = conn
         
-        # Write to analytics log file
-        with open(POSTS_ANALYTICS_FILE, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(log_entry) + '\n')
-            
-    except Exception as e:
-        print(f"Failed to log post analytics: {str(e)}")
+        # Bring over the history from the old JSONL log the first time the database is created
+        if is_new and os.path.exists(POSTS_ANALYTICS_FILE):
+            imported = import_analytics_log(POSTS_ANALYTICS_FILE)
+            print(f"Imported {imported} posts from {POSTS_ANALYTICS_FILE}")
+    return posts_db
+
+def store_analytics_entries(entries):
+    """Insert analytics records, keeping one row per post_id"""
+    rows = [tuple(entry.get(column) for column in POSTS_DB_COLUMNS) for entry in entries]
+    placeholders = ', '.join('?' for _ in POSTS_DB_COLUMNS)
+    with db_lock:
+        conn = get_posts_db()
+        # A post seen again keeps its first detection details but picks up the newest score,
+        # comment count, price and tags (the post or the rules may have changed)
+        conn.executemany(
+            f"INSERT INTO posts ({', '.join(POSTS_DB_COLUMNS)}) VALUES ({placeholders}) "
+            "ON CONFLICT(post_id) DO UPDATE SET upvotes = excluded.upvotes, "
+            "num_comments = excluded.num_comments, price = excluded.price, "
+            "image_urls = COALESCE(excluded.image_urls, image_urls), "
+            "preview_urls = COALESCE(excluded.preview_urls, preview_urls)",
+            rows
+        )
+        # Entries imported from old logs have no tags key; their tag rows are left alone
+        tags = {entry['post_id']: entry['tags'] or [] for entry in entries if 'tags' in entry}
+        conn.executemany('DELETE FROM post_tags WHERE post_id = ?', [(post_id,) for post_id in tags])
+        conn.executemany(
+            'INSERT OR IGNORE INTO post_tags (post_id, tag) VALUES (?, ?)',
+            [(post_id, tag) for post_id, post_tags in tags.items() for tag in post_tags]
+        )
+        conn.commit()
+
+@expose
+def import_analytics_log(log_path=POSTS_ANALYTICS_FILE):
+    """Import an existing posts_analytics.log JSONL file into the analytics database"""
+    imported = 0
+    batch = []
+    with open(log_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if 'created_utc' not in entry and entry.get('post_created'):
+                entry['created_utc'] = datetime.fromisoformat(entry['post_created']).timestamp()
+            batch.append(entry)
+            if len(batch) >= 5000:
+                store_analytics_entries(batch)
+                imported += len(batch)
+                batch = []
+    if batch:
+        store_analytics_entries(batch)
+        imported += len(batch)
+    return imported
 
-@eel.expose
-def get_posts_analytics():
-    """Get analytics data from posts log for dashboard"""
+@expose
+def get_posts_analytics(start_date=None, end_date=None, filters=None):
+    """Get analytics data from the posts database for dashboard
+    
+    start_date/end_date are inclusive 'YYYY-MM-DD' strings; filters may contain
+    post_type, author, subreddit, tag (a rule name), min_price and max_price.
+    """
     try:
-        if not os.path.exists(POSTS_ANALYTICS_FILE):
-            return {"status": "success", "analytics": create_empty_analytics()}
-        
-        posts = []
-        with open(POSTS_ANALYTICS_FILE, 'r', encoding='utf-8') as f:
-            for line in f:
-                if line.strip():
-                    try:
-                        posts.append(json.loads(line.strip()))
-                    except json.JSONDecodeError:
-                        continue
-        
-        if not posts:
-            return {"status": "success", "analytics": create_empty_analytics()}
-        
-        # Calculate comprehensive analytics
-        analytics = calculate_detailed_analytics(posts)
-        
+        with metrics.timer('analytics_seconds'):
+            background_writer.flush()
+            where, params = build_analytics_filter(start_date, end_date, filters)
+            with db_lock:
+                state = query_analytics_state(get_posts_db(), where, params)
+            analytics = build_analytics_from_state(state) if state['total_posts'] else create_empty_analytics()
         return {"status": "success", "analytics": analytics}
         
     except Exception as e:
         return {"status": "error", "message": f"Failed to get analytics: {str(e)}"}
 
+def build_analytics_filter(start_date=None, end_date=None, filters=None):
+    """Translate a date range and field filters into an indexed WHERE clause"""
+    clauses = []
+    params = []
+    if start_date:
+        clauses.append('created_utc >= ?')
+        params.append(datetime.strptime(start_date, '%Y-%m-%d').timestamp())
+    if end_date:
+        # End date is inclusive - compare against the start of the following day
+        clauses.append('created_utc < ?')
+        params.append(datetime.strptime(end_date, '%Y-%m-%d').timestamp() + 86400)
+    for column in ('post_type', 'author', 'subreddit'):
+        value = (filters or {}).get(column)
+        if value:
+            clauses.append(f'{column} = ?')
+            params.append(value)
+    if (filters or {}).get('tag'):
+        clauses.append('post_id IN (SELECT post_id FROM post_tags WHERE tag = ?)')
+        params.append(filters['tag'])
+    if (filters or {}).get('min_price') is not None:
+        clauses.append('price >= ?')
+        params.append(float(filters['min_price']))
+    if (filters or {}).get('max_price') is not None:
+        clauses.append('price <= ?')
+        params.append(float(filters['max_price']))
+    where = ('WHERE ' + ' AND '.join(clauses)) if clauses else ''
+    return where, params
+
+def query_analytics_state(conn, where, params):
+    """Run the dashboard aggregates in SQL and return them as running aggregates"""
+    state = create_analytics_state()
+    
+    total, upvotes, title_total, description_total = conn.execute(
+        f'SELECT COUNT(*), SUM(upvotes), SUM(title_length), SUM(description_length) FROM posts {where}',
+        params
+    ).fetchone()
+    state['total_posts'] = total
+    state['total_upvotes'] = upvotes or 0
+    state['title_length_total'] = title_total or 0
+    state['description_length_total'] = description_total or 0
+    if total == 0:
+        return state
+    
+    # Groups are returned in order of first appearance, matching a fold over the rows
+    for post_type, count, type_upvotes in conn.execute(
+            f'SELECT post_type, COUNT(*), SUM(upvotes) FROM posts {where} GROUP BY post_type ORDER BY MIN(rowid)',
+            params):
+        state['type_counts'][post_type] = count
+        state['type_upvotes'][post_type] = type_upvotes or 0
+    
+    for hour, count in conn.execute(
+            f'SELECT post_hour, COUNT(*) FROM posts {where} GROUP BY post_hour ORDER BY MIN(rowid)',
+            params):
+        state['hour_counts'][hour] = count
+    
+    for weekday, count in conn.execute(
+            f'SELECT post_weekday, COUNT(*) FROM posts {where} GROUP BY post_weekday ORDER BY MIN(rowid)',
+            params):
+        state['weekday_counts'][weekday] = count
+    
+    for date, post_type, count in conn.execute(
+            f'SELECT post_date, post_type, COUNT(*) FROM posts {where} GROUP BY post_date, post_type ORDER BY post_date',
+            params):
+        state['daily_posts'][date] = state['daily_posts'].get(date, 0) + count
+        state['daily_types'].setdefault(date, {})[post_type] = count
+    
+    # Only the top 10 authors are shown, so only those need to leave the database
+    for author, count in conn.execute(
+            f'SELECT author, COUNT(*) AS posts FROM posts {where} GROUP BY author '
+            'ORDER BY posts DESC, MIN(rowid) LIMIT 10',
+            params):
+        state['author_counts'][author] = count
+    
+    priced, price_total, price_max = conn.execute(
+        f'SELECT COUNT(price), SUM(price), MAX(price) FROM posts {where}', params
+    ).fetchone()
+    state['priced_posts'] = priced
+    state['price_total'] = price_total or 0
+    state['price_max'] = price_max or 0
+    
+    for tag, count in conn.execute(
+            f'SELECT tag, COUNT(*) AS posts FROM post_tags WHERE post_id IN (SELECT post_id FROM posts {where}) '
+            'GROUP BY tag ORDER BY posts DESC',
+            params):
+        state['tag_counts'][tag] = count
+    
+    return state
+
 def create_empty_analytics():
     """Create empty analytics structure"""
     return {
@@ -380,67 +1422,109 @@ def create_empty_analytics():
             "avg_upvotes": 0,
             "paid_avg_upvotes": 0,
             "free_avg_upvotes": 0
+        },
+        "tag_counts": {},
+        "price_metrics": {
+            "priced_posts": 0,
+            "avg_price": 0,
+            "max_price": 0
         }
     }
 
+def create_analytics_state():
+    """Create empty running aggregates for the analytics dashboard"""
+    return {
+        "total_posts": 0,
+        "type_counts": {},
+        "type_upvotes": {},
+        "total_upvotes": 0,
+        "hour_counts": {},
+        "weekday_counts": {},
+        "daily_posts": {},
+        "daily_types": {},
+        "author_counts": {},
+        "title_length_total": 0,
+        "description_length_total": 0,
+        "tag_counts": {},
+        "priced_posts": 0,
+        "price_total": 0,
+        "price_max": 0
+    }
+
+def fold_post_into_analytics(state, post):
+    """Add a single analytics log entry to the running aggregates"""
+    post_type = post['post_type']
+    hour = post['post_hour']
+    weekday = post['post_weekday']
+    date = post['post_date']
+    author = post['author']
+    upvotes = post['upvotes']
+    
+    state['total_posts'] += 1
+    state['type_counts'][post_type] = state['type_counts'].get(post_type, 0) + 1
+    state['type_upvotes'][post_type] = state['type_upvotes'].get(post_type, 0) + upvotes
+    state['total_upvotes'] += upvotes
+    state['hour_counts'][hour] = state['hour_counts'].get(hour, 0) + 1
+    state['weekday_counts'][weekday] = state['weekday_counts'].get(weekday, 0) + 1
+    state['daily_posts'][date] = state['daily_posts'].get(date, 0) + 1
+    day_types = state['daily_types'].setdefault(date, {})
+    day_types[post_type] = day_types.get(post_type, 0) + 1
+    state['author_counts'][author] = state['author_counts'].get(author, 0) + 1
+    state['title_length_total'] += post['title_length']
+    state['description_length_total'] += post['description_length']
+    for tag in post.get('tags') or []:
+        state['tag_counts'][tag] = state['tag_counts'].get(tag, 0) + 1
+    if post.get('price') is not None:
+        state['priced_posts'] += 1
+        state['price_total'] += post['price']
+        state['price_max'] = max(state['price_max'], post['price'])
+
 def calculate_detailed_analytics(posts):
     """Calculate comprehensive analytics from posts data"""
-    total_posts = len(posts)
-    paid_posts = sum(1 for p in posts if p['post_type'] == 'PAID')
-    free_posts = sum(1 for p in posts if p['post_type'] == 'FREE')
-    other_posts = sum(1 for p in posts if p['post_type'] == 'OTHER')
+    state = create_analytics_state()
+    for post in posts:
+        fold_post_into_analytics(state, post)
+    return build_analytics_from_state(state)
+
+def build_analytics_from_state(state):
+    """Build the dashboard analytics structure from running aggregates"""
+    total_posts = state['total_posts']
+    type_counts = state['type_counts']
+    type_upvotes = state['type_upvotes']
+    paid_posts = type_counts.get('PAID', 0)
+    free_posts = type_counts.get('FREE', 0)
+    other_posts = type_counts.get('OTHER', 0)
     
     # Hour distribution (24-hour array)
+    hour_counts = dict(state['hour_counts'])
     hourly_distribution = [0] * 24
-    hour_counts = {}
-    for post in posts:
-        hour = post['post_hour']
-        hourly_distribution[hour] += 1
-        hour_counts[hour] = hour_counts.get(hour, 0) + 1
+    for hour, count in hour_counts.items():
+        hourly_distribution[hour] += count
     
-    # Weekday distribution
-    weekday_counts = {}
-    for post in posts:
-        weekday = post['post_weekday']
-        weekday_counts[weekday] = weekday_counts.get(weekday, 0) + 1
-    
-    # Daily posting trends (last 30 days)
-    daily_posts = {}
-    for post in posts:
-        date = post['post_date']
-        daily_posts[date] = daily_posts.get(date, 0) + 1
+    weekday_counts = dict(state['weekday_counts'])
+    daily_posts = dict(state['daily_posts'])
     
-    # Author analysis
-    author_counts = {}
-    for post in posts:
-        author = post['author']
-        author_counts[author] = author_counts.get(author, 0) + 1
-    
-    # Sort authors by post count and get top 10
-    top_authors = dict(sorted(author_counts.items(), key=lambda x: x[1], reverse=True)[:10])
+    # Top 10 authors by post count (same ordering as a stable sort)
+    top_authors = dict(heapq.nlargest(10, state['author_counts'].items(), key=lambda x: x[1]))
     
     # Engagement metrics
-    total_upvotes = sum(p['upvotes'] for p in posts)
-    paid_upvotes = sum(p['upvotes'] for p in posts if p['post_type'] == 'PAID')
-    free_upvotes = sum(p['upvotes'] for p in posts if p['post_type'] == 'FREE')
-    
-    avg_upvotes = total_upvotes / total_posts if total_posts > 0 else 0
-    paid_avg_upvotes = paid_upvotes / paid_posts if paid_posts > 0 else 0
-    free_avg_upvotes = free_upvotes / free_posts if free_posts > 0 else 0
+    avg_upvotes = state['total_upvotes'] / total_posts if total_posts > 0 else 0
+    paid_avg_upvotes = type_upvotes.get('PAID', 0) / paid_posts if paid_posts > 0 else 0
+    free_avg_upvotes = type_upvotes.get('FREE', 0) / free_posts if free_posts > 0 else 0
     
     # Length analysis
-    avg_title_length = sum(p['title_length'] for p in posts) / total_posts if total_posts > 0 else 0
-    avg_description_length = sum(p['description_length'] for p in posts) / total_posts if total_posts > 0 else 0
+    avg_title_length = state['title_length_total'] / total_posts if total_posts > 0 else 0
+    avg_description_length = state['description_length_total'] / total_posts if total_posts > 0 else 0
     
     # Posting trends (group by date for trend analysis)
     posting_trends = []
-    sorted_dates = sorted(daily_posts.keys())
-    for date in sorted_dates:
+    for date in sorted(daily_posts.keys()):
+        day_types = state['daily_types'].get(date, {})
         posting_trends.append({
             'date': date,
             'posts': daily_posts[date],
-            'paid': sum(1 for p in posts if p['post_date'] == date and p['post_type'] == 'PAID'),
-            'free': sum(1 for p in posts if p['post_date'] == date and p['post_type'] == 'FREE')
+            'paid': day_types.get('PAID', 0),
+            'free': day_types.get('FREE', 0)
         })
     
     return {
@@ -464,71 +1548,266 @@ def calculate_detailed_analytics(posts):
             "avg_upvotes": round(avg_upvotes, 1),
             "paid_avg_upvotes": round(paid_avg_upvotes, 1),
             "free_avg_upvotes": round(free_avg_upvotes, 1)
+        },
+        "tag_counts": dict(sorted(state['tag_counts'].items(), key=lambda x: x[1], reverse=True)),
+        "price_metrics": {
+            "priced_posts": state['priced_posts'],
+            "avg_price": round(state['price_total'] / state['priced_posts'], 2) if state['priced_posts'] else 0,
+            "max_price": state['price_max']
         }
     }
 
-@eel.expose
-def save_logs_to_file(log_entries):
-    """Save activity logs to file"""
+@expose
+def append_log_entries(entries):
+    """Append new activity log entries ({time, type, message}) from the frontend"""
+    for entry in entries:
+        background_writer.submit(write_log_entries, entry)
+    return {"status": "success", "message": f"Queued {len(entries)} log entries"}
+
+def write_log_entries(entries):
+    """Append a batch of log entries, rotating the file when it grows too large (writer thread)"""
+    with logs_lock:
+        if os.path.exists(LOGS_FILE) and os.path.getsize(LOGS_FILE) >= LOGS_MAX_BYTES:
+            rotate_logs()
+        with open(LOGS_FILE, 'a', encoding='utf-8') as f:
+            f.write(''.join(json.dumps(entry) + '\n' for entry in entries))
+
+def rotate_logs():
+    """Shift activity_logs.log -> .1 -> .2 ..., dropping the oldest backup"""
+    global logs_generation
+    logs_generation += 1
+    for index in range(LOGS_BACKUPS, 0, -1):
+        source = log_file_path(index - 1)
+        if os.path.exists(source):
+            os.replace(source, log_file_path(index))
+
+def log_file_path(index):
+    """Path of the current log (index 0) or one of its rotated backups"""
+    return LOGS_FILE if index == 0 else f"{LOGS_FILE}.{index}"
+
+@expose
+def load_logs_from_file(limit=LOGS_PAGE_SIZE, cursor=None):
+    """Load the newest activity log entries, or the page before a cursor
+    
+    Returns entries oldest first and a cursor for the next older page (None when
+    the history is exhausted). Legacy plain-text lines come back as strings.
+    """
     try:
-        with open(LOGS_FILE, 'w', encoding='utf-8') as f:
-            for entry in log_entries:
-                f.write(entry + '\n')
-        return {"status": "success", "message": "Logs saved successfully"}
+        background_writer.flush()
+        with logs_lock:
+            if cursor:
+                # The cursor names its file by generation, so rotation between pages does not shift it
+                generation, offset = cursor
+                index = logs_generation - generation
+            else:
+                index, offset = 0, None
+            lines = []
+            while index <= LOGS_BACKUPS and len(lines) < limit:
+                path = log_file_path(index)
+                if not os.path.exists(path):
+                    break
+                if offset is None:
+                    offset = os.path.getsize(path)
+                older, offset = read_lines_before(path, offset, limit - len(lines))
+                lines = older + lines
+                if offset == 0:
+                    index, offset = index + 1, None
+            
+            next_cursor = None
+            if index <= LOGS_BACKUPS and os.path.exists(log_file_path(index)) and (offset is None or offset > 0):
+                next_cursor = [logs_generation - index, offset]
+        
+        entries = []
+        for line in lines:
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                entries.append(line)
+        return {"status": "success", "entries": entries, "cursor": next_cursor}
     except Exception as e:
-        return {"status": "error", "message": f"Failed to save logs: {str(e)}"}
+        print(f"Failed to load logs: {str(e)}")
+        return {"status": "error", "message": f"Failed to load logs: {str(e)}"}
 
-@eel.expose
-def load_logs_from_file():
-    """Load activity logs from file"""
+def read_lines_before(path, end_offset, limit):
+    """Read up to limit non-empty lines ending at end_offset, scanning backwards in blocks
+    
+    Returns the lines oldest first and the offset where the oldest of them starts.
+    """
+    block_size = 64 * 1024
+    start = end_offset
+    data = b''
+    with open(path, 'rb') as f:
+        while start > 0 and data.count(b'\n') <= limit:
+            read_size = min(block_size, start)
+            start -= read_size
+            f.seek(start)
+            data = f.read(read_size) + data
+    
+    pieces = data.split(b'\n')
+    lines = []
+    oldest_start = end_offset
+    position = end_offset
+    for index in range(len(pieces) - 1, -1, -1):
+        piece = pieces[index]
+        if index == 0 and start > 0:
+            break  # May be cut mid-line - left for the next page
+        if piece.strip() and len(lines) == limit:
+            break
+        oldest_start = position - len(piece)
+        position = oldest_start - 1
+        if piece.strip():
+            lines.append(piece.decode('utf-8', errors='replace').strip())
+    
+    lines.reverse()
+    return lines, oldest_start
+
+@expose
+def clear_logs():
+    """Delete the activity log and its rotated backups"""
+    global logs_generation
     try:
-        if os.path.exists(LOGS_FILE):
-            with open(LOGS_FILE, 'r', encoding='utf-8') as f:
-                logs = [line.strip() for line in f.readlines() if line.strip()]
-            return logs
-        return []
+        background_writer.flush()
+        with logs_lock:
+            # Cursors into the deleted files must not land in the next log
+            logs_generation += 1
+            for index in range(LOGS_BACKUPS + 1):
+                if os.path.exists(log_file_path(index)):
+                    os.remove(log_file_path(index))
+        return {"status": "success", "message": "Logs cleared"}
     except Exception as e:
-        print(f"Failed to load logs: {str(e)}")
-        return []
+        return {"status": "error", "message": f"Failed to clear logs: {str(e)}"}
 
-@eel.expose
-def save_completed_posts(completed_post_ids):
-    """Save completed posts to file"""
+@expose
+def mark_completed(post_id):
+    """Mark a post as completed"""
+    return record_completion(post_id, True)
+
+@expose
+def unmark_completed(post_id):
+    """Mark a post as not completed"""
+    return record_completion(post_id, False)
+
+def record_completion(post_id, completed):
+    """Update the in-memory completed set and journal the change"""
     try:
+        with completed_lock:
+            load_completed_state()
+            if completed:
+                completed_posts.add(post_id)
+            else:
+                completed_posts.discard(post_id)
+        feed_store.set_completed(post_id, completed)
+        background_writer.submit(write_completion_journal, ('+' if completed else '-') + post_id)
+        return {"status": "success", "message": "Completion status saved"}
+    except Exception as e:
+        return {"status": "error", "message": f"Failed to save completion status: {str(e)}"}
+
+def is_post_completed(post_id):
+    """Check the in-memory completed set (read by the feed store as posts are added)"""
+    with completed_lock:
+        load_completed_state()
+        return post_id in completed_posts
+
+def write_completion_journal(changes):
+    """Append completion changes to the journal, compacting it when it grows (writer thread)"""
+    global completed_journal_length
+    with open(COMPLETED_JOURNAL_FILE, 'a', encoding='utf-8') as f:
+        f.write(''.join(change + '\n' for change in changes))
+    completed_journal_length += len(changes)
+    if completed_journal_length >= COMPLETED_COMPACT_EVERY:
+        compact_completed_posts()
+
+def compact_completed_posts(_batch=None):
+    """Fold the journal into the completed_posts.json snapshot and truncate it (writer thread)"""
+    global completed_journal_length
+    with completed_lock:
         data = {
-            'completed_posts': completed_post_ids,
+            'completed_posts': sorted(completed_posts),
             'last_updated': datetime.now().isoformat()
         }
-        with open(COMPLETED_POSTS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
-        return {"status": "success", "message": "Completed posts saved successfully"}
-    except Exception as e:
-        return {"status": "error", "message": f"Failed to save completed posts: {str(e)}"}
+    # Snapshot first: replaying a journal already folded into it is harmless
+    background_writer.write_atomic(COMPLETED_POSTS_FILE, json.dumps(data, indent=2),
+                                   fsync=background_writer.FSYNC_POLICY != 'never')
+    open(COMPLETED_JOURNAL_FILE, 'w', encoding='utf-8').close()
+    completed_journal_length = 0
 
-@eel.expose
-def load_completed_posts():
-    """Load completed posts from file"""
+def load_completed_state():
+    """Load the snapshot and replay the journal the first time completion state is needed"""
+    global completed_posts, completed_journal_length
+    if completed_posts is not None:
+        return
+    completed = set()
     try:
         if os.path.exists(COMPLETED_POSTS_FILE):
             with open(COMPLETED_POSTS_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            return data.get('completed_posts', [])
-        return []
+                completed.update(json.load(f).get('completed_posts', []))
+        if os.path.exists(COMPLETED_JOURNAL_FILE):
+            with open(COMPLETED_JOURNAL_FILE, 'rb+') as f:
+                complete = 0  # Bytes up to the end of the last complete line
+                for raw in f:
+                    if not raw.endswith(b'\n'):
+                        break  # Cut off by a crash mid-append
+                    complete += len(raw)
+                    line = raw.decode('utf-8').strip()
+                    if line.startswith('+'):
+                        completed.add(line[1:])
+                    elif line.startswith('-'):
+                        completed.discard(line[1:])
+                    completed_journal_length += 1
+                # Drop a partial last line, so the next change is not appended to it
+                f.truncate(complete)
     except Exception as e:
         print(f"Failed to load completed posts: {str(e)}")
-        return []
+    completed_posts = completed
 
-@eel.expose
+@expose
+def save_completed_posts(completed_post_ids):
+    """Replace the whole completed set (prefer mark_completed/unmark_completed)"""
+    global completed_posts
+    try:
+        with completed_lock:
+            completed_posts = set(completed_post_ids)
+        feed_store.reload_completed()
+        background_writer.submit(compact_completed_posts, None)
+        return {"status": "success", "message": "Completed posts saved successfully"}
+    except Exception as e:
+        return {"status": "error", "message": f"Failed to save completed posts: {str(e)}"}
+
+@expose
+def load_completed_posts():
+    """Load completed posts"""
+    with completed_lock:
+        load_completed_state()
+        return list(completed_posts)
+
+@expose
+def get_metrics():
+    """Get timings and counters of Reddit calls, polling, UI pushes, disk writes and downloads"""
+    return {"status": "success", "metrics": metrics.snapshot()}
+
+@expose
 def test_reddit_connection():
     """Test Reddit API connection"""
     try:
         # Try to access a subreddit
-        subreddit = reddit.subreddit('test')
+        subreddit = get_reddit().subreddit('test')
         subreddit.display_name  # This will fail if credentials are wrong
         return {"status": "success", "message": "Reddit API connected successfully"}
     except Exception as e:
         return {"status": "error", "message": f"Reddit API connection failed: {str(e)}"}
 
+download_queue.configure(resolve_post_images, push_download_progress)
+downloads.configure(index_downloaded_image)
+image_index.configure(report_repost)
+thumbnails.configure(thumbnail_source, push_thumbnail)
+feed_store.configure(is_post_completed)
+score_refresher.configure(fetch_post_states, apply_post_state_changes)
+load_post_rules()
+
 if __name__ == '__main__':
+    # Pick up download jobs interrupted by the last shutdown
+    download_queue.resume_jobs()
+    metrics.start_exporters()
+    
     # Start the Eel app
-    eel.start('index.html', size=(1200, 800), port=8080)
\ No newline at end of file
+    start_ui()
\ No newline at end of file
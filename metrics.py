@@ -0,0 +1,181 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import background_writer
+
+# Exporter settings
+METRICS_PREFIX = 'reddit_monitor_'
+METRICS_PORT = os.getenv('METRICS_PORT')  # Serve /metrics on 127.0.0.1:<port> when set
+METRICS_FILE = os.getenv('METRICS_FILE')  # Rewrite this Prometheus text file when set
+METRICS_FILE_INTERVAL = 15  # Seconds between metrics file rewrites
+
+# Help text of the metrics recorded by the app
+DESCRIPTIONS = {
+    'reddit_request_seconds': 'Duration of Reddit listing and submission calls',
+    'reddit_ratelimit_remaining': 'Reddit API requests left in the current rate limit window',
+    'reddit_ratelimit_used': 'Reddit API requests used in the current rate limit window',
+    'reddit_ratelimit_reset_timestamp': 'Unix time the Reddit rate limit window resets',
+    'poll_seconds': 'Duration of one poll of a single or merged subreddit listing',
+    'poll_posts': 'New posts found per poll',
+    'poll_errors_total': 'Failed polls per subreddit',
+    'poll_interval_seconds': 'Current adaptive polling interval per subreddit',
+    'detection_lag_seconds': 'Seconds between a post being created and being detected',
+    'ui_push_seconds': 'Duration of pushes to the frontend per callback',
+    'ui_push_errors_total': 'Failed pushes to the frontend per callback',
+    'recent_posts_seconds': 'Duration of get_recent_posts loads',
+    'analytics_seconds': 'Duration of get_posts_analytics',
+    'writer_batch_seconds': 'Duration of one background writer batch',
+    'writer_batch_records': 'Records and files written per background writer batch',
+    'writer_errors_total': 'Failed background writer sinks and file writes',
+    'download_bytes_total': 'Bytes downloaded per host',
+    'download_seconds': 'Duration of completed image downloads per host',
+    'download_bytes_per_second': 'Throughput of the last completed download per host',
+    'download_failures_total': 'Failed image downloads per host',
+    'download_cached_total': 'Image downloads skipped because the file was already downloaded',
+    'image_search_seconds': 'Duration of perceptual hash lookups in the image index',
+    'reposts_detected_total': 'New or downloaded images matching an image of an earlier post',
+    'media_cache_total': 'Post image URL lookups answered from the media cache (hit) or Reddit (miss)',
+    'thumbnail_cache_total': 'Feed thumbnails served from the disk cache (hit) or made from the source image (miss)',
+    'thumbnail_seconds': 'Duration of fetching and shrinking one feed thumbnail'
+}
+
+_metrics = {}  # name -> {'type', 'help', 'series': {labels tuple -> values}}
+_lock = threading.Lock()
+_exporters_started = False
+
+
+def increment(name, amount=1, labels=None):
+    """Add to a counter"""
+    with _lock:
+        series = _series(name, 'counter', labels)
+        series['value'] = series.get('value', 0) + amount
+
+
+def set_gauge(name, value, labels=None):
+    """Set a gauge to its current value"""
+    with _lock:
+        series = _series(name, 'gauge', labels)
+        series['value'] = value
+
+
+def observe(name, value, labels=None):
+    """Record one sample of a summary (durations, sizes, lags)"""
+    with _lock:
+        series = _series(name, 'summary', labels)
+        series['count'] = series.get('count', 0) + 1
+        series['sum'] = series.get('sum', 0) + value
+        series['max'] = max(series.get('max', value), value)
+        series['last'] = value
+
+
+@contextmanager
+def timer(name, labels=None):
+    """Observe the seconds spent in a with block, also when it raises"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - started, labels)
+
+
+def snapshot():
+    """Return every metric as plain data for the UI"""
+    with _lock:
+        return {
+            name: {
+                'type': metric['type'],
+                'help': metric['help'],
+                'series': [dict(values, labels=dict(labels)) for labels, values in metric['series'].items()]
+            }
+            for name, metric in _metrics.items()
+        }
+
+
+def render_prometheus():
+    """Render every metric in the Prometheus text exposition format"""
+    lines = []
+    with _lock:
+        for name, metric in sorted(_metrics.items()):
+            full_name = METRICS_PREFIX + name
+            if metric['help']:
+                lines.append(f"# HELP {full_name} {metric['help']}")
+            lines.append(f"# TYPE {full_name} {metric['type']}")
+            for labels, values in metric['series'].items():
+                if metric['type'] == 'summary':
+                    lines.append(f"{full_name}_count{_format_labels(labels)} {values['count']}")
+                    lines.append(f"{full_name}_sum{_format_labels(labels)} {values['sum']:.6f}")
+                else:
+                    lines.append(f"{full_name}{_format_labels(labels)} {values['value']}")
+            # Summary maxima as a separate gauge, since the format has no max field
+            if metric['type'] == 'summary':
+                lines.append(f"# TYPE {full_name}_max gauge")
+                for labels, values in metric['series'].items():
+                    lines.append(f"{full_name}_max{_format_labels(labels)} {values['max']:.6f}")
+    return '\n'.join(lines) + '\n'
+
+
+def start_exporters():
+    """Start the /metrics endpoint and the metrics file writer configured through the environment"""
+    global _exporters_started
+    with _lock:
+        if _exporters_started:
+            return
+        _exporters_started = True
+
+    if METRICS_PORT:
+        try:
+            server = ThreadingHTTPServer(('127.0.0.1', int(METRICS_PORT)), _MetricsHandler)
+            server.daemon_threads = True
+            thread = threading.Thread(target=server.serve_forever, name='metrics-http')
+            thread.daemon = True
+            thread.start()
+        except Exception as e:
+            print(f"Failed to start metrics endpoint on port {METRICS_PORT}: {str(e)}")
+
+    if METRICS_FILE:
+        thread = threading.Thread(target=_write_metrics_file, name='metrics-file')
+        thread.daemon = True
+        thread.start()
+
+
+def _series(name, metric_type, labels):
+    metric = _metrics.get(name)
+    if metric is None:
+        metric = _metrics[name] = {'type': metric_type, 'help': DESCRIPTIONS.get(name, ''), 'series': {}}
+    key = tuple(sorted((labels or {}).items()))
+    return metric['series'].setdefault(key, {})
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    pairs = []
+    for key, value in labels:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{key}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+def _write_metrics_file():
+    while True:
+        time.sleep(METRICS_FILE_INTERVAL)
+        background_writer.write_file(METRICS_FILE, render_prometheus())
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = render_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
@@ -0,0 +1,219 @@
+import re
+import threading
+from collections import deque
+
+# Rule engine - keyword rules are matched by one word-level Aho-Corasick automaton, so a
+# post is scanned once however many keywords exist. Python's re tries every branch of a
+# large alternation at every position, so regex rules are not all run: a pattern with a
+# required literal (e.g. 'remove' in r'\bremove (the )?person') only runs when the literal
+# occurs in the post, and the rest are gated by one combined regex.
+# A rule is {'name': ..., 'keywords': [...], 'patterns': [...]} and matches if any of its
+# keywords (whole words or phrases, case-insensitive) or patterns (regexes) is found.
+DEFAULT_RULES = [
+    {'name': 'urgent', 'keywords': ['urgent', 'asap', 'as soon as possible', 'rush'], 'patterns': []},
+    {'name': 'restore', 'keywords': ['restore', 'restoration', 'old photo', 'damaged', 'colorize', 'colourize'], 'patterns': []},
+    {'name': 'remove person', 'keywords': [],
+     'patterns': [r"\bremove (?:the |this |that |a )?(?:person|people|man|woman|guy|girl|kid|child|stranger)s?\b"]},
+    {'name': 'memorial', 'keywords': ['memorial', 'funeral', 'passed away', 'in memory'], 'patterns': []}
+]
+WORD_PATTERN = re.compile(r"\w+(?:'\w+)*")
+QUANTIFIERS = '?*{'  # Make the preceding character optional
+
+# Prices like $20, 15 USD, €7.50 or 1,000 dollars - the first one in the title or description is kept.
+# Ranges ($10-20, 10 to 20 dollars) count as their lower bound.
+AMOUNT = r"\d{1,3}(?:,\d{3})+(?:\.\d{1,2})?|\d+(?:[.,]\d{1,2})?"
+PRICE_PATTERN = re.compile(
+    rf"[$€£]\s?({AMOUNT})"
+    rf"|\b({AMOUNT})(?:\s?(?:-|–|to)\s?[$€£]?(?:{AMOUNT}))?"
+    r"\s?(?:[$€£](?!\s?\d)|(?:usd|eur|gbp|dollars?|bucks|euros?|pounds?)\b)",
+    re.IGNORECASE
+)
+MAX_PRICE = 100000  # Larger amounts are resolutions, years or ids rather than budgets
+
+_rules = []
+_matcher = None  # Compiled form of _rules, replaced as a whole when the rules change
+_lock = threading.Lock()
+
+
+def compile_rules(rules):
+    """Validate rules and build the matcher; raises ValueError for bad rules"""
+    names = []
+    goto = [{}]  # Automaton states: word -> next state
+    fail = [0]
+    outputs = [set()]
+    patterns = []  # (rule index, pattern text)
+
+    for index, rule in enumerate(rules):
+        name = (rule.get('name') or '').strip()
+        if not name:
+            raise ValueError(f"Rule {index + 1} has no name")
+        names.append(name)
+        for keyword in rule.get('keywords') or []:
+            words = WORD_PATTERN.findall(keyword.casefold())
+            if not words:
+                raise ValueError(f"Rule '{name}' has an empty keyword")
+            state = 0
+            for word in words:
+                if word not in goto[state]:
+                    goto.append({})
+                    fail.append(0)
+                    outputs.append(set())
+                    goto[state][word] = len(goto) - 1
+                state = goto[state][word]
+            outputs[state].add(index)
+        for pattern in rule.get('patterns') or []:
+            try:
+                compiled = re.compile(pattern, re.IGNORECASE)
+            except re.error as e:
+                raise ValueError(f"Rule '{name}' has an invalid pattern '{pattern}': {str(e)}")
+            if compiled.fullmatch(''):
+                raise ValueError(f"Rule '{name}' has a pattern that matches empty text: '{pattern}'")
+            patterns.append((index, compiled))
+
+    # Failure links, breadth first, so a state also reports the keywords ending in its suffixes
+    queue = deque(goto[0].values())
+    while queue:
+        state = queue.popleft()
+        for word, next_state in goto[state].items():
+            queue.append(next_state)
+            fallback = fail[state]
+            while fallback and word not in goto[fallback]:
+                fallback = fail[fallback]
+            fail[next_state] = goto[fallback].get(word, 0)
+            outputs[next_state] |= outputs[fail[next_state]]
+
+    anchored = []  # (literal, rule index, pattern)
+    unanchored = []  # (rule index, pattern)
+    for index, compiled in patterns:
+        literal = required_literal(compiled.pattern)
+        if literal:
+            anchored.append((literal, index, compiled))
+        else:
+            unanchored.append((index, compiled))
+    combined = None
+    if unanchored:
+        try:
+            combined = re.compile('|'.join(f"(?:{compiled.pattern})" for _, compiled in unanchored), re.IGNORECASE)
+        except re.error:
+            # Inline flags or repeated group names - each pattern is run on its own instead
+            combined = None
+    return {
+        'names': names,
+        'goto': goto,
+        'fail': fail,
+        'outputs': [frozenset(output) for output in outputs],
+        'anchored': anchored,
+        'unanchored': unanchored,
+        'combined': combined
+    }
+
+
+def required_literal(pattern):
+    """Longest run of word characters every match of pattern must contain (lowercased), or None
+    
+    Only literals outside groups and character classes count, and none at all when the
+    pattern has a top-level '|' or inline flags (verbose mode changes what is literal).
+    """
+    if '(?' in pattern and re.search(r'\(\?[aiLmsux-]+[:)]', pattern):
+        return None
+    runs = []
+    run = ''
+    depth = 0
+    position = 0
+    while position < len(pattern):
+        char = pattern[position]
+        if char == '\\':
+            runs.append(run)
+            run = ''
+            position += 2
+            continue
+        if char == '[':
+            # Skip the class; a ']' right after '[' or '[^' is a literal
+            position += 1
+            if position < len(pattern) and pattern[position] == '^':
+                position += 1
+            if position < len(pattern) and pattern[position] == ']':
+                position += 1
+            while position < len(pattern) and pattern[position] != ']':
+                position += 2 if pattern[position] == '\\' else 1
+            runs.append(run)
+            run = ''
+        elif char == '(':
+            depth += 1
+            runs.append(run)
+            run = ''
+        elif char == ')':
+            depth -= 1
+        elif char == '|' and depth == 0:
+            return None
+        elif char in QUANTIFIERS:
+            runs.append(run[:-1])
+            run = ''
+            if char == '{':
+                closing = pattern.find('}', position)
+                position = closing if closing != -1 else len(pattern)
+        elif depth == 0 and (char.isalnum() or char == '_'):
+            run += char
+        else:
+            runs.append(run)
+            run = ''
+        position += 1
+    runs.append(run)
+    longest = max(runs, key=len)
+    return longest.lower() if len(longest) >= 2 else None
+
+
+def set_rules(rules):
+    """Replace the rule set; raises ValueError and keeps the old rules if a rule is invalid"""
+    global _rules, _matcher
+    matcher = compile_rules(rules)
+    with _lock:
+        _rules = [dict(rule) for rule in rules]
+        _matcher = matcher
+
+
+def get_rules():
+    with _lock:
+        return [dict(rule) for rule in _rules]
+
+
+def match_post(title, description=''):
+    """Return {'tags': [matched rule names], 'price': first price or None} for a post"""
+    matcher = _matcher
+    text = f"{title or ''}\n{description or ''}"
+    tags = []
+    if matcher is not None:
+        matched = set()
+        goto, fail, outputs = matcher['goto'], matcher['fail'], matcher['outputs']
+        state = 0
+        for word in WORD_PATTERN.findall(text.casefold()):
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            if outputs[state]:
+                matched |= outputs[state]
+
+        lowered = text.lower()
+        for literal, index, compiled in matcher['anchored']:
+            if index not in matched and literal in lowered and compiled.search(text):
+                matched.add(index)
+        if matcher['combined'] is None or matcher['combined'].search(text):
+            for index, compiled in matcher['unanchored']:
+                if index not in matched and compiled.search(text):
+                    matched.add(index)
+        tags = [matcher['names'][index] for index in sorted(matched)]
+    return {'tags': tags, 'price': extract_price(text)}
+
+
+def extract_price(text):
+    """First amount of money in text as a float, or None"""
+    for found in PRICE_PATTERN.finditer(text or ''):
+        amount = found.group(1) or found.group(2)
+        if re.search(r',\d{3}', amount):
+            amount = amount.replace(',', '')  # Thousands separators
+        else:
+            amount = amount.replace(',', '.')  # Decimal comma
+        price = float(amount)
+        if 0 < price <= MAX_PRICE:
+            return price
+    return None
@@ -0,0 +1,136 @@
+import heapq
+import threading
+import time
+
+# Refresh schedule - a post is refreshed after a fraction of its age, so young posts
+# are checked every few minutes and day-old ones every couple of hours
+REFRESH_MIN_INTERVAL = 120
+REFRESH_MAX_INTERVAL = 2 * 3600
+REFRESH_AGE_FRACTION = 0.1
+TRACK_MAX_AGE = 3 * 86400  # Posts older than this are no longer refreshed
+TRACK_MAX_POSTS = 10000
+BATCH_SIZE = 100  # Fullnames per reddit.info() call, the API maximum
+BATCH_FILL_WINDOW = 60  # Posts due this many seconds early are pulled into a short batch
+TRACKED_FIELDS = ('upvotes', 'num_comments', 'removed', 'locked')
+
+_fetch = None  # list of fullnames -> {post id: {field: value}}, or None to skip this round
+_on_changes = None  # called with [{'id': ..., changed fields...}]
+_tracked = {}  # post id -> {'created': ..., 'next_refresh': ..., field: last value}
+_schedule = []  # heap of (next_refresh, post id); stale entries are skipped
+_wakeup = threading.Event()
+_thread = None
+_lock = threading.Lock()
+
+
+def configure(fetch, on_changes):
+    """Set how batches are fetched from Reddit and where changed values go"""
+    global _fetch, _on_changes
+    _fetch = fetch
+    _on_changes = on_changes
+
+
+def track(post_id, created, **values):
+    """Start refreshing a post's score and state; values are the ones already known"""
+    global _thread
+    now = time.time()
+    if now - created >= TRACK_MAX_AGE:
+        return
+    with _lock:
+        if post_id in _tracked:
+            return
+        if len(_tracked) >= TRACK_MAX_POSTS:
+            _drop_oldest()
+        entry = {'created': created}
+        entry.update((field, values.get(field)) for field in TRACKED_FIELDS)
+        _tracked[post_id] = entry
+        _reschedule(post_id, entry, now)
+        if _thread is None:
+            _thread = threading.Thread(target=_run, name='score-refresher')
+            _thread.daemon = True
+            _thread.start()
+    _wakeup.set()
+
+
+def tracked_count():
+    with _lock:
+        return len(_tracked)
+
+
+def next_interval(age):
+    """Seconds until the next refresh of a post of this age"""
+    return min(REFRESH_MAX_INTERVAL, max(REFRESH_MIN_INTERVAL, age * REFRESH_AGE_FRACTION))
+
+
+def _reschedule(post_id, entry, now):
+    entry['next_refresh'] = now + next_interval(now - entry['created'])
+    heapq.heappush(_schedule, (entry['next_refresh'], post_id))
+
+
+def _drop_oldest():
+    oldest = min(_tracked, key=lambda post_id: _tracked[post_id]['created'])
+    del _tracked[oldest]
+
+
+def _take_due(now):
+    """Pop the due posts, filling a short batch with posts that are nearly due"""
+    due = []
+    while _schedule and len(due) < BATCH_SIZE:
+        next_refresh, post_id = _schedule[0]
+        if next_refresh > now + (BATCH_FILL_WINDOW if due else 0):
+            break
+        heapq.heappop(_schedule)
+        entry = _tracked.get(post_id)
+        if entry is None or entry['next_refresh'] != next_refresh:
+            continue  # Untracked or rescheduled since
+        if now - entry['created'] >= TRACK_MAX_AGE:
+            del _tracked[post_id]
+            continue
+        due.append(post_id)
+    return due
+
+
+def _run():
+    while True:
+        if _refresh_batch():
+            continue
+        with _lock:
+            wait = (_schedule[0][0] - time.time()) if _schedule else None
+        _wakeup.wait(wait)
+        _wakeup.clear()
+
+
+def _refresh_batch():
+    """Fetch one batch of due posts and report the changed values; returns False if none were due"""
+    with _lock:
+        due = _take_due(time.time())
+    if not due:
+        return False
+
+    try:
+        results = _fetch(['t3_' + post_id for post_id in due])
+    except Exception as e:
+        print(f"Failed to refresh post scores: {str(e)}")
+        results = None
+
+    changes = []
+    with _lock:
+        now = time.time()
+        for post_id in due:
+            entry = _tracked.get(post_id)
+            if entry is None:
+                continue
+            values = (results or {}).get(post_id)
+            if values is not None:
+                changed = {field: values[field] for field in TRACKED_FIELDS
+                           if field in values and values[field] != entry[field]}
+                if changed:
+                    entry.update(changed)
+                    changes.append(dict(changed, id=post_id))
+            _reschedule(post_id, entry, now)
+
+    if changes and _on_changes:
+        try:
+            _on_changes(changes)
+        except Exception as e:
+            print(f"Failed to apply refreshed post scores: {str(e)}")
+    return True
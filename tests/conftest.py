@@ -0,0 +1,36 @@
+import os
+import sys
+from collections import OrderedDict
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """main with its data files in a temporary directory and no frontend"""
+    monkeypatch.chdir(tmp_path)
+    import main
+    import background_writer
+    import feed_store
+    import score_refresher
+    monkeypatch.setattr(main, 'posts_db', None)
+    monkeypatch.setattr(main, 'watched_subreddits', {})
+    # State loaded from data files on first use, so each test starts from its own directory
+    monkeypatch.setattr(main, 'seen_generations', None)
+    monkeypatch.setattr(main, 'completed_posts', None)
+    monkeypatch.setattr(main, 'completed_journal_length', 0)
+    monkeypatch.setattr(main, 'post_media', OrderedDict())
+    monkeypatch.setattr(score_refresher, '_tracked', {})
+    monkeypatch.setattr(score_refresher, '_schedule', [])
+    # A placeholder thread keeps track() from starting the refresher; tests run batches themselves
+    monkeypatch.setattr(score_refresher, '_thread', object())
+    feed_store.clear()
+    yield main
+    # Queued writes go to this test's directory and database
+    background_writer.flush()
+    feed_store.clear()
+    if main.posts_db is not None:
+        main.posts_db.close()
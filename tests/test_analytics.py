@@ -0,0 +1,205 @@
+"""The SQL analytics path returns what a full recompute over every stored post returns"""
+import random
+import time
+from datetime import datetime
+
+import pytest
+
+FLAIRS = ['Paid', 'Free', 'Paid - Urgent', 'Free Request', None, 'Discussion']
+TAGS = ['urgent', 'restore', 'memorial']
+
+
+def full_recompute(posts):
+    """The dashboard analytics as the original log-based version computed them, one pass per metric"""
+    total_posts = len(posts)
+    paid_posts = sum(1 for p in posts if p['post_type'] == 'PAID')
+    free_posts = sum(1 for p in posts if p['post_type'] == 'FREE')
+    other_posts = sum(1 for p in posts if p['post_type'] == 'OTHER')
+
+    hourly_distribution = [0] * 24
+    hour_counts = {}
+    for post in posts:
+        hourly_distribution[post['post_hour']] += 1
+        hour_counts[post['post_hour']] = hour_counts.get(post['post_hour'], 0) + 1
+
+    weekday_counts = {}
+    for post in posts:
+        weekday_counts[post['post_weekday']] = weekday_counts.get(post['post_weekday'], 0) + 1
+
+    daily_posts = {}
+    for post in posts:
+        daily_posts[post['post_date']] = daily_posts.get(post['post_date'], 0) + 1
+
+    author_counts = {}
+    for post in posts:
+        author_counts[post['author']] = author_counts.get(post['author'], 0) + 1
+    top_authors = dict(sorted(author_counts.items(), key=lambda x: x[1], reverse=True)[:10])
+
+    total_upvotes = sum(p['upvotes'] for p in posts)
+    paid_upvotes = sum(p['upvotes'] for p in posts if p['post_type'] == 'PAID')
+    free_upvotes = sum(p['upvotes'] for p in posts if p['post_type'] == 'FREE')
+    avg_upvotes = total_upvotes / total_posts if total_posts > 0 else 0
+    paid_avg_upvotes = paid_upvotes / paid_posts if paid_posts > 0 else 0
+    free_avg_upvotes = free_upvotes / free_posts if free_posts > 0 else 0
+
+    avg_title_length = sum(p['title_length'] for p in posts) / total_posts if total_posts > 0 else 0
+    avg_description_length = sum(p['description_length'] for p in posts) / total_posts if total_posts > 0 else 0
+
+    posting_trends = []
+    for date in sorted(daily_posts.keys()):
+        posting_trends.append({
+            'date': date,
+            'posts': daily_posts[date],
+            'paid': sum(1 for p in posts if p['post_date'] == date and p['post_type'] == 'PAID'),
+            'free': sum(1 for p in posts if p['post_date'] == date and p['post_type'] == 'FREE')
+        })
+
+    return {
+        "total_posts": total_posts,
+        "paid_posts": paid_posts,
+        "free_posts": free_posts,
+        "other_posts": other_posts,
+        "paid_percentage": round((paid_posts / total_posts * 100), 1) if total_posts > 0 else 0,
+        "free_percentage": round((free_posts / total_posts * 100), 1) if total_posts > 0 else 0,
+        "peak_hours": hour_counts,
+        "weekday_distribution": weekday_counts,
+        "hourly_distribution": hourly_distribution,
+        "daily_posts": daily_posts,
+        "avg_title_length": round(avg_title_length, 1),
+        "avg_description_length": round(avg_description_length, 1),
+        "most_active_hour": max(hour_counts.items(), key=lambda x: x[1])[0] if hour_counts else 0,
+        "most_active_day": max(weekday_counts.items(), key=lambda x: x[1])[0] if weekday_counts else "Unknown",
+        "top_authors": top_authors,
+        "posting_trends": posting_trends,
+        "engagement_metrics": {
+            "avg_upvotes": round(avg_upvotes, 1),
+            "paid_avg_upvotes": round(paid_avg_upvotes, 1),
+            "free_avg_upvotes": round(free_avg_upvotes, 1)
+        }
+    }
+
+
+def random_entries(app, seed, count, distinct_posts):
+    """Analytics records of count detections of distinct_posts posts, so many posts are seen twice or more"""
+    rng = random.Random(seed)
+    now = time.time()
+    posts = {}
+    entries = []
+    for _ in range(count):
+        post_id = f"p{rng.randrange(distinct_posts)}"
+        if post_id not in posts:
+            posts[post_id] = {
+                'id': post_id,
+                'title': 'x' * rng.randint(5, 150),
+                'description': 'y' * rng.randint(0, 800),
+                'author': f"user{rng.randrange(25)}",
+                'flair': rng.choice(FLAIRS),
+                'created': now - rng.uniform(0, 20 * 86400),
+                'tags': rng.sample(TAGS, rng.randint(0, 2)),
+                'price': rng.choice([None, None, 5.0, 20.0, 49.99])
+            }
+        # A post seen again comes with its current score, comments, price and tags
+        post_data = dict(posts[post_id], upvotes=rng.randint(0, 200), num_comments=rng.randint(0, 30))
+        if rng.random() < 0.2:
+            post_data.update(price=rng.choice([None, 10.0, 35.0]), tags=rng.sample(TAGS, rng.randint(0, 2)))
+        entries.append(app.build_analytics_entry(post_data, 'PhotoshopRequest', 'LIVE'))
+    return entries
+
+
+def stored_rows(entries):
+    """One row per post: the first detection, with the score, comments, price and tags of the latest one"""
+    rows = {}
+    for entry in entries:
+        if entry['post_id'] in rows:
+            rows[entry['post_id']].update({field: entry[field] for field in ('upvotes', 'num_comments', 'price', 'tags')})
+        else:
+            rows[entry['post_id']] = dict(entry)
+    return list(rows.values())
+
+
+def store_in_batches(app, entries, seed):
+    rng = random.Random(seed)
+    position = 0
+    while position < len(entries):
+        size = rng.randint(1, 300)
+        app.store_analytics_entries(entries[position:position + size])
+        position += size
+
+
+def assert_same_analytics(analytics, expected):
+    for key, value in expected.items():
+        assert analytics[key] == value, key
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_matches_full_recompute(app, seed):
+    entries = random_entries(app, seed, count=1500, distinct_posts=600)
+    store_in_batches(app, entries, seed)
+
+    result = app.get_posts_analytics()
+
+    assert result['status'] == 'success'
+    rows = stored_rows(entries)
+    assert result['analytics']['total_posts'] == len(rows) < len(entries)
+    assert_same_analytics(result['analytics'], full_recompute(rows))
+
+
+def test_matches_full_recompute_with_filters(app):
+    entries = random_entries(app, 11, count=1200, distinct_posts=500)
+    store_in_batches(app, entries, 11)
+    start = datetime.fromtimestamp(time.time() - 10 * 86400).strftime('%Y-%m-%d')
+    end = datetime.fromtimestamp(time.time() - 3 * 86400).strftime('%Y-%m-%d')
+    end_bound = datetime.strptime(end, '%Y-%m-%d').timestamp() + 86400
+
+    result = app.get_posts_analytics(start, end, {'post_type': 'PAID'})
+
+    rows = [
+        row for row in stored_rows(entries)
+        if row['post_type'] == 'PAID'
+        and datetime.strptime(start, '%Y-%m-%d').timestamp() <= row['created_utc'] < end_bound
+    ]
+    assert result['analytics']['total_posts'] == len(rows) > 0
+    assert_same_analytics(result['analytics'], full_recompute(rows))
+
+
+def test_duplicate_post_is_counted_once_with_latest_score(app):
+    post_data = {'id': 'abc', 'title': 'Edit please', 'description': '', 'author': 'someone',
+                 'flair': 'Paid', 'created': time.time() - 3600, 'upvotes': 1}
+    app.store_analytics_entries([app.build_analytics_entry(post_data, 'PhotoshopRequest', 'LIVE')])
+    app.store_analytics_entries([app.build_analytics_entry(dict(post_data, upvotes=9), 'PhotoshopRequest', 'LIVE')])
+
+    analytics = app.get_posts_analytics()['analytics']
+
+    assert analytics['total_posts'] == analytics['paid_posts'] == 1
+    assert analytics['engagement_metrics']['avg_upvotes'] == 9
+
+
+def test_post_seen_again_takes_latest_price_and_tags(app):
+    post_data = {'id': 'abc', 'title': 'Edit please', 'description': '', 'author': 'someone', 'flair': 'Paid',
+                 'created': time.time() - 3600, 'upvotes': 1, 'num_comments': 0, 'price': 5.0, 'tags': ['urgent']}
+    app.store_analytics_entries([app.build_analytics_entry(post_data, 'PhotoshopRequest', 'LIVE')])
+    edited = dict(post_data, num_comments=4, price=20.0, tags=['restore', 'memorial'])
+    app.store_analytics_entries([app.build_analytics_entry(edited, 'PhotoshopRequest', 'LIVE')])
+
+    def total(filters):
+        return app.get_posts_analytics(filters=filters)['analytics']['total_posts']
+
+    assert total({'tag': 'urgent'}) == 0
+    assert total({'tag': 'restore'}) == total({'tag': 'memorial'}) == 1
+    assert total({'min_price': 10}) == 1
+    assert total({'max_price': 10}) == 0
+    assert app.get_posts_db().execute('SELECT num_comments FROM posts').fetchall() == [(4,)]
+
+
+def test_filters_match_latest_tags_and_price(app):
+    entries = random_entries(app, 5, count=1500, distinct_posts=400)
+    store_in_batches(app, entries, 5)
+    rows = stored_rows(entries)
+
+    for filters, keep in [
+        ({'tag': 'urgent'}, lambda row: 'urgent' in row['tags']),
+        ({'min_price': 10}, lambda row: row['price'] is not None and row['price'] >= 10),
+        ({'max_price': 20}, lambda row: row['price'] is not None and row['price'] <= 20)
+    ]:
+        expected = [row for row in rows if keep(row)]
+        assert_same_analytics(app.get_posts_analytics(filters=filters)['analytics'], full_recompute(expected))
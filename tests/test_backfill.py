@@ -0,0 +1,133 @@
+"""An interrupted backfill resumes from its checkpoint without missing or repeating posts"""
+import json
+import os
+
+import pytest
+
+import backfill
+
+POSTS = 3000
+
+
+class Interrupted(Exception):
+    pass
+
+
+def write_dump(path, compress=False):
+    """NDJSON submissions of two subreddits, with a few unreadable lines; returns the ids to import"""
+    lines = []
+    wanted = []
+    for number in range(POSTS):
+        subreddit = 'PhotoshopRequest' if number % 3 else 'pics'
+        record = {'id': f"b{number:05d}", 'subreddit': subreddit, 'title': f"Edit photo {number}",
+                  'author': f"user{number % 40}", 'created_utc': 1600000000 + number * 60,
+                  'link_flair_text': 'Paid' if number % 2 else 'Free', 'selftext': 'x' * (number % 50),
+                  'score': number % 30}
+        lines.append(json.dumps(record).encode('utf-8'))
+        if subreddit == 'PhotoshopRequest':
+            wanted.append(record['id'])
+        if number % 500 == 250:
+            lines.append(b'{"subreddit": "PhotoshopRequest", "title": "cut off')
+    data = b'\n'.join(lines) + b'\n'
+    if compress:
+        zstandard = pytest.importorskip('zstandard')
+        data = zstandard.ZstdCompressor().compress(data)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return set(wanted)
+
+
+@pytest.fixture(params=['ndjson', 'zst'])
+def dump(app, tmp_path, monkeypatch, request):
+    """A dump read in small chunks and stored in small batches, so it takes several checkpoints"""
+    monkeypatch.setattr(backfill, 'CHUNK_BYTES', 16 * 1024)
+    monkeypatch.setattr(backfill, 'INSERT_BATCH_SIZE', 300)
+    path = str(tmp_path / f"RS_test.{request.param}")
+    wanted = write_dump(path, compress=request.param == 'zst')
+    return path, wanted
+
+
+@pytest.fixture
+def stored(monkeypatch):
+    """Post ids passed to store_batch, per call"""
+    batches = []
+    store_batch = backfill.store_batch
+
+    def recording_store_batch(path, records, offset, done=False):
+        store_batch(path, records, offset, done)
+        batches.append([record['post_id'] for record in records])
+
+    monkeypatch.setattr(backfill, 'store_batch', recording_store_batch)
+    return batches
+
+
+def run(path, *options):
+    return backfill.run(backfill.parse_args([path, '--subreddits', 'PhotoshopRequest', *options]))
+
+
+def post_ids(app):
+    return [row[0] for row in app.get_posts_db().execute('SELECT post_id FROM posts')]
+
+
+def interrupt_after_first_batch(monkeypatch):
+    store_batch = backfill.store_batch
+    calls = []
+
+    def interrupting_store_batch(*args, **kwargs):
+        if calls:
+            raise Interrupted()
+        calls.append(args)
+        store_batch(*args, **kwargs)
+
+    monkeypatch.setattr(backfill, 'store_batch', interrupting_store_batch)
+
+
+@pytest.mark.parametrize('workers', ['1', '2'])
+def test_interrupted_backfill_resumes(app, dump, stored, monkeypatch, workers):
+    path, wanted = dump
+    with monkeypatch.context() as patch:
+        interrupt_after_first_batch(patch)
+        with pytest.raises(Interrupted):
+            run(path, '--workers', workers)
+    first_run = set(post_ids(app))
+    assert 0 < len(first_run) < len(wanted)
+
+    imported = run(path, '--workers', workers)
+
+    assert imported == len(wanted) - len(first_run)
+    ids = post_ids(app)
+    assert sorted(ids) == sorted(wanted)
+    # Every post was stored by exactly one run
+    stored_ids = [post_id for batch in stored for post_id in batch]
+    assert sorted(stored_ids) == sorted(wanted)
+    checkpoint = backfill.get_checkpoint(os.path.abspath(path))
+    assert checkpoint['done'] and checkpoint['imported'] == len(wanted)
+
+
+def test_finished_dump_is_skipped(app, dump, stored):
+    path, wanted = dump
+    assert run(path, '--workers', '1') == len(wanted)
+    batches = len(stored)
+
+    assert run(path, '--workers', '1') == 0
+    assert len(stored) == batches
+
+
+def test_restart_imports_the_dump_again(app, dump, stored):
+    path, wanted = dump
+    run(path, '--workers', '1')
+    stored.clear()
+
+    assert run(path, '--workers', '1', '--restart') == len(wanted)
+    assert sorted(post_id for batch in stored for post_id in batch) == sorted(wanted)
+    assert sorted(post_ids(app)) == sorted(wanted)
+    assert backfill.get_checkpoint(os.path.abspath(path))['imported'] == len(wanted)
+
+
+def test_changed_dump_is_imported_from_the_start(app, dump, stored):
+    path, wanted = dump
+    run(path, '--workers', '1')
+    os.utime(path, (1, 1))
+    stored.clear()
+
+    assert run(path, '--workers', '1') == len(wanted)
@@ -0,0 +1,75 @@
+"""Completion changes are journaled, compacted into the snapshot and replayed on the next launch"""
+import json
+import os
+
+import background_writer
+
+
+def restart(app, monkeypatch):
+    """Forget the in-memory completion state, like a new launch"""
+    background_writer.flush()
+    monkeypatch.setattr(app, 'completed_posts', None)
+    monkeypatch.setattr(app, 'completed_journal_length', 0)
+    return set(app.load_completed_posts())
+
+
+def journal_lines():
+    with open('completed_posts.journal', encoding='utf-8') as f:
+        return f.read().splitlines()
+
+
+def test_changes_are_replayed_from_the_journal(app, monkeypatch):
+    for post_id in ('a', 'b', 'c'):
+        app.mark_completed(post_id)
+    app.unmark_completed('b')
+    background_writer.flush()
+
+    assert journal_lines() == ['+a', '+b', '+c', '-b']
+    assert not os.path.exists(app.COMPLETED_POSTS_FILE)
+    assert restart(app, monkeypatch) == {'a', 'c'}
+
+
+def test_journal_is_compacted_into_the_snapshot(app, monkeypatch):
+    expected = set()
+    for number in range(app.COMPLETED_COMPACT_EVERY + 10):
+        post_id = f"p{number % 700}"
+        # Posts are marked and unmarked, so the snapshot must hold the latest state
+        if post_id in expected:
+            app.unmark_completed(post_id)
+            expected.discard(post_id)
+        else:
+            app.mark_completed(post_id)
+            expected.add(post_id)
+    background_writer.flush()
+
+    # Compacted once, at COMPLETED_COMPACT_EVERY lines; later changes are in the journal
+    with open(app.COMPLETED_POSTS_FILE, encoding='utf-8') as f:
+        assert json.load(f)['completed_posts']
+    assert len(journal_lines()) < app.COMPLETED_COMPACT_EVERY
+    assert restart(app, monkeypatch) == expected
+
+    # Compacting again after the restart keeps the same state
+    app.compact_completed_posts()
+    assert journal_lines() == []
+    assert restart(app, monkeypatch) == expected
+
+
+def test_partially_written_last_line_is_dropped(app, monkeypatch):
+    # The app crashed while appending '+abc123'
+    with open(app.COMPLETED_JOURNAL_FILE, 'w', encoding='utf-8') as f:
+        f.write('+x1\n+x2\n-x1\n+abc1')
+
+    assert restart(app, monkeypatch) == {'x2'}
+
+    # Later changes start on a line of their own
+    app.mark_completed('y1')
+    assert restart(app, monkeypatch) == {'x2', 'y1'}
+    assert journal_lines() == ['+x1', '+x2', '-x1', '+y1']
+
+
+def test_save_completed_posts_replaces_the_set(app, monkeypatch):
+    app.mark_completed('old')
+    app.save_completed_posts(['n1', 'n2'])
+    app.mark_completed('n3')
+
+    assert restart(app, monkeypatch) == {'n1', 'n2', 'n3'}
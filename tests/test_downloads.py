@@ -0,0 +1,183 @@
+"""Download engine: cache skips, resumable .part files and revalidation against a local server"""
+import os
+
+import pytest
+
+import downloads
+from benchmarks import image_server
+
+SIZE = 300 * 1024  # Several CHUNK_SIZE chunks
+
+
+class Interrupted(Exception):
+    pass
+
+
+@pytest.fixture(scope='module')
+def server():
+    server, base_url = image_server.start()
+    yield server, base_url
+    server.shutdown()
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """A fresh download cache in a temporary directory"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(downloads, '_cache_db', None)
+    monkeypatch.setattr(downloads, '_on_saved', None)
+    directory = tmp_path / 'images'
+    directory.mkdir()
+    yield directory
+    if downloads._cache_db is not None:
+        downloads._cache_db.close()
+
+
+def url(base_url, name, size=SIZE):
+    return f"{base_url}/{name}.jpg?size={size}"
+
+
+def read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def interrupt_after(chunks):
+    """A progress callback that aborts the download after a number of chunks"""
+    seen = []
+
+    def progress(size):
+        seen.append(size)
+        if len(seen) == chunks:
+            raise Interrupted()
+    return progress
+
+
+def requests_for(server, name):
+    return [request for request in server.requests if request['path'] == f"/{name}.jpg"]
+
+
+def test_completed_download_is_skipped(server, cache):
+    server, base_url = server
+    first = downloads.download_file(url(base_url, 'skip'), cache)
+    again = downloads.download_file(url(base_url, 'skip'), cache)
+
+    assert first['status'] == 'success'
+    assert read(first['path']) == image_server.image_body('/skip.jpg', SIZE)
+    assert again == dict(first, status='cached', bytes=0)
+    assert len(requests_for(server, 'skip')) == 1
+
+
+def test_same_content_under_another_url_reuses_the_file(server, cache):
+    server, base_url = server
+    first = downloads.download_file(url(base_url, 'same'), cache, 'first')
+    second = downloads.download_file(url(base_url, 'same') + '&from=gallery', cache, 'second')
+
+    assert second['status'] == 'success'
+    assert second['path'] == first['path']
+    assert sorted(os.listdir(cache)) == ['first.jpg']
+
+
+def test_interrupted_download_resumes_with_range(server, cache):
+    server, base_url = server
+    failed = downloads.download_file(url(base_url, 'resume'), cache, progress=interrupt_after(2))
+    assert failed['status'] == 'error'
+    part_size = os.path.getsize(cache / 'resume.part')
+    assert 0 < part_size < SIZE
+
+    result = downloads.download_file(url(base_url, 'resume'), cache)
+
+    assert result['status'] == 'success'
+    assert result['bytes'] == SIZE - part_size
+    assert requests_for(server, 'resume')[-1] == {'path': '/resume.jpg', 'range': f"bytes={part_size}-", 'status': 206}
+    assert read(result['path']) == image_server.image_body('/resume.jpg', SIZE)
+    assert not os.path.exists(cache / 'resume.part')
+
+
+def test_changed_file_is_downloaded_again_in_full(server, cache):
+    server, base_url = server
+    downloads.download_file(url(base_url, 'changed'), cache, progress=interrupt_after(2))
+    server.versions['/changed.jpg'] = 1
+
+    result = downloads.download_file(url(base_url, 'changed'), cache)
+
+    # If-Range no longer matches, so the server sends the new file instead of a range
+    assert requests_for(server, 'changed')[-1]['status'] == 200
+    assert result['bytes'] == SIZE
+    assert read(result['path']) == image_server.image_body('/changed.jpg', SIZE, version=1)
+
+
+def test_revalidate_unchanged_file_gets_304(server, cache):
+    server, base_url = server
+    first = downloads.download_file(url(base_url, 'fresh'), cache)
+
+    result = downloads.download_file(url(base_url, 'fresh'), cache, revalidate=True)
+
+    assert result['status'] == 'cached' and result['path'] == first['path']
+    assert requests_for(server, 'fresh')[-1]['status'] == 304
+
+
+def test_revalidate_changed_file_replaces_it(server, cache):
+    server, base_url = server
+    first = downloads.download_file(url(base_url, 'stale'), cache)
+    server.versions['/stale.jpg'] = 1
+
+    result = downloads.download_file(url(base_url, 'stale'), cache, revalidate=True)
+
+    assert result['status'] == 'success' and result['path'] == first['path']
+    assert read(result['path']) == image_server.image_body('/stale.jpg', SIZE, version=1)
+
+
+def crash_before_rename(monkeypatch, server, base_url, cache, name):
+    """Download a file but fail the final rename, leaving a complete .part file"""
+    def fail(*args):
+        raise OSError('crashed')
+    with monkeypatch.context() as patch:
+        patch.setattr(downloads.os, 'replace', fail)
+        assert downloads.download_file(url(base_url, name), cache)['status'] == 'error'
+    assert os.path.getsize(cache / f"{name}.part") == SIZE
+
+
+def test_complete_part_file_is_finished_without_a_request(server, cache, monkeypatch):
+    server, base_url = server
+    crash_before_rename(monkeypatch, server, base_url, cache, 'crashed')
+
+    result = downloads.download_file(url(base_url, 'crashed'), cache)
+
+    assert result['status'] == 'success'
+    assert len(requests_for(server, 'crashed')) == 1
+    assert read(result['path']) == image_server.image_body('/crashed.jpg', SIZE)
+
+
+def forget_size(cache, name):
+    """Drop the recorded size, like entries written before sizes were recorded"""
+    conn = downloads.get_cache_db()
+    conn.execute('UPDATE downloads SET size = NULL WHERE path IS NULL AND url LIKE ?', (f"%/{name}.jpg%",))
+    conn.commit()
+
+
+def test_complete_part_file_is_finished_after_416(server, cache, monkeypatch):
+    server, base_url = server
+    crash_before_rename(monkeypatch, server, base_url, cache, 'range416')
+    forget_size(cache, 'range416')
+
+    result = downloads.download_file(url(base_url, 'range416'), cache)
+
+    assert requests_for(server, 'range416')[-1] == {'path': '/range416.jpg', 'range': f"bytes={SIZE}-", 'status': 416}
+    assert result['status'] == 'success'
+    assert read(result['path']) == image_server.image_body('/range416.jpg', SIZE)
+    assert not os.path.exists(cache / 'range416.part')
+
+
+def test_oversized_part_file_is_fetched_again_after_416(server, cache, monkeypatch):
+    server, base_url = server
+    crash_before_rename(monkeypatch, server, base_url, cache, 'garbled')
+    forget_size(cache, 'garbled')
+    with open(cache / 'garbled.part', 'ab') as f:
+        f.write(b'junk')
+
+    result = downloads.download_file(url(base_url, 'garbled'), cache)
+
+    assert [request['status'] for request in requests_for(server, 'garbled')[-2:]] == [416, 200]
+    assert result['status'] == 'success'
+    assert read(result['path']) == image_server.image_body('/garbled.jpg', SIZE)
@@ -0,0 +1,160 @@
+"""Feed pages from the indexes match sorting and filtering a plain list of the posts"""
+import itertools
+import random
+
+import pytest
+
+import feed_store
+
+FLAIRS = {'Paid': 'paid', 'Paid - Urgent': 'paid', 'Free': 'free', 'Discussion': 'other', None: 'other'}
+SUBREDDITS = ['PhotoshopRequest', 'picrequests']
+FILTERS = [
+    {key: value for key, value in zip(('post_type', 'completed', 'subreddit', 'tag'), combination) if value is not None}
+    for combination in itertools.product([None, 'paid', 'free', 'other'], [None, True, False],
+                                         [None, 'photoshoprequest'], [None, 'urgent'])
+]
+PRIMARY_KEYS = {
+    'most_upvoted': lambda post: -post['upvotes'],
+    'least_upvoted': lambda post: post['upvotes'],
+    'paid_first': lambda post: FLAIRS[post['flair']] != 'paid',
+    'free_first': lambda post: FLAIRS[post['flair']] != 'free'
+}
+
+
+class Feed:
+    """Posts added to the feed, kept as a plain list to check pages against"""
+
+    def __init__(self, app, seed):
+        self.app = app
+        self.rng = random.Random(seed)
+        self.posts = {}
+        self.completed = set()
+        self.numbers = itertools.count()
+
+    def add(self, count, created=None):
+        added = []
+        for _ in range(count):
+            post = {
+                'id': f"p{next(self.numbers):04d}",
+                # Few distinct times and scores, so every sort has ties
+                'created': created if created is not None else 1700000000 + self.rng.randrange(40) * 60,
+                'upvotes': self.rng.randrange(6),
+                'flair': self.rng.choice(list(FLAIRS)),
+                'tags': self.rng.sample(['urgent', 'restore'], self.rng.randint(0, 2))
+            }
+            subreddit = self.rng.choice(SUBREDDITS)
+            assert feed_store.add(post, subreddit)
+            self.posts[post['id']] = dict(post, subreddit=subreddit)
+            added.append(post['id'])
+        return added
+
+    def set_completed(self, post_id, completed):
+        self.app.record_completion(post_id, completed)
+        (self.completed.add if completed else self.completed.discard)(post_id)
+
+    def expected(self, filters, sort):
+        """Every matching post, in page order"""
+        posts = [post for post in self.posts.values() if self.matches(post, filters)]
+        if sort == 'newest':
+            return [post['id'] for post in sorted(posts, key=lambda post: (post['created'], post['id']), reverse=True)]
+        if sort == 'oldest':
+            return [post['id'] for post in sorted(posts, key=lambda post: (post['created'], post['id']))]
+        primary = PRIMARY_KEYS[sort]
+        # Ties newest first
+        return [post['id'] for post in sorted(posts, key=lambda post: (primary(post), -post['created'], post['id']))]
+
+    def matches(self, post, filters):
+        if 'post_type' in filters and FLAIRS[post['flair']] != filters['post_type']:
+            return False
+        if 'completed' in filters and (post['id'] in self.completed) != filters['completed']:
+            return False
+        if 'subreddit' in filters and post['subreddit'].lower() != filters['subreddit']:
+            return False
+        return 'tag' not in filters or filters['tag'] in post['tags']
+
+    def query(self, filters, sort, cursor=None, limit=25):
+        page = self.app.query_posts(filters, sort, cursor, limit)
+        assert page['status'] == 'success'
+        for post in page['posts']:
+            assert post['completed'] == (post['id'] in self.completed)
+        return page
+
+
+@pytest.fixture
+def feed(app):
+    return Feed(app, seed=7)
+
+
+def all_pages(feed, filters, sort, limit):
+    ids = []
+    cursor = None
+    while True:
+        page = feed.query(filters, sort, cursor, limit)
+        ids.extend(post['id'] for post in page['posts'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            return ids, page['total']
+
+
+def test_pages_match_sorted_filtered_list(feed):
+    feed.add(300)
+    for post_id in feed.rng.sample(sorted(feed.posts), 30):
+        feed.set_completed(post_id, True)
+
+    for sort in feed_store.SORTS:
+        for filters in FILTERS:
+            ids, total = all_pages(feed, filters, sort, limit=25)
+            expected = feed.expected(filters, sort)
+            assert ids == expected, (sort, filters)
+            assert total == len(expected), (sort, filters)
+
+
+@pytest.mark.parametrize('sort', list(feed_store.SORTS))
+def test_cursor_is_stable_while_posts_arrive(feed, sort):
+    feed.add(200)
+    filters = {'post_type': 'paid'}
+    seen = []
+    page = feed.query(filters, sort, limit=20)
+    while True:
+        seen.extend(post['id'] for post in page['posts'])
+        if page['next_cursor'] is None:
+            break
+        # New posts, some tying with posts already paged past
+        feed.add(15)
+        feed.add(5, created=feed.posts[seen[-1]]['created'])
+        page = feed.query(filters, sort, page['next_cursor'], limit=20)
+        # The next page continues right after the last post shown, in the current order
+        expected = feed.expected(filters, sort)
+        following = expected[expected.index(seen[-1]) + 1:]
+        assert [post['id'] for post in page['posts']] == following[:20]
+
+    assert len(seen) == len(set(seen))
+
+
+def test_updates_move_posts_between_indexes(feed):
+    feed.add(120)
+    rng = feed.rng
+    for post_id in rng.sample(sorted(feed.posts), 40):
+        changes = {'upvotes': rng.randrange(100), 'flair': rng.choice(list(FLAIRS))}
+        assert feed_store.update(post_id, **changes)
+        feed.posts[post_id].update(changes)
+    for post_id in rng.sample(sorted(feed.posts), 30):
+        feed.set_completed(post_id, True)
+    for post_id in rng.sample(sorted(feed.completed), 10):
+        feed.set_completed(post_id, False)
+
+    for sort in feed_store.SORTS:
+        for filters in FILTERS:
+            ids, total = all_pages(feed, filters, sort, limit=feed_store.FEED_MAX_PAGE_SIZE)
+            assert ids == feed.expected(filters, sort), (sort, filters)
+            assert total == len(ids)
+
+
+def test_post_completed_before_it_arrives_is_indexed_as_completed(feed):
+    feed.set_completed('p0000', True)
+    feed.add(50)
+
+    page = feed.query({'completed': True}, 'newest')
+
+    assert [post['id'] for post in page['posts']] == ['p0000']
+    assert page['total'] == 1
@@ -0,0 +1,98 @@
+"""Multi-index hash search finds what a linear Hamming scan finds, off the hash pool's result thread"""
+import array
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import image_index
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    """An empty image index in a temporary directory"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(image_index, '_db', None)
+    monkeypatch.setattr(image_index, '_hashes', array.array('Q'))
+    monkeypatch.setattr(image_index, '_rowids', array.array('q'))
+    monkeypatch.setattr(image_index, '_tables', None)
+    monkeypatch.setattr(image_index, '_hash_pool', None)
+    monkeypatch.setattr(image_index, '_index_pool', None)
+    monkeypatch.setattr(image_index, '_on_match', None)
+    yield
+    for pool in (image_index._hash_pool, image_index._index_pool):
+        if pool is not None:
+            pool.shutdown(wait=True)
+    if image_index._db is not None:
+        image_index._db.close()
+
+
+def flip(value, bits, rng):
+    for bit in rng.sample(range(64), bits):
+        value ^= 1 << bit
+    return value
+
+
+def test_search_equals_linear_scan(index):
+    rng = random.Random(9)
+    bases = [rng.getrandbits(64) for _ in range(10)]
+    stored = {}
+    for number in range(3000):
+        # Most hashes are variations of a few photos, at every distance around the threshold
+        value = flip(rng.choice(bases), rng.randint(0, 12), rng) if number % 3 else rng.getrandbits(64)
+        stored[f"post{number}"] = value
+        image_index.add(value, f"post{number}", f"{number}.jpg")
+    queries = [flip(rng.choice(bases), rng.randint(0, 10), rng) for _ in range(100)]
+    queries += [rng.getrandbits(64) for _ in range(10)] + [0, (1 << 64) - 1]
+
+    found = 0
+    for query in queries:
+        # The linear scan: every stored hash, closest first
+        distances = sorted((image_index.hamming(query, value), post_id) for post_id, value in stored.items())
+        for max_distance in (0, 3, image_index.MATCH_DISTANCE, 7, 9):
+            matches = image_index.search(query, max_distance)
+            assert sorted((match['distance'], match['post_id']) for match in matches) == \
+                [match for match in distances if match[0] <= max_distance]
+            found += len(matches)
+    assert found > 0
+
+
+def test_search_survives_reload(index):
+    image_index.add(0x0123456789ABCDEF, 'a', 'a.jpg')
+    image_index.add(0xFEDCBA9876543210, 'b', 'b.jpg')
+    image_index._tables = None
+    del image_index._hashes[:], image_index._rowids[:]
+
+    assert [match['post_id'] for match in image_index.search(0x0123456789ABCDEF ^ 0b101)] == ['a']
+    assert [match['post_id'] for match in image_index.search(0xFEDCBA9876543210, exclude_post='b')] == []
+
+
+def test_matches_are_handled_off_the_result_thread(index, monkeypatch):
+    # A one-thread pool stands in for the process pool: its done callbacks run on its only thread
+    hash_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='hash-results')
+    monkeypatch.setattr(image_index, 'find_spec', lambda name: object())
+    monkeypatch.setattr(image_index, 'ProcessPoolExecutor', lambda max_workers: hash_pool)
+    monkeypatch.setattr(image_index, 'dhash', lambda path: 0x0123456789ABCDEF)
+    reported = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def on_match(post_id, matches):
+        reported.append((post_id, threading.current_thread().name, [match['post_id'] for match in matches]))
+        started.set()
+        release.wait(10)
+
+    image_index.configure(on_match)
+    image_index.add(0x0123456789ABCDEF, 'earlier', 'earlier.jpg')
+    image_index.index_file('first', 'first.jpg')
+    assert started.wait(10)
+
+    # While the match is being reported, finished hashes still come through
+    assert hash_pool.submit(lambda: 'free').result(timeout=5) == 'free'
+    release.set()
+    image_index._index_pool.shutdown(wait=True)
+
+    assert reported == [('first', reported[0][1], ['earlier'])]
+    assert reported[0][1].startswith('image-index')
+    assert image_index.count() == 2
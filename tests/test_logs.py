@@ -0,0 +1,76 @@
+"""Paging back through the activity log returns every entry once, even when the log rotates between pages"""
+import itertools
+
+import pytest
+
+PAGE = 25
+
+
+@pytest.fixture
+def log(app, monkeypatch):
+    """Write entries straight to a small, quickly rotating log"""
+    monkeypatch.setattr(app, 'LOGS_MAX_BYTES', 2000)
+    monkeypatch.setattr(app, 'LOGS_BACKUPS', 5)
+    numbers = itertools.count()
+
+    def write(count):
+        entries = [{'time': '12:00:00', 'type': 'info', 'message': f"entry {next(numbers)}"}
+                   for _ in range(count)]
+        for entry in entries:
+            app.write_log_entries([entry])
+        return [entry['message'] for entry in entries]
+
+    return write
+
+
+def page(app, cursor=None):
+    result = app.load_logs_from_file(PAGE, cursor)
+    assert result['status'] == 'success'
+    return [entry['message'] for entry in result['entries']], result['cursor']
+
+
+def test_pages_cover_every_file(app, log):
+    written = log(400)
+
+    shown, cursor = page(app)
+    while cursor:
+        older, cursor = page(app, cursor)
+        assert len(older) == PAGE or cursor is None
+        shown = older + shown
+
+    # Only the current log and LOGS_BACKUPS backups are kept
+    assert shown == written[-len(shown):]
+    assert 100 < len(shown) < 400
+
+
+def test_cursor_is_stable_across_rotation(app, log):
+    written = log(60)
+    shown, cursor = page(app)
+
+    while cursor:
+        # New entries rotate the files between every two pages
+        log(30)
+        older, cursor = page(app, cursor)
+        shown = older + shown
+
+    assert shown == written[-len(shown):]
+    assert len(shown) == len(set(shown))
+    assert shown[-PAGE:] == written[-PAGE:]
+
+
+def test_cursor_of_a_dropped_file_ends_the_history(app, log):
+    log(200)
+    _, cursor = page(app)
+    # Enough entries that the file under the cursor is rotated out
+    log(400)
+
+    assert page(app, cursor) == ([], None)
+
+
+def test_cursor_does_not_carry_over_to_a_cleared_log(app, log):
+    log(200)
+    _, cursor = page(app)
+    app.clear_logs()
+    log(200)
+
+    assert page(app, cursor) == ([], None)
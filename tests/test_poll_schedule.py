@@ -0,0 +1,93 @@
+"""Retry backoff, adaptive intervals, rate limit stretching and error classification"""
+import time
+
+import pytest
+
+BACKOFF_MAX = 15 * 60
+
+
+@pytest.mark.parametrize('failures, nominal', [
+    (1, 5), (2, 10), (3, 20), (4, 40), (5, 80), (6, 160), (7, 320), (8, 640),
+    (9, BACKOFF_MAX), (10, BACKOFF_MAX), (50, BACKOFF_MAX), (1000, BACKOFF_MAX)
+])
+def test_backoff_doubles_up_to_15_minutes(app, monkeypatch, failures, nominal):
+    # Jitter picks a delay between half the nominal delay and all of it
+    monkeypatch.setattr(app.random, 'uniform', lambda low, high: low)
+    assert app.backoff_delay(failures) == nominal / 2
+    monkeypatch.setattr(app.random, 'uniform', lambda low, high: high)
+    assert app.backoff_delay(failures) == nominal
+
+
+def test_backoff_jitter_stays_in_bounds(app):
+    for failures in range(1, 15):
+        nominal = min(BACKOFF_MAX, 5 * 2 ** (failures - 1))
+        delays = {app.backoff_delay(failures) for _ in range(200)}
+        assert all(nominal / 2 <= delay <= nominal for delay in delays)
+        assert len(delays) > 1
+
+
+@pytest.mark.parametrize('interval, post_rate, expected', [
+    (30, None, 30),  # No rate measured yet
+    (30, 0, 60),  # Quiet: twice as long
+    (30, 0.001, 60),  # Slower than one post per 60s: clamped at 2x
+    (30, 1 / 45, 45),  # One post per 45s: polled about once per post
+    (30, 1 / 10, 10),
+    (30, 1 / 7.5, 7.5),
+    (30, 1, 7.5),  # Busy: clamped at 1/4 of the interval
+    (30, 100, 7.5),
+    (4, 100, 2),  # Never below MIN_POLL_INTERVAL
+    (1, 0, 2),
+    (1, 100, 2)
+])
+def test_adaptive_interval_is_clamped(app, interval, post_rate, expected):
+    assert app.adaptive_interval({'interval': interval, 'post_rate': post_rate}) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('limits, watches, stretch, wait', [
+    ({}, [(30, None)], 1.0, 0),  # Before the first request
+    ({'remaining': 500, 'reset_in': 600}, [(30, None)] * 2, 1.0, 0),  # 40 polls fit easily
+    ({'remaining': 30, 'reset_in': 600}, [(30, None)] * 2, 2.0, 0),  # 40 polls, 20 spare requests
+    ({'remaining': 15, 'reset_in': 600}, [(30, None)] * 2, 8.0, 0),
+    ({'remaining': 30, 'reset_in': 600}, [(30, 1.0)] * 2, 8.0, 0),  # Busy subreddits poll 4x as often
+    ({'remaining': 30, 'reset_in': 600}, [(30, 0)] * 2, 1.0, 0),  # Quiet ones half as often
+    ({'remaining': 10, 'reset_in': 600}, [(30, None)], 1.0, 600),  # Only the reserve is left: wait
+    ({'remaining': 0, 'reset_in': 120}, [(30, None)], 1.0, 120),
+    ({'remaining': 0, 'reset_in': -5}, [(30, None)], 1.0, 0),  # Window already reset
+    ({'remaining': 30, 'reset_in': -5}, [(30, None)], 1.0, 0)
+])
+def test_rate_limit_plan_stretches_to_fit(app, monkeypatch, limits, watches, stretch, wait):
+    if 'reset_in' in limits:
+        limits = {'remaining': limits['remaining'], 'reset_timestamp': time.time() + limits['reset_in']}
+    monkeypatch.setattr(app, 'reddit_rate_limits', lambda: limits)
+    for number, (interval, post_rate) in enumerate(watches):
+        app.watched_subreddits[f"sub{number}"] = {'interval': interval, 'post_rate': post_rate}
+
+    planned_stretch, planned_wait = app.rate_limit_plan()
+
+    assert planned_stretch == pytest.approx(stretch, rel=0.01)
+    assert planned_wait == pytest.approx(wait, abs=1)
+
+
+def error(name):
+    """A prawcore error without the response it is normally built from"""
+    exceptions = pytest.importorskip('prawcore.exceptions')
+    cls = getattr(exceptions, name)
+    return cls.__new__(cls)
+
+
+@pytest.mark.parametrize('name, kind', [
+    ('Forbidden', 'permanent'),  # Private or banned subreddit
+    ('NotFound', 'permanent'),  # Banned subreddit
+    ('Redirect', 'permanent'),  # Missing subreddit, redirected to search
+    ('TooManyRequests', 'rate_limited'),
+    ('ServerError', 'transient'),
+    ('BadRequest', 'transient'),
+    ('RequestException', 'transient')
+])
+def test_classify_prawcore_errors(app, name, kind):
+    assert app.classify_poll_error(error(name)) == kind
+
+
+@pytest.mark.parametrize('exception', [ConnectionError(), TimeoutError(), ValueError('bad json'), KeyError('data')])
+def test_other_errors_are_transient(app, exception):
+    assert app.classify_poll_error(exception) == 'transient'
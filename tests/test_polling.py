@@ -0,0 +1,103 @@
+"""Cursor polling emits every post exactly once, oldest first, however posts arrive"""
+import itertools
+import random
+import time
+
+import pytest
+
+from benchmarks.fake_reddit import FakeReddit
+
+
+@pytest.fixture
+def monitor(app, monkeypatch):
+    """Fake Reddit behind main, with emitted posts recorded as (subreddit, post id)"""
+    reddit = FakeReddit()
+    emitted = []
+    clock = itertools.count(int(time.time()) - 100000)
+    monkeypatch.setattr(app, 'get_reddit', lambda: reddit)
+    monkeypatch.setattr(app, 'emit_new_posts', lambda posts, name: emitted.extend((name, post.id) for post in posts))
+    # A placeholder thread keeps add_subreddit from starting the real scheduler
+    monkeypatch.setattr(app, 'monitor_thread', object())
+
+    def inject(name, count):
+        """Add count posts one second apart, oldest first"""
+        return [reddit.add_posts(name, 1, created_utc=next(clock))[0] for _ in range(count)]
+
+    def poll(*names):
+        due = [app.watched_subreddits[name.lower()] for name in names]
+        groups = app.group_subreddits(due, next(clock))
+        for group in groups:
+            app.poll_subreddit_group(group)
+        return groups
+
+    def watch(*names):
+        """Start watching subreddits and seed their cursors, forgetting the seed posts"""
+        for name in names:
+            inject(name, 1)
+            app.add_subreddit(name, 30)
+            poll(name)
+        emitted.clear()
+
+    return reddit, emitted, inject, poll, watch
+
+
+def test_bursts_are_paged_completely(app, monitor):
+    reddit, emitted, inject, poll, watch = monitor
+    watch('PhotoshopRequest')
+
+    expected = []
+    for burst in (1, app.POLL_PAGE_SIZE - 1, app.POLL_PAGE_SIZE, app.POLL_PAGE_SIZE + 1, app.POLL_PAGE_SIZE * 2 + 37):
+        posts = inject('PhotoshopRequest', burst)
+        expected.extend(('PhotoshopRequest', post.id) for post in posts)
+        reddit.calls.clear()
+        poll('PhotoshopRequest')
+        assert emitted == expected
+        # One request per page, plus one to see the page after a full one is empty
+        assert reddit.calls['new'] == burst // app.POLL_PAGE_SIZE + 1
+
+    poll('PhotoshopRequest')
+    assert emitted == expected
+
+
+def test_deleted_cursor_post_is_recovered(app, monitor):
+    reddit, emitted, inject, poll, watch = monitor
+    watch('PhotoshopRequest')
+    cursor_post = inject('PhotoshopRequest', 5)[-1]
+    poll('PhotoshopRequest')
+    emitted.clear()
+
+    # Reddit answers an empty 'before' page forever once the cursor post is gone
+    reddit.posts.remove(cursor_post)
+    del reddit.by_id[cursor_post.id]
+    posts = inject('PhotoshopRequest', 30)
+    for _ in range(app.CURSOR_CHECK_POLLS - 1):
+        poll('PhotoshopRequest')
+    assert emitted == []
+
+    poll('PhotoshopRequest')
+    assert emitted == [('PhotoshopRequest', post.id) for post in posts]
+
+    later = inject('PhotoshopRequest', 3)
+    poll('PhotoshopRequest')
+    poll('PhotoshopRequest')
+    assert emitted == [('PhotoshopRequest', post.id) for post in posts + later]
+
+
+def test_merged_listing_splits_posts_per_subreddit(app, monitor):
+    reddit, emitted, inject, poll, watch = monitor
+    watch('alpha', 'beta')
+
+    shuffle = random.Random(3).shuffle
+    expected = {'alpha': [], 'beta': []}
+    for alpha_posts, beta_posts in ((3, 0), (70, 90), (1, 150)):
+        # Posts of both subreddits arrive interleaved
+        names = ['alpha'] * alpha_posts + ['beta'] * beta_posts
+        shuffle(names)
+        for name in names:
+            expected[name].append(inject(name, 1)[0].id)
+        groups = poll('alpha', 'beta')
+        assert [len(group) for group in groups] == [2]
+
+    for name in ('alpha', 'beta'):
+        assert [post_id for subreddit, post_id in emitted if subreddit == name] == expected[name]
+    assert len(emitted) == len(set(emitted)) == sum(len(ids) for ids in expected.values())
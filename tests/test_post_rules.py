@@ -0,0 +1,99 @@
+"""Rule matching with literal gating finds what running every keyword and pattern finds"""
+import random
+import re
+
+import pytest
+
+import post_rules
+
+RULES = post_rules.DEFAULT_RULES + [
+    {'name': 'colorize', 'keywords': [], 'patterns': [r"colou?ri[sz]e"]},
+    {'name': 'before after', 'keywords': ['before and after'], 'patterns': [r"before\s+and\s+after"]},
+    {'name': 'decade', 'keywords': [], 'patterns': [r"\b(?:19|20)\d0s photo\b"]},
+    {'name': 'fix', 'keywords': [], 'patterns': [r"[Ff]ix my [a-z]+", r"\bsharpen\b|\bblurry\b"]},
+    {'name': 'hdr', 'keywords': [], 'patterns': [r"\bhdr\b", r"\bhigh-?res(?:olution)?\b"]},
+    {'name': 'tip', 'keywords': ['tip', 'will tip'], 'patterns': [r"\$\d+ tip", r"tip(?:ping)? \$?\d+"]}
+]
+# Inline flags and repeated group names keep the ungated patterns from being combined into one regex
+UNCOMBINABLE_RULES = RULES[:-2] + [
+    {'name': 'hdr', 'keywords': [], 'patterns': [r"(?i)hdr\b", r"\bhigh-?res(?:olution)?\b"]},
+    {'name': 'tip', 'keywords': [], 'patterns': [r"(?P<amount>\$\d+) tip", r"(?:tip|tipping) (?P<amount>\$?\d+)"]}
+]
+WORDS = ['please', 'remove', 'the', 'person', 'people', 'stranger', 'old', 'photo', 'urgent', 'ASAP', 'rush',
+         'before', 'and', 'after', 'colorise', 'colourize', 'Colorize', '1970s', '2000s', 'fix', 'Fix', 'my',
+         'hair', 'sharpen', 'blurry', 'HDR', 'hdr', 'high-res', 'highresolution', 'tip', '$5', '10', 'tipping',
+         'passed', 'away', 'in', 'memory', 'damaged', 'a', 'guy', 'kids', "don't", 'as', 'soon', 'possible']
+
+
+def ungated_tags(rules, text):
+    """Tags from searching for every keyword and running every pattern"""
+    words = post_rules.WORD_PATTERN.findall(text.casefold())
+    tags = []
+    for rule in rules:
+        keywords = [post_rules.WORD_PATTERN.findall(keyword.casefold()) for keyword in rule['keywords']]
+        if any(words[start:start + len(keyword)] == keyword
+               for keyword in keywords for start in range(len(words))):
+            tags.append(rule['name'])
+        elif any(re.search(pattern, text, re.IGNORECASE) for pattern in rule['patterns']):
+            tags.append(rule['name'])
+    return tags
+
+
+@pytest.fixture(params=[RULES, UNCOMBINABLE_RULES], ids=['combined', 'uncombinable'])
+def rules(request):
+    previous = post_rules.get_rules()
+    post_rules.set_rules(request.param)
+    yield request.param
+    post_rules.set_rules(previous)
+
+
+def test_gated_matching_equals_running_every_rule(rules):
+    rng = random.Random(3)
+    found = set()
+    for _ in range(3000):
+        title = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 8)))
+        description = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(0, 25)))
+        tags = post_rules.match_post(title, description)['tags']
+        assert tags == ungated_tags(rules, f"{title}\n{description}"), (title, description)
+        found.update(tags)
+    # Every rule was exercised
+    assert found == {rule['name'] for rule in rules}
+
+
+@pytest.mark.parametrize('pattern, literal', [
+    (r"\bremove (?:the )?person", 'remove'),
+    (r"colou?rize", 'colo'),
+    (r"before\s+and\s+after", 'before'),
+    (r"\$\d+ tip", 'tip'),
+    (r"[Ff]ix my [a-z]+", 'ix'),
+    (r"\bsharpen\b|\bblurry\b", None),
+    (r"(?i)hdr\b", None),
+    (r"(?:photo|picture)s?", None),
+    (r"a{2,}", None)
+])
+def test_required_literal(pattern, literal):
+    assert post_rules.required_literal(pattern) == literal
+
+
+@pytest.mark.parametrize('text, price', [
+    ("Paid $20 to remove my ex", 20.0),
+    ("Will pay 20 dollars", 20.0),
+    ("€15 for a quick edit", 15.0),
+    ("15€ for a quick edit", 15.0),
+    ("£ 12.50 tip", 12.5),
+    ("Paying 15 USD", 15.0),
+    ("7,50 € if it looks good", 7.5),
+    ("$1,000 for the full restoration", 1000.0),
+    ("$10-20 depending on quality", 10.0),
+    ("$10 - $20 depending on quality", 10.0),
+    ("10-20 dollars depending on quality", 10.0),
+    ("10 to 20 bucks", 10.0),
+    ("$0 or 5 euros", 5.0),
+    ("Budget 5-10", None),
+    ("Shot in 2020 at 1920x1080", None),
+    ("$150000 is a resolution, not a budget", None),
+    ("No price here", None),
+    ("", None)
+])
+def test_extract_price(text, price):
+    assert post_rules.extract_price(text) == price
@@ -0,0 +1,68 @@
+"""Startup loading pushes each listing page as soon as its request returns"""
+import pytest
+
+import background_writer
+
+from benchmarks.fake_reddit import FakeReddit
+
+
+@pytest.fixture
+def startup(app, monkeypatch):
+    """Fake Reddit behind main, with pushed pages recorded along with the 'new' calls made before each"""
+    reddit = FakeReddit()
+    pages = []
+
+    def push_to_ui(callback, *args):
+        if callback == 'recentPostsPage':
+            pages.append((reddit.calls['new'], [post['id'] for post in args[0]['posts']]))
+
+    monkeypatch.setattr(app, 'get_reddit', lambda: reddit)
+    monkeypatch.setattr(app, 'push_to_ui', push_to_ui)
+    return reddit, pages
+
+
+def newest_first(posts, removed=()):
+    return [post.id for post in reversed(posts) if post.id not in removed]
+
+
+def test_first_launch_pushes_one_page_per_request(app, startup):
+    reddit, pages = startup
+    posts = reddit.add_posts('PhotoshopRequest', app.POLL_PAGE_SIZE * 2 + 30)
+
+    result = app.get_recent_posts('PhotoshopRequest')
+
+    assert result['new_posts'] == len(posts)
+    assert [calls for calls, _ in pages] == [1, 2, 3]
+    assert [post_id for _, ids in pages for post_id in ids] == newest_first(posts)
+
+
+def test_short_pages_are_pushed_when_their_request_returns(app, startup):
+    reddit, pages = startup
+    posts = reddit.add_posts('PhotoshopRequest', app.POLL_PAGE_SIZE * 3)
+    # Removed posts are left out of the listing, so the first two pages come back short
+    reddit.removed.update(post.id for post in posts[-app.POLL_PAGE_SIZE:][::7])
+    reddit.removed.update(post.id for post in posts[-2 * app.POLL_PAGE_SIZE:-app.POLL_PAGE_SIZE][::3])
+
+    app.get_recent_posts('PhotoshopRequest')
+
+    assert pages[0][0] == 1
+    assert len(pages[0][1]) < app.POLL_PAGE_SIZE
+    # Pages never straddle requests, and every visible post is pushed once, newest first
+    assert [calls for calls, _ in pages] == list(range(1, len(pages) + 1))
+    assert [post_id for _, ids in pages for post_id in ids] == newest_first(posts, reddit.removed)
+
+
+def test_incremental_update_stops_at_last_seen_post(app, startup):
+    reddit, pages = startup
+    reddit.add_posts('PhotoshopRequest', 40)
+    app.get_recent_posts('PhotoshopRequest')
+    background_writer.flush()
+    pages.clear()
+    reddit.calls.clear()
+    posts = reddit.add_posts('PhotoshopRequest', 15)
+
+    result = app.get_recent_posts('PhotoshopRequest')
+
+    assert result['load_type'] == 'INCREMENTAL_UPDATE'
+    assert result['new_posts'] == 15
+    assert pages == [(1, newest_first(posts))]
@@ -0,0 +1,109 @@
+"""Tracked posts are refreshed in batched info() calls, young ones more often, and only changes are pushed"""
+import types
+
+import pytest
+
+import background_writer
+import feed_store
+import score_refresher
+from benchmarks.fake_reddit import FakeReddit
+
+
+@pytest.fixture
+def refresher(app, monkeypatch):
+    """Fake Reddit behind main, a clock tests move by hand and the pushed changes"""
+    reddit = FakeReddit()
+    clock = types.SimpleNamespace(now=1700000000.0)
+    monkeypatch.setattr(score_refresher, 'time', types.SimpleNamespace(time=lambda: clock.now))
+    monkeypatch.setattr(app, 'get_reddit', lambda: reddit)
+    pushed = []
+    monkeypatch.setattr(app, 'push_to_ui', lambda callback, *args: pushed.append(args[0])
+                        if callback == 'postScoresUpdated' else None)
+    refreshed = []  # post ids per info() call
+    info = reddit.info
+
+    def recording_info(fullnames):
+        refreshed.append([fullname[3:] for fullname in fullnames])
+        return info(fullnames)
+
+    monkeypatch.setattr(reddit, 'info', recording_info)
+
+    def add(count, age):
+        posts = reddit.add_posts('PhotoshopRequest', count, created_utc=clock.now - age)
+        for post in posts:
+            score_refresher.track(post.id, post.created_utc, **app.post_state(post))
+        return posts
+
+    def run_until(end):
+        """Run every batch that falls due before end, in schedule order"""
+        while score_refresher._schedule and score_refresher._schedule[0][0] <= end:
+            clock.now = max(clock.now, score_refresher._schedule[0][0])
+            while score_refresher._refresh_batch():
+                pass
+        clock.now = end
+
+    return types.SimpleNamespace(reddit=reddit, clock=clock, pushed=pushed, refreshed=refreshed,
+                                 add=add, run_until=run_until)
+
+
+def test_due_posts_are_fetched_in_batches_of_100(refresher):
+    refresher.add(250, age=60)
+
+    refresher.run_until(refresher.clock.now + score_refresher.REFRESH_MIN_INTERVAL)
+
+    assert refresher.reddit.calls['info'] == 3
+    assert [len(batch) for batch in refresher.refreshed] == [100, 100, 50]
+
+
+def test_young_posts_are_refreshed_more_often(refresher):
+    young = refresher.add(50, age=60)
+    old = refresher.add(50, age=2 * 86400)
+
+    refresher.run_until(refresher.clock.now + 4 * 3600)
+
+    counts = {}
+    for batch in refresher.refreshed:
+        for post_id in batch:
+            counts[post_id] = counts.get(post_id, 0) + 1
+    young_counts = [counts.get(post.id, 0) for post in young]
+    old_counts = [counts.get(post.id, 0) for post in old]
+    # Every REFRESH_MAX_INTERVAL at most, and every REFRESH_MIN_INTERVAL while very young
+    assert min(old_counts) >= 1 and max(old_counts) <= 2
+    assert min(young_counts) > 2 * max(old_counts)
+    assert all(len(batch) <= score_refresher.BATCH_SIZE for batch in refresher.refreshed)
+
+
+def test_only_changed_posts_are_pushed(app, refresher):
+    posts = refresher.add(30, age=60)
+    for post in posts:
+        feed_store.add({'id': post.id, 'created': post.created_utc, 'upvotes': post.score}, 'PhotoshopRequest')
+    refresher.run_until(refresher.clock.now + score_refresher.REFRESH_MIN_INTERVAL)
+    assert refresher.reddit.calls['info'] == 1
+    assert refresher.pushed == []
+
+    posts[3].score += 10
+    posts[7].num_comments += 1
+    posts[7].locked = True
+    posts[12].removed_by_category = 'moderator'
+    refresher.run_until(refresher.clock.now + score_refresher.REFRESH_MIN_INTERVAL)
+
+    assert refresher.reddit.calls['info'] == 2
+    assert refresher.pushed == [[
+        {'id': posts[3].id, 'upvotes': posts[3].score},
+        {'id': posts[7].id, 'num_comments': posts[7].num_comments, 'locked': True},
+        {'id': posts[12].id, 'removed': 'moderator'}
+    ]]
+    assert feed_store.get(posts[3].id)['upvotes'] == posts[3].score
+    background_writer.flush()
+
+
+def test_posts_past_the_tracking_age_are_dropped(refresher):
+    refresher.add(10, age=score_refresher.TRACK_MAX_AGE - 3600)
+    refresher.add(5, age=score_refresher.TRACK_MAX_AGE + 60)
+    assert score_refresher.tracked_count() == 10
+
+    refresher.run_until(refresher.clock.now + 2 * 3600)
+
+    # Their next refresh falls past TRACK_MAX_AGE, so they are dropped without a request
+    assert score_refresher.tracked_count() == 0
+    assert refresher.reddit.calls['info'] == 0
@@ -0,0 +1,90 @@
+"""The seen-post index remembers ids for SEEN_WINDOW, forgets them later and survives restarts"""
+import random
+
+import background_writer
+
+SEEN_WINDOW = 7 * 86400
+
+
+class Clock:
+    """Moves main's seen-post clock by shifting the last rotation time back"""
+
+    def __init__(self, app):
+        self.app = app
+        self.now = 0.0
+        app.load_seen_posts()
+
+    def advance(self, seconds):
+        self.now += seconds
+        self.app.seen_rotated_at -= seconds
+
+
+def test_ids_expire_across_rotations(app):
+    clock = Clock(app)
+    rng = random.Random(4)
+    first_marked = {}  # id -> clock time it was last reported as new
+    for _ in range(20000):
+        # Activity at least every tenth of a window, so rotations happen on time
+        clock.advance(rng.uniform(0, SEEN_WINDOW / 10))
+        post_id = format(rng.randrange(1, 3000), 'x')
+        is_new = app.mark_post_seen(post_id)
+        age = clock.now - first_marked[post_id] if post_id in first_marked else None
+        if age is not None and age < SEEN_WINDOW:
+            assert not is_new, age / SEEN_WINDOW
+        if age is None or age >= 2.1 * SEEN_WINDOW:
+            assert is_new, age and age / SEEN_WINDOW
+        if is_new:
+            first_marked[post_id] = clock.now
+
+    # Only ids from the last two windows are kept
+    current, previous = app.seen_generations
+    assert len(current) + len(previous) < 3000
+
+
+def test_both_generations_expire_after_a_long_pause(app):
+    clock = Clock(app)
+    app.mark_post_seen('old1')
+    clock.advance(SEEN_WINDOW * 1.5)
+    app.mark_post_seen('old2')
+
+    clock.advance(SEEN_WINDOW * 2)
+
+    assert app.mark_post_seen('old2')
+    assert app.mark_post_seen('old1')
+
+
+def restart(app, monkeypatch):
+    background_writer.flush()
+    monkeypatch.setattr(app, 'seen_generations', None)
+    monkeypatch.setattr(app, 'seen_rotated_at', 0)
+    app.load_seen_posts()
+
+
+def test_index_survives_restart(app, monkeypatch):
+    clock = Clock(app)
+    older = ['1a0000', 'zzzzzzzzzzzz', '0']
+    newer = [format(number, 'x') for number in range(1000, 1500)]
+    for post_id in older:
+        assert app.mark_post_seen(post_id)
+    clock.advance(SEEN_WINDOW * 1.2)
+    for post_id in newer:
+        assert app.mark_post_seen(post_id)
+    generations = [set(generation) for generation in app.seen_generations]
+    rotated_at = app.seen_rotated_at
+    app.save_seen_posts()
+
+    restart(app, monkeypatch)
+
+    assert app.seen_generations == generations
+    assert app.seen_rotated_at == rotated_at
+    assert not any(app.mark_post_seen(post_id) for post_id in older + newer)
+
+
+def test_unreadable_snapshot_starts_empty(app, monkeypatch):
+    with open(app.SEEN_POSTS_FILE, 'wb') as f:
+        f.write(b'\x00\x01')
+
+    restart(app, monkeypatch)
+
+    assert app.seen_generations == [set(), set()]
+    assert app.mark_post_seen('abc')
@@ -0,0 +1,32 @@
+"""Importing main stays cheap: the Reddit client, eel and tkinter are only loaded when used"""
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFERRED_MODULES = ('praw', 'prawcore', 'eel', 'tkinter')
+IMPORT_SECONDS_LIMIT = 2.0  # About 0.2s on a laptop; generous for slow CI machines
+
+IMPORT_MAIN = """
+import json, sys, time
+started = time.perf_counter()
+import main
+seconds = time.perf_counter() - started
+print(json.dumps({'seconds': seconds, 'loaded': [name for name in %r if name in sys.modules]}))
+""" % (DEFERRED_MODULES,)
+
+
+def test_import_main_defers_gui_and_client(tmp_path, record_property):
+    # A fresh interpreter, so modules imported by other tests do not count
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get('PYTHONPATH')])))
+    result = subprocess.run([sys.executable, '-c', IMPORT_MAIN], cwd=tmp_path, env=env,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    record_property('import_main_seconds', round(report['seconds'], 3))
+    assert report['loaded'] == []
+    assert report['seconds'] < IMPORT_SECONDS_LIMIT
+    # Importing must not create data files either
+    assert os.listdir(tmp_path) == []
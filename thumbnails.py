@@ -0,0 +1,221 @@
+import heapq
+import io
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict
+from importlib.util import find_spec
+
+import downloads
+import metrics
+
+# Thumbnail settings - files live under the eel web root so the webview loads them
+# directly from the local server; the directory is an LRU cache capped in size
+THUMBNAIL_DIR = os.path.join('web', 'thumbnails')
+THUMBNAIL_URL_PREFIX = 'thumbnails/'
+THUMBNAIL_SIZE = (320, 320)  # Bounding box, aspect ratio is kept
+THUMBNAIL_QUALITY = 75
+THUMBNAIL_CACHE_BYTES = 200 * 1024 * 1024
+THUMBNAIL_WORKERS = 3
+THUMBNAIL_QUEUE_MAX = 500  # Oldest requests are dropped beyond this
+SOURCE_MAX_BYTES = 10 * 1024 * 1024
+SOURCE_EXTENSIONS = {'image/jpeg': '.jpg', 'image/png': '.png', 'image/webp': '.webp', 'image/gif': '.gif'}
+
+_resolve_source = None  # post id -> image URL to make the thumbnail from, or None
+_on_ready = None  # called with {'id': ..., 'url': ...} once a thumbnail is written
+_entries = None  # post id -> (file name, bytes), least recently used first; scanned on first use
+_total_bytes = 0
+_no_image = set()  # posts without an image, so they are not resolved again
+_queue = []  # heap of (-generation, sequence, post id); entries superseded in _queued are skipped
+_queued = {}  # post id -> generation of its newest request
+_building = set()
+_generation = 0
+_sequence = itertools.count()
+_lock = threading.Lock()
+_work = threading.Condition(_lock)
+_workers = []
+
+
+def configure(resolve_source, on_ready):
+    """Set how a post's source image is found and where finished thumbnails are announced"""
+    global _resolve_source, _on_ready
+    _resolve_source = resolve_source
+    _on_ready = on_ready
+
+
+def request(post_ids):
+    """Return {post id: url} of cached thumbnails and queue the rest
+
+    Each call is a new generation that is served before older ones, so the cards the
+    user is looking at now come first. Returns 'none' for posts without an image.
+    """
+    global _generation
+    found = {}
+    with _lock:
+        _load()
+        _generation += 1
+        for post_id in post_ids:
+            if post_id in _entries:
+                _entries.move_to_end(post_id)
+                found[post_id] = THUMBNAIL_URL_PREFIX + _entries[post_id][0]
+                metrics.increment('thumbnail_cache_total', labels={'result': 'hit'})
+            elif post_id in _no_image:
+                found[post_id] = 'none'
+            elif post_id not in _building:
+                _queued[post_id] = _generation
+                heapq.heappush(_queue, (-_generation, next(_sequence), post_id))
+        _trim_queue()
+        _start_workers()
+        _work.notify_all()
+    # Touch hits so the LRU order survives restarts
+    for post_id, url in found.items():
+        if url != 'none':
+            _touch(url[len(THUMBNAIL_URL_PREFIX):])
+    return found
+
+
+def cache_stats():
+    with _lock:
+        _load()
+        return {'thumbnails': len(_entries), 'bytes': _total_bytes, 'queued': len(_queued)}
+
+
+def make_thumbnail(content_type, data):
+    """Shrink an image to THUMBNAIL_SIZE as WebP (JPEG without WebP support); returns (extension, data)
+
+    Without Pillow the source is kept as is - callers pass Reddit's preview
+    resolutions, which are already small.
+    """
+    if find_spec('PIL') is None:
+        return SOURCE_EXTENSIONS.get(content_type, '.jpg'), data
+    from PIL import Image, features
+    with Image.open(io.BytesIO(data)) as image:
+        image.draft('RGB', THUMBNAIL_SIZE)
+        image = image.convert('RGB')
+        image.thumbnail(THUMBNAIL_SIZE)
+        output = io.BytesIO()
+        if features.check('webp'):
+            image.save(output, 'WEBP', quality=THUMBNAIL_QUALITY)
+            return '.webp', output.getvalue()
+        image.save(output, 'JPEG', quality=THUMBNAIL_QUALITY, optimize=True)
+        return '.jpg', output.getvalue()
+
+
+def _worker():
+    while True:
+        with _lock:
+            post_id = _next_post()
+            while post_id is None:
+                _work.wait()
+                post_id = _next_post()
+        try:
+            _build(post_id)
+        except Exception as e:
+            print(f"Failed to make thumbnail for {post_id}: {str(e)}")
+        finally:
+            with _lock:
+                _building.discard(post_id)
+
+
+def _next_post():
+    """Pop the newest-generation request that is still wanted"""
+    while _queue:
+        negative_generation, _, post_id = heapq.heappop(_queue)
+        if _queued.get(post_id) == -negative_generation:
+            del _queued[post_id]
+            _building.add(post_id)
+            return post_id
+    return None
+
+
+def _build(post_id):
+    with _lock:
+        if post_id in _entries:
+            return
+    source = _resolve_source(post_id) if _resolve_source else None
+    if not source:
+        with _lock:
+            _no_image.add(post_id)
+        return
+
+    metrics.increment('thumbnail_cache_total', labels={'result': 'miss'})
+    with metrics.timer('thumbnail_seconds'):
+        content_type, data = downloads.fetch_bytes(source, SOURCE_MAX_BYTES)
+        extension, thumbnail = make_thumbnail(content_type, data)
+    file_name = post_id + extension
+    path = os.path.join(THUMBNAIL_DIR, file_name)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(thumbnail)
+    os.replace(temp_path, path)
+
+    with _lock:
+        _add_entry(post_id, file_name, len(thumbnail))
+        _evict()
+    if _on_ready:
+        _on_ready({'id': post_id, 'url': THUMBNAIL_URL_PREFIX + file_name})
+
+
+def _load():
+    """Index the thumbnails already on disk, least recently used first"""
+    global _entries, _total_bytes
+    if _entries is not None:
+        return
+    _entries = OrderedDict()
+    _total_bytes = 0
+    os.makedirs(THUMBNAIL_DIR, exist_ok=True)
+    files = []
+    for entry in os.scandir(THUMBNAIL_DIR):
+        if entry.is_file() and not entry.name.endswith('.tmp'):
+            stat = entry.stat()
+            files.append((stat.st_mtime, entry.name, stat.st_size))
+    for _, file_name, size in sorted(files):
+        _add_entry(os.path.splitext(file_name)[0], file_name, size)
+    _evict()
+
+
+def _add_entry(post_id, file_name, size):
+    global _total_bytes
+    if post_id in _entries:
+        _total_bytes -= _entries.pop(post_id)[1]
+    _entries[post_id] = (file_name, size)
+    _total_bytes += size
+
+
+def _evict():
+    global _total_bytes
+    while _total_bytes > THUMBNAIL_CACHE_BYTES and _entries:
+        _, (file_name, size) = _entries.popitem(last=False)
+        _total_bytes -= size
+        try:
+            os.remove(os.path.join(THUMBNAIL_DIR, file_name))
+        except OSError:
+            pass
+
+
+def _touch(file_name):
+    try:
+        os.utime(os.path.join(THUMBNAIL_DIR, file_name), (time.time(), time.time()))
+    except OSError:
+        pass
+
+
+def _trim_queue():
+    """Forget the oldest requests beyond THUMBNAIL_QUEUE_MAX; they are asked for again when visible"""
+    global _queue
+    if len(_queued) > THUMBNAIL_QUEUE_MAX:
+        for post_id in sorted(_queued, key=_queued.get)[:len(_queued) - THUMBNAIL_QUEUE_MAX]:
+            del _queued[post_id]
+    # Drop superseded heap entries once they outnumber the live ones
+    if len(_queue) > 2 * THUMBNAIL_QUEUE_MAX:
+        _queue = [(-generation, next(_sequence), post_id) for post_id, generation in _queued.items()]
+        heapq.heapify(_queue)
+
+
+def _start_workers():
+    while len(_workers) < THUMBNAIL_WORKERS:
+        thread = threading.Thread(target=_worker, name=f"thumbnail-{len(_workers) + 1}")
+        thread.daemon = True
+        thread.start()
+        _workers.append(thread)
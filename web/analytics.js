@@ -153,6 +153,9 @@ function updateAnalyticsDisplay(analytics) {
     // Top authors
     updateTopAuthors(analytics.top_authors || {});
     
+    // Rule tags and budgets
+    updateTopTags(analytics.tag_counts || {}, analytics.price_metrics || {});
+    
     // Source info
     document.getElementById('analyticsSource').textContent = analytics.total_posts;
 }
@@ -236,6 +239,38 @@ function updateTopAuthors(topAuthors) {
     });
 }
 
+function updateTopTags(tagCounts, priceMetrics) {
+    const container = document.getElementById('topTags');
+    container.innerHTML = '';
+    
+    const tags = Object.entries(tagCounts).slice(0, 10);
+    
+    if (priceMetrics.priced_posts) {
+        const priceItem = document.createElement('div');
+        priceItem.className = 'author-item';
+        priceItem.innerHTML = `
+            <span class="author-name">💲 Budget (${priceMetrics.priced_posts} posts)</span>
+            <span class="author-count">avg ${priceMetrics.avg_price}, max ${priceMetrics.max_price}</span>
+        `;
+        container.appendChild(priceItem);
+    }
+    
+    if (tags.length === 0 && !priceMetrics.priced_posts) {
+        container.innerHTML = '<div class="author-item"><span>No data available</span></div>';
+        return;
+    }
+    
+    tags.forEach(([tag, count]) => {
+        const tagItem = document.createElement('div');
+        tagItem.className = 'author-item';
+        tagItem.innerHTML = `
+            <span class="author-name">${tag}</span>
+            <span class="author-count">${count} posts</span>
+        `;
+        container.appendChild(tagItem);
+    });
+}
+
 // Modern ApexCharts implementation with error handling
 function createModernAnalyticsCharts(analytics) {
     console.log('Creating modern analytics charts...');
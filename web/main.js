@@ -2,6 +2,7 @@ let isMonitoring = false;
 let totalPosts = 0;
 let totalDownloads = 0;
 let currentModalPost = null;
+let activeDownloadJobs = new Set();
 let seenPostIds = new Set();
 let completedPosts = new Set();
 let analyticsData = { paid_posts: 0, free_posts: 0 };
@@ -10,20 +11,19 @@ let analyticsData = { paid_posts: 0, free_posts: 0 };
 let allPosts = [];
 let currentPostLimit = 10;
 let currentSortMethod = 'newest';
+let currentFeedFilter = 'all';
+
+// Feed paging state - pages come from the backend query_posts index
+let feedCursor = null;
+let feedRefreshTimer = null;
+let feedRequestId = 0;
 
 // Initialize app when DOM is loaded
 document.addEventListener('DOMContentLoaded', function() {
     initializeApp();
 });
 
-// Auto-save logs every 30 seconds
-setInterval(() => {
-    if (typeof eel !== 'undefined') {
-        saveLogsToFile();
-    }
-}, 30000);
-
-// Save logs when page is about to unload
+// Flush pending log entries when page is about to unload
 window.addEventListener('beforeunload', function() {
     if (typeof eel !== 'undefined') {
         saveLogsToFile();
@@ -98,6 +98,16 @@ async function initializeRedditConnection() {
 
 function setupEventListeners() {
     // Enter key for URL input
+    // Load the next feed page when scrolled near the bottom
+    const postsContainer = document.getElementById('postsContainer');
+    if (postsContainer) {
+        postsContainer.addEventListener('scroll', function() {
+            if (this.scrollTop + this.clientHeight >= this.scrollHeight - 200) {
+                loadMoreFeedPosts();
+            }
+        });
+    }
+    
     const urlInput = document.getElementById('urlInput');
     if (urlInput) {
         urlInput.addEventListener('keypress', function(e) {
@@ -112,25 +122,60 @@ function setupEventListeners() {
 if (typeof eel !== 'undefined') {
     eel.expose(newPostDetected);
     function newPostDetected(post) {
-        addPost(
-            post.title, 
-            post.url, 
-            post.author, 
-            post.flair || 'Free', 
-            post.created, 
-            post.description || 'No description provided.',
-            post.upvotes || 0,
-            post.id
-        );
+        addPostData(post);
         log(`New post: "${post.title}" by u/${post.author} [${post.flair || 'No flair'}]`, 'success');
         document.getElementById('lastUpdate').textContent = new Date().toLocaleTimeString();
     }
+
+    // Batch of posts from one poll, oldest first
+    eel.expose(newPostsDetected);
+    function newPostsDetected(posts) {
+        posts.forEach(post => newPostDetected(post));
+        if (posts.length > 1) {
+            log(`Detected ${posts.length} new posts since last check`, 'info');
+        }
+    }
+
+    // One listing page of the initial load, newest first
+    eel.expose(recentPostsPage);
+    function recentPostsPage(page) {
+        addPostsPage(page.posts);
+        document.getElementById('lastUpdate').textContent = new Date().toLocaleTimeString();
+    }
+
+    // Refreshed scores, comment counts and moderation state of tracked posts
+    eel.expose(postScoresUpdated);
+    function postScoresUpdated(changes) {
+        applyPostUpdates(changes);
+    }
+    
+    eel.expose(repostDetected);
+    function repostDetected(changes) {
+        applyPostUpdates(changes);
+    }
     
+    // A thumbnail requested by request_thumbnails has been made
+    eel.expose(thumbnailReady);
+    function thumbnailReady(thumbnail) {
+        showThumbnail(thumbnail.id, thumbnail.url);
+    }
+    
+    eel.expose(downloadProgress);
+    function downloadProgress(progress) {
+        showDownloadProgress(progress);
+    }
+
     eel.expose(logMessage);
     function logMessage(message, type) {
         log(message, type);
     }
     
+    // Polling health of every watched subreddit, pushed when one changes
+    eel.expose(monitorHealth);
+    function monitorHealth(subreddits) {
+        updateHealth(subreddits.filter(sub => sub.health !== 'ok'));
+    }
+    
     eel.expose(updateMonitoringStatus);
     function updateMonitoringStatus(active) {
         isMonitoring = active;
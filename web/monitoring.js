@@ -65,34 +65,20 @@ function loadInitialPosts(subreddit) {
         
         const initialLimit = 100; // Fixed amount for initial load
         
+        // Start from an empty feed - pages arrive through recentPostsPage while loading
+        allPosts = [];
+        seenPostIds.clear();
+        totalPosts = 0;
+        analyticsData = { paid_posts: 0, free_posts: 0 };
+        
         eel.get_recent_posts(subreddit, initialLimit)((result) => {
             if (result.status === 'success') {
                 const loadType = result.load_type || 'UNKNOWN';
                 const newPosts = result.new_posts || 0;
                 
-                // Clear existing posts for fresh load
-                allPosts = [];
-                seenPostIds.clear();
-                totalPosts = 0;
-                analyticsData = { paid_posts: 0, free_posts: 0 };
-                
-                // Add posts to UI
-                result.posts.forEach(post => {
-                    addPost(
-                        post.title,
-                        post.url,
-                        post.author,
-                        post.flair,
-                        post.created,
-                        post.description,
-                        post.upvotes,
-                        post.id
-                    );
-                });
-                
                 // Log appropriate message based on load type
                 if (loadType === 'FIRST_LAUNCH') {
-                    log(`First launch: Loaded ${result.posts.length} posts for comprehensive analysis`, 'success');
+                    log(`First launch: Loaded ${newPosts} posts for comprehensive analysis`, 'success');
                 } else if (loadType === 'INCREMENTAL_UPDATE') {
                     if (newPosts > 0) {
                         log(`Found ${newPosts} new posts since last launch`, 'success');
@@ -100,7 +86,7 @@ function loadInitialPosts(subreddit) {
                         log('No new posts since last launch - you\'re up to date!', 'info');
                     }
                 } else {
-                    log(`Loaded ${result.posts.length} recent posts`, 'success');
+                    log(`Loaded ${newPosts} recent posts`, 'success');
                 }
                 
                 document.getElementById('lastUpdate').textContent = new Date().toLocaleTimeString();
@@ -124,29 +110,15 @@ function refreshPosts() {
     if (typeof eel !== 'undefined') {
         const refreshLimit = 100; // Fixed substantial amount
         
+        // Clear existing posts - pages arrive through recentPostsPage while loading
+        allPosts = [];
+        seenPostIds.clear();
+        totalPosts = 0;
+        analyticsData = { paid_posts: 0, free_posts: 0 };
+        
         eel.get_recent_posts(subreddit, refreshLimit)((result) => {
             if (result.status === 'success') {
-                // Clear existing posts
-                allPosts = [];
-                seenPostIds.clear();
-                totalPosts = 0;
-                analyticsData = { paid_posts: 0, free_posts: 0 };
-                
-                // Add all new posts
-                result.posts.forEach(post => {
-                    addPost(
-                        post.title,
-                        post.url,
-                        post.author,
-                        post.flair,
-                        post.created,
-                        post.description,
-                        post.upvotes,
-                        post.id
-                    );
-                });
-                
-                log(`Refreshed with ${result.posts.length} posts from r/${subreddit}`, 'success');
+                log(`Refreshed with ${result.new_posts} posts from r/${subreddit}`, 'success');
                 document.getElementById('lastUpdate').textContent = new Date().toLocaleTimeString();
             } else {
                 log(`Failed to refresh posts: ${result.message}`, 'error');
@@ -198,27 +170,17 @@ function downloadFromUrl() {
     progressFill.style.width = '0%';
     
     if (typeof eel !== 'undefined') {
-        // Real download using Eel
-        eel.download_from_url(url, downloadDir)((result) => {
-            downloadBtn.disabled = false;
-            downloadBtn.textContent = 'Download Images';
-            progressFill.style.width = '0%';
-            
+        // Real download through the backend job queue - progress arrives via downloadProgress
+        eel.queue_downloads([url], downloadDir)((result) => {
             if (result.status === 'success') {
-                totalDownloads += result.count;
-                document.getElementById('totalDownloads').textContent = totalDownloads;
-                downloadStatus.textContent = result.message;
-                log(result.message, 'success');
+                activeDownloadJobs.add(result.job_id);
                 document.getElementById('urlInput').value = '';
             } else {
+                downloadBtn.disabled = false;
+                downloadBtn.textContent = 'Download Images';
                 downloadStatus.textContent = result.message;
                 log(result.message, 'error');
             }
-            
-            // Clear status after 3 seconds
-            setTimeout(() => {
-                downloadStatus.textContent = '';
-            }, 3000);
         });
     } else {
         // Simulate download for demo
@@ -256,4 +218,80 @@ function simulateDownload(downloadBtn, progressFill, downloadStatus) {
             downloadStatus.textContent = `Downloading... ${Math.round(progress)}%`;
         }
     }, 200);
-}
\ No newline at end of file
+}
+
+// Queue a bulk download job: 'paid_today' or 'incomplete'
+function queueBulkDownload(selection) {
+    const downloadDir = document.getElementById('downloadDirInput').value.trim();
+    if (typeof eel === 'undefined') {
+        log('Bulk downloads are not available in demo mode', 'info');
+        return;
+    }
+    
+    let request;
+    if (selection === 'paid_today') {
+        const today = new Date();
+        const date = `${today.getFullYear()}-${String(today.getMonth() + 1).padStart(2, '0')}-${String(today.getDate()).padStart(2, '0')}`;
+        request = eel.queue_matching_downloads(downloadDir, date, date, { post_type: 'PAID' }, false);
+    } else {
+        request = eel.queue_matching_downloads(downloadDir, null, null, null, true);
+    }
+    
+    request((result) => {
+        if (result.status === 'success') {
+            activeDownloadJobs.add(result.job_id);
+            log(result.message, 'success');
+        } else {
+            log(result.message, 'error');
+        }
+    });
+}
+
+// Cancel every download job started from this window
+function cancelDownloads() {
+    if (typeof eel === 'undefined') {
+        return;
+    }
+    activeDownloadJobs.forEach(jobId => eel.cancel_download_job(jobId));
+}
+
+// Show real progress of a backend download job
+function showDownloadProgress(progress) {
+    const downloadBtn = document.getElementById('downloadBtn');
+    const progressFill = document.getElementById('progressFill');
+    const downloadStatus = document.getElementById('downloadStatus');
+    
+    const percent = progress.posts_total > 0 ? (progress.posts_done / progress.posts_total) * 100 : 0;
+    progressFill.style.width = percent + '%';
+    
+    const megabytes = (progress.bytes / 1048576).toFixed(1);
+    const speed = (progress.bytes_per_second / 1048576).toFixed(1);
+    const eta = progress.eta_seconds !== null ? `, ~${Math.ceil(progress.eta_seconds)}s left` : '';
+    const errors = progress.errors > 0 ? `, ${progress.errors} failed` : '';
+    downloadStatus.textContent = `Downloading ${progress.files_done}/${progress.files_total} files ` +
+        `(${progress.posts_done}/${progress.posts_total} posts, ${megabytes} MB at ${speed} MB/s${errors}${eta})`;
+    
+    if (progress.status === 'done' || progress.status === 'cancelled') {
+        activeDownloadJobs.delete(progress.job_id);
+        totalDownloads += progress.files_done;
+        document.getElementById('totalDownloads').textContent = totalDownloads;
+        
+        const message = progress.status === 'done'
+            ? `Downloaded ${progress.files_done} images from ${progress.posts_done} posts${errors}`
+            : `Download cancelled after ${progress.files_done} images`;
+        downloadStatus.textContent = message;
+        log(message, progress.errors > 0 || progress.status === 'cancelled' ? 'error' : 'success');
+        
+        if (activeDownloadJobs.size === 0) {
+            downloadBtn.disabled = false;
+            downloadBtn.textContent = 'Download Images';
+            progressFill.style.width = '0%';
+            setTimeout(() => {
+                downloadStatus.textContent = '';
+            }, 3000);
+        }
+    } else {
+        downloadBtn.disabled = true;
+        downloadBtn.textContent = 'Downloading...';
+    }
+}
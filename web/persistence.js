@@ -1,63 +1,133 @@
 // persistence.js - File save/load operations and data persistence
 
-// Save logs to file
+// Log entries not yet sent to the backend - the backend log is append-only
+let pendingLogEntries = [];
+let logFlushTimer = null;
+let olderLogsCursor = null;
+let loadingOlderLogs = false;
+const LOG_FLUSH_DELAY = 2000;
+const LOG_PAGE_SIZE = 200;
+
+// Queue a new log entry for the next flush
+function queueLogEntry(entry) {
+    pendingLogEntries.push(entry);
+    if (!logFlushTimer) {
+        logFlushTimer = setTimeout(saveLogsToFile, LOG_FLUSH_DELAY);
+    }
+}
+
+// Send log entries added since the last flush
 function saveLogsToFile() {
+    if (logFlushTimer) {
+        clearTimeout(logFlushTimer);
+        logFlushTimer = null;
+    }
+    if (pendingLogEntries.length === 0) {
+        return;
+    }
     if (typeof eel !== 'undefined') {
-        const logArea = document.getElementById('logArea');
-        const logEntries = Array.from(logArea.children).map(entry => entry.innerText);
-        eel.save_logs_to_file(logEntries);
+        eel.append_log_entries(pendingLogEntries);
+    }
+    pendingLogEntries = [];
+}
+
+// Build a log DOM entry from a stored entry ({time, type, message} or legacy text)
+function createLogElement(entry) {
+    const logEntry = document.createElement('div');
+    logEntry.className = 'log-entry';
+    
+    if (typeof entry === 'object') {
+        let className = 'log-info';
+        if (entry.type === 'success') className = 'log-success';
+        else if (entry.type === 'error') className = 'log-error';
+        
+        logEntry.innerHTML = `
+            <span class="log-timestamp">[${entry.time}]</span> 
+            <span class="${className}">${entry.message}</span>
+        `;
+        return logEntry;
     }
+    
+    // Parse the log text to apply proper styling
+    const timestampMatch = entry.match(/^\[([^\]]+)\]/);
+    if (timestampMatch) {
+        const timestamp = timestampMatch[1];
+        const message = entry.substring(timestampMatch[0].length).trim();
+        
+        // Determine log type based on content
+        let className = 'log-info';
+        if (message.includes('success') || message.includes('complete') || message.includes('Started monitoring') || message.includes('Downloaded')) {
+            className = 'log-success';
+        } else if (message.includes('error') || message.includes('failed') || message.includes('Failed')) {
+            className = 'log-error';
+        }
+        
+        logEntry.innerHTML = `
+            <span class="log-timestamp">[${timestamp}]</span> 
+            <span class="${className}">${message}</span>
+        `;
+    } else {
+        // Fallback for logs without proper timestamp format
+        logEntry.innerHTML = `<span class="log-info">${entry}</span>`;
+    }
+    return logEntry;
 }
 
-// Load logs from file
+// Load the newest log entries from file
 function loadLogsFromFile() {
     if (typeof eel !== 'undefined') {
-        eel.load_logs_from_file()((logs) => {
-            if (logs && logs.length > 0) {
+        eel.load_logs_from_file(LOG_PAGE_SIZE, null)((result) => {
+            if (result.status === 'success' && result.entries.length > 0) {
                 const logArea = document.getElementById('logArea');
                 logArea.innerHTML = ''; // Clear existing logs
                 
-                logs.forEach(logText => {
-                    const logEntry = document.createElement('div');
-                    logEntry.className = 'log-entry';
-                    
-                    // Parse the log text to apply proper styling
-                    const timestampMatch = logText.match(/^\[([^\]]+)\]/);
-                    if (timestampMatch) {
-                        const timestamp = timestampMatch[1];
-                        const message = logText.substring(timestampMatch[0].length).trim();
-                        
-                        // Determine log type based on content
-                        let className = 'log-info';
-                        if (message.includes('success') || message.includes('complete') || message.includes('Started monitoring') || message.includes('Downloaded')) {
-                            className = 'log-success';
-                        } else if (message.includes('error') || message.includes('failed') || message.includes('Failed')) {
-                            className = 'log-error';
-                        }
-                        
-                        logEntry.innerHTML = `
-                            <span class="log-timestamp">[${timestamp}]</span> 
-                            <span class="${className}">${message}</span>
-                        `;
-                    } else {
-                        // Fallback for logs without proper timestamp format
-                        logEntry.innerHTML = `<span class="log-info">${logText}</span>`;
-                    }
-                    
-                    logArea.appendChild(logEntry);
-                });
+                result.entries.forEach(entry => logArea.appendChild(createLogElement(entry)));
+                olderLogsCursor = result.cursor;
                 
                 logArea.scrollTop = logArea.scrollHeight;
-                console.log(`Loaded ${logs.length} log entries from file`);
+                logArea.addEventListener('scroll', onLogAreaScroll);
+                console.log(`Loaded ${result.entries.length} log entries from file`);
             }
         });
     }
 }
 
-// Save completed posts to file
-function saveCompletedPosts() {
+// Page back through older log entries when scrolled to the top
+function onLogAreaScroll() {
+    const logArea = document.getElementById('logArea');
+    if (logArea.scrollTop === 0 && olderLogsCursor && !loadingOlderLogs) {
+        loadOlderLogs();
+    }
+}
+
+function loadOlderLogs() {
+    loadingOlderLogs = true;
+    eel.load_logs_from_file(LOG_PAGE_SIZE, olderLogsCursor)((result) => {
+        loadingOlderLogs = false;
+        if (result.status !== 'success') {
+            return;
+        }
+        
+        const logArea = document.getElementById('logArea');
+        const previousHeight = logArea.scrollHeight;
+        const fragment = document.createDocumentFragment();
+        result.entries.forEach(entry => fragment.appendChild(createLogElement(entry)));
+        logArea.insertBefore(fragment, logArea.firstChild);
+        olderLogsCursor = result.cursor;
+        
+        // Keep the entries the user was looking at in place
+        logArea.scrollTop = logArea.scrollHeight - previousHeight;
+    });
+}
+
+// Save a single completion change - the backend journals it
+function saveCompletionChange(postId, completed) {
     if (typeof eel !== 'undefined') {
-        eel.save_completed_posts(Array.from(completedPosts));
+        if (completed) {
+            eel.mark_completed(postId);
+        } else {
+            eel.unmark_completed(postId);
+        }
     }
 }
 
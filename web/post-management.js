@@ -1,10 +1,97 @@
 // post-management.js - Post display, sorting, filtering, and management
 
+const FEED_PAGE_SIZE = 50; // Posts per query_posts page when showing all posts
+const FEED_REFRESH_DELAY = 100; // Coalesce feed refreshes while pages of posts arrive
+const THUMBNAIL_REQUEST_DELAY = 150; // Collect cards scrolled into view before asking for their thumbnails
+
+// Backend filter for the feed filter dropdown
+const FEED_FILTERS = {
+    all: {},
+    paid: { post_type: 'paid' },
+    free: { post_type: 'free' },
+    incomplete: { completed: false },
+    completed: { completed: true }
+};
+
+// Thumbnails of the feed cards - only cards in (or near) the viewport are requested
+const thumbnailUrls = new Map(); // post id -> thumbnail URL, or 'none' for posts without an image
+const visibleThumbnailIds = new Set();
+let thumbnailRequestTimer = null;
+const thumbnailObserver = typeof IntersectionObserver !== 'undefined' && typeof eel !== 'undefined'
+    ? new IntersectionObserver(entries => {
+        entries.forEach(entry => {
+            const postId = entry.target.postData.postId;
+            if (entry.isIntersecting) {
+                visibleThumbnailIds.add(postId);
+            } else {
+                visibleThumbnailIds.delete(postId);
+            }
+        });
+        scheduleThumbnailRequest();
+    }, { rootMargin: '200px' })
+    : null;
+
+// Ask the backend for the thumbnails of the cards in view, once scrolling settles
+function scheduleThumbnailRequest() {
+    clearTimeout(thumbnailRequestTimer);
+    thumbnailRequestTimer = setTimeout(() => {
+        const postIds = [...visibleThumbnailIds].filter(postId => postId && !thumbnailUrls.has(postId));
+        if (postIds.length === 0) {
+            return;
+        }
+        eel.request_thumbnails(postIds)(result => {
+            if (result.status !== 'success') {
+                return;
+            }
+            Object.entries(result.thumbnails).forEach(([postId, url]) => showThumbnail(postId, url));
+        });
+    }, THUMBNAIL_REQUEST_DELAY);
+}
+
+// Show a thumbnail on its card ('none' hides the image for posts without one)
+function showThumbnail(postId, url) {
+    thumbnailUrls.set(postId, url);
+    visibleThumbnailIds.delete(postId);
+    document.querySelectorAll(`#postsContainer .post-thumbnail[data-post-id="${postId}"]`).forEach(image => {
+        if (url === 'none') {
+            image.remove();
+        } else {
+            image.src = url;
+            image.hidden = false;
+        }
+    });
+}
+
+// Add a post dict from the backend to the feed
+function addPostData(post, refresh = true) {
+    const postObj = addPost(
+        post.title,
+        post.url,
+        post.author,
+        post.flair || 'Free',
+        post.created,
+        post.description || 'No description provided.',
+        post.upvotes || 0,
+        post.id,
+        refresh
+    );
+    if (postObj && post.description_truncated) {
+        postObj.descriptionTruncated = true;
+    }
+    return postObj;
+}
+
+// Add a page of posts from the backend, re-rendering the feed once
+function addPostsPage(posts) {
+    posts.forEach(post => addPostData(post, false));
+    refreshPostsDisplay();
+}
+
 // Add new post to the feed
-function addPost(title, url, author = 'Unknown', flair = 'Free', created = null, description = '', upvotes = 0, postId = null) {
+function addPost(title, url, author = 'Unknown', flair = 'Free', created = null, description = '', upvotes = 0, postId = null, refresh = true) {
     // Check for duplicates
     if (postId && seenPostIds.has(postId)) {
-        return;
+        return null;
     }
     
     if (postId) {
@@ -51,11 +138,22 @@ function addPost(title, url, author = 'Unknown', flair = 'Free', created = null,
     updateAnalyticsCounters();
     
     // Refresh the display
-    refreshPostsDisplay();
+    if (refresh) {
+        refreshPostsDisplay();
+    }
+    
+    return postObj;
 }
 
-// FIXED: Render posts in the DOM based on current sorting and limit
+// Render the feed - sorted, filtered and paged by the backend when connected
 function refreshPostsDisplay() {
+    if (typeof eel !== 'undefined') {
+        if (!feedRefreshTimer) {
+            feedRefreshTimer = setTimeout(queryFeed, FEED_REFRESH_DELAY);
+        }
+        return;
+    }
+    
     const postsContainer = document.getElementById('postsContainer');
     
     // Clear container
@@ -72,8 +170,8 @@ function refreshPostsDisplay() {
         return;
     }
     
-    // Apply sorting first
-    let sortedPosts = [...allPosts];
+    // Apply filter and sorting first (demo mode)
+    let sortedPosts = allPosts.filter(postMatchesFeedFilter);
     sortedPosts = applySortToPosts(sortedPosts, currentSortMethod);
     
     // FIXED: Apply limit correctly - show the most recent X posts after sorting
@@ -100,7 +198,138 @@ function refreshPostsDisplay() {
     });
     
     // Update counter
-    updatePostsCounter(postsToShow.length, allPosts.length);
+    updatePostsCounter(postsToShow.length, sortedPosts.length);
+}
+
+// Fetch and render the first feed page from the backend
+function queryFeed() {
+    feedRefreshTimer = null;
+    const requestId = ++feedRequestId;
+    const limit = currentPostLimit === 'all' ? FEED_PAGE_SIZE : parseInt(currentPostLimit);
+    
+    eel.query_posts(FEED_FILTERS[currentFeedFilter], currentSortMethod, null, limit)((result) => {
+        if (requestId !== feedRequestId) {
+            return; // A newer query replaced this one
+        }
+        if (result.status !== 'success') {
+            log(result.message, 'error');
+            return;
+        }
+        
+        const postsContainer = document.getElementById('postsContainer');
+        postsContainer.innerHTML = '';
+        if (result.total === 0) {
+            postsContainer.innerHTML = `
+                <div style="text-align: center; color: #64748b; padding: 40px;">
+                    <div style="font-size: 48px; margin-bottom: 16px;">📡</div>
+                    <div>${currentFeedFilter === 'all' ? 'Start monitoring to see new posts' : 'No posts match this filter'}</div>
+                </div>
+            `;
+            feedCursor = null;
+            updatePostsCounter(0, 0);
+            return;
+        }
+        
+        result.posts.forEach(post => postsContainer.appendChild(createPostElement(postObjFromData(post))));
+        feedCursor = currentPostLimit === 'all' ? result.next_cursor : null;
+        updatePostsCounter(result.posts.length, result.total);
+    });
+}
+
+// Append the next feed page when showing all posts
+function loadMoreFeedPosts() {
+    if (typeof eel === 'undefined' || !feedCursor) {
+        return;
+    }
+    const requestId = feedRequestId;
+    const cursor = feedCursor;
+    feedCursor = null; // One page request at a time
+    
+    eel.query_posts(FEED_FILTERS[currentFeedFilter], currentSortMethod, cursor, FEED_PAGE_SIZE)((result) => {
+        if (requestId !== feedRequestId || result.status !== 'success') {
+            return;
+        }
+        const postsContainer = document.getElementById('postsContainer');
+        result.posts.forEach(post => postsContainer.appendChild(createPostElement(postObjFromData(post))));
+        feedCursor = result.next_cursor;
+        updatePostsCounter(postsContainer.querySelectorAll('.post-item').length, result.total);
+    });
+}
+
+// Convert a query_posts result into the post object used for rendering
+function postObjFromData(post) {
+    const created = new Date(post.created * 1000);
+    return {
+        title: post.title,
+        url: post.url,
+        author: post.author,
+        flair: post.flair,
+        flairClass: post.post_type,
+        created,
+        description: post.description || 'No description provided.',
+        descriptionTruncated: !!post.description_truncated,
+        upvotes: post.upvotes,
+        numComments: post.num_comments,
+        removed: post.removed,
+        locked: post.locked,
+        tags: post.tags || [],
+        price: post.price,
+        repostOf: post.repost_of,
+        postId: post.id,
+        completed: post.completed,
+        timestamp: created.getTime()
+    };
+}
+
+// Apply refreshed post values ({id, upvotes, num_comments, removed, locked, repost_of}) to the feed
+function applyPostUpdates(changes) {
+    const fields = { upvotes: 'upvotes', num_comments: 'numComments', removed: 'removed', locked: 'locked', repost_of: 'repostOf' };
+    const byId = new Map(changes.map(change => [change.id, change]));
+    
+    allPosts.forEach(postObj => {
+        const change = byId.get(postObj.postId);
+        if (change) {
+            Object.keys(fields).forEach(field => {
+                if (field in change) postObj[fields[field]] = change[field];
+            });
+        }
+    });
+    
+    // Score sorts need a new order; otherwise only the changed posts are re-rendered
+    if (currentSortMethod === 'most_upvoted' || currentSortMethod === 'least_upvoted') {
+        refreshPostsDisplay();
+        return;
+    }
+    document.querySelectorAll('#postsContainer .post-item').forEach(element => {
+        const change = byId.get(element.postData.postId);
+        if (change) {
+            Object.keys(fields).forEach(field => {
+                if (field in change) element.postData[fields[field]] = change[field];
+            });
+            element.replaceWith(createPostElement(element.postData));
+        }
+    });
+}
+
+// Whether a local post passes the feed filter (demo mode)
+function postMatchesFeedFilter(postObj) {
+    const filter = FEED_FILTERS[currentFeedFilter];
+    if (filter.post_type && postObj.flairClass !== filter.post_type) {
+        return false;
+    }
+    if (filter.completed !== undefined && !!postObj.completed !== filter.completed) {
+        return false;
+    }
+    return true;
+}
+
+// Function called when the feed filter dropdown changes
+function applyFeedFilter() {
+    const filterSelect = document.getElementById('feedFilterSelect');
+    currentFeedFilter = filterSelect.value;
+    refreshPostsDisplay();
+    
+    log(`Feed filter: ${filterSelect.options[filterSelect.selectedIndex].text}`, 'info');
 }
 
 // Create a post DOM element
@@ -114,8 +343,12 @@ function createPostElement(postObj) {
         postElement.classList.add('completed');
     }
     
+    const thumbnailUrl = thumbnailUrls.get(postObj.postId);
     postElement.innerHTML = `
         <div class="post-header">
+            ${postObj.postId && thumbnailUrl !== 'none'
+                ? `<img class="post-thumbnail" data-post-id="${postObj.postId}" alt="" loading="lazy" ${thumbnailUrl ? `src="${thumbnailUrl}"` : 'hidden'}>`
+                : ''}
             <div class="post-content">
                 <div class="post-title">${postObj.title}</div>
                 <div class="post-meta">
@@ -125,6 +358,14 @@ function createPostElement(postObj) {
                     ${postObj.flair ? `<span>•</span><span class="flair-badge ${postObj.flairClass}">${postObj.flair}</span>` : ''}
                     <span>•</span>
                     <span>👍 ${postObj.upvotes}</span>
+                    ${postObj.numComments !== undefined && postObj.numComments !== null ? `<span>💬 ${postObj.numComments}</span>` : ''}
+                    ${postObj.locked ? '<span title="Locked">🔒</span>' : ''}
+                    ${postObj.removed ? `<span class="flair-badge removed" title="Removed: ${postObj.removed}">Removed</span>` : ''}
+                    ${postObj.price ? `<span class="flair-badge price">$${postObj.price}</span>` : ''}
+                    ${postObj.repostOf ? (postObj.repostOf.post_id
+                        ? `<a class="flair-badge repost" href="https://redd.it/${postObj.repostOf.post_id}" target="_blank" onclick="event.stopPropagation()" title="Same photo as post ${postObj.repostOf.post_id}">Seen before</a>`
+                        : '<span class="flair-badge repost" title="Same photo as an earlier download">Seen before</span>') : ''}
+                    ${(postObj.tags || []).map(tag => `<span class="flair-badge tag">${tag}</span>`).join('')}
                 </div>
                 <a href="${postObj.url}" target="_blank" class="post-url" onclick="event.stopPropagation()">${postObj.url}</a>
             </div>
@@ -143,6 +384,10 @@ function createPostElement(postObj) {
         openPostModal(this.postData);
     });
     
+    if (thumbnailObserver && postObj.postId && !thumbnailUrls.has(postObj.postId)) {
+        thumbnailObserver.observe(postElement);
+    }
+    
     return postElement;
 }
 
@@ -205,7 +450,7 @@ function updatePostsCounter(showing, total) {
     const counter = document.getElementById('postsCounter');
     if (counter) {
         if (currentPostLimit === 'all') {
-            counter.textContent = `Showing all ${total} posts`;
+            counter.textContent = showing < total ? `Showing ${showing} of ${total} posts` : `Showing all ${total} posts`;
         } else {
             const limitNum = parseInt(currentPostLimit);
             if (total <= limitNum) {
@@ -269,12 +514,12 @@ function togglePostCompletion(postId, event) {
         allPosts[postIndex].completed = !isCompleted;
     }
     
+    // Save the change before the feed is re-queried
+    saveCompletionChange(postId, !isCompleted);
+    
     // Refresh display to show updated completion status
     refreshPostsDisplay();
     
-    // Save to file
-    saveCompletedPosts();
-    
     // Update modal if open
     if (currentModalPost && currentModalPost.postId === postId) {
         currentModalPost.completed = !isCompleted;
@@ -20,8 +20,8 @@ function log(message, type = 'info') {
     logArea.appendChild(logEntry);
     logArea.scrollTop = logArea.scrollHeight;
     
-    // Immediately save logs to file
-    saveLogsToFile();
+    // Only the new entry goes to the backend log
+    queueLogEntry({ time: dateTime, type, message });
     
     // Keep only last 1000 log entries
     while (logArea.children.length > 1000) {
@@ -30,6 +30,22 @@ function log(message, type = 'info') {
 }
 
 // Update monitoring status UI
+// Mark the status dot when subreddits are backing off or waiting for the rate limit
+function updateHealth(degraded) {
+    const statusDot = document.getElementById('statusDot');
+    
+    if (degraded.length > 0) {
+        statusDot.classList.add('degraded');
+        statusDot.title = degraded
+            .map(sub => `r/${sub.name}: ${sub.health === 'rate_limited' ? 'waiting for rate limit' : 'retrying'}` +
+                (sub.last_error ? ` (${sub.last_error})` : ''))
+            .join('\n');
+    } else {
+        statusDot.classList.remove('degraded');
+        statusDot.title = '';
+    }
+}
+
 function updateStatus(active) {
     const statusDot = document.getElementById('statusDot');
     const startStopBtn = document.getElementById('startStopBtn');
@@ -42,6 +58,7 @@ function updateStatus(active) {
         lastUpdate.textContent = new Date().toLocaleTimeString();
     } else {
         statusDot.classList.add('inactive');
+        updateHealth([]);
         startStopBtn.textContent = 'Start Monitoring';
         startStopBtn.className = 'button';
     }
@@ -88,7 +105,11 @@ function clearLogs() {
         </div>
     `;
     
-    saveLogsToFile();
+    pendingLogEntries = [];
+    olderLogsCursor = null;
+    if (typeof eel !== 'undefined') {
+        eel.clear_logs();
+    }
 }
 
 // Confirm clear logs
@@ -114,6 +135,19 @@ function openPostModal(postData) {
     document.getElementById('modalUpvotes').textContent = postData.upvotes;
     document.getElementById('modalDescription').textContent = postData.description;
     
+    // The feed only holds a preview of long descriptions - fetch the full text
+    if (postData.descriptionTruncated && typeof eel !== 'undefined') {
+        eel.get_post_description(postData.postId)((result) => {
+            if (result.status === 'success') {
+                postData.description = result.description;
+                postData.descriptionTruncated = false;
+                if (currentModalPost === postData) {
+                    document.getElementById('modalDescription').textContent = result.description;
+                }
+            }
+        });
+    }
+    
     // Set flair
     const flairElement = document.getElementById('modalFlair');
     flairElement.textContent = postData.flair || 'No flair';